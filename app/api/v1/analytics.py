@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from app.dependencies import get_current_user
 from app.core.supabase_client import get_supabase_client
+from app.core.executor import get_sync_executor
 from app.schemas.analytics import AnalyticsEventCreate, AnalyticsEventResponse
 from app.models.analytics import AnalyticsModel
 from app.schemas.user import User
@@ -32,7 +33,8 @@ async def track_analytics_event(
     
     # 2. Insert into analytics_events
     try:
-        response = get_supabase_client().table('analytics_events').insert(payload).execute()
+        query = get_supabase_client().table('analytics_events').insert(payload)
+        response = await get_sync_executor().execute(query)
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to record analytics event")
         
@@ -81,7 +81,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
             id=current_user.id,
             email=current_user.email,
             role=current_user.role,
-            created_at=current_user.created_at,
+            created_at=user_profile.get("created_at") or current_user.created_at,
             full_name=current_user.full_name,
             privacy_policy_accepted_at=user_profile.get("privacy_policy_accepted_at")
         )
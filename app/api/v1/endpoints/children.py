@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
 import logging
 
 from app.schemas.child import ChildCreate, ChildUpdate, ChildResponse
 from app.services.child_service import ChildService
 from app.dependencies import get_current_parent, get_pagination_params
+from app.utils.pagination import set_next_cursor
 from app.schemas.user import User
 
 router = APIRouter()
@@ -38,6 +39,7 @@ async def create_child(
 
 @router.get("", response_model=List[ChildResponse])
 async def get_children(
+    response: Response,
     current_user: User = Depends(get_current_parent),
     pagination: dict = Depends(get_pagination_params)
 ):
@@ -48,8 +50,10 @@ async def get_children(
         children = await child_service.get_children_by_parent(
             current_user.id,
             skip=pagination["skip"],
-            limit=pagination["limit"]
+            limit=pagination["limit"],
+            cursor=pagination["cursor"]
         )
+        set_next_cursor(response, children, pagination["limit"])
         return children
     except Exception as e:
         logger.error(f"Get children error: {str(e)}")
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from typing import List, Optional
 import logging
 
 from app.schemas.module import ModuleResponse, ModuleDetail, ModuleCreate, ModuleUpdate
 from app.services.module_service import ModuleService
 from app.dependencies import get_current_user, get_pagination_params
+from app.utils.pagination import set_next_cursor
 from app.schemas.user import User
 
 router = APIRouter()
@@ -14,6 +15,7 @@ module_service = ModuleService()
 
 @router.get("", response_model=List[ModuleResponse])
 async def get_modules(
+    response: Response,
     module_type: Optional[str] = Query(None, description="Filter by type: reading, counting, cognitive"),
     difficulty_level: Optional[int] = Query(None, ge=1, le=10, description="Filter by difficulty level"),
     current_user: User = Depends(get_current_user),
@@ -27,8 +29,10 @@ async def get_modules(
             module_type=module_type,
             difficulty_level=difficulty_level,
             skip=pagination["skip"],
-            limit=pagination["limit"]
+            limit=pagination["limit"],
+            cursor=pagination["cursor"]
         )
+        set_next_cursor(response, modules, pagination["limit"])
         return modules
     except Exception as e:
         logger.error(f"Get modules error: {str(e)}")
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 import logging
 
 from app.schemas.progress import (
+    OFFLINE_SESSION_ID_MAX_LENGTH,
     ProgressEventCreate,
     ProgressBatchCreate,
     ProgressResponse,
@@ -11,7 +13,10 @@ from app.schemas.progress import (
     ProgressReport
 )
 from app.services.progress_service import ProgressService
-from app.dependencies import get_current_user, get_current_parent
+from app.services import progress_export
+from app.dependencies import get_current_user, get_current_parent, get_cursor
+from app.utils.ndjson import iter_ndjson_lines
+from app.utils.pagination import Cursor, set_next_cursor
 from app.schemas.user import User
 
 router = APIRouter()
@@ -58,7 +63,9 @@ async def sync_offline_progress(
         return {
             "message": "Progress synced successfully",
             "synced_count": result["synced_count"],
-            "failed_count": result["failed_count"]
+            "failed_count": result["failed_count"],
+            "failures": result.get("failures", []),
+            "already_synced": result.get("already_synced", False)
         }
     except ValueError as e:
         raise HTTPException(
@@ -73,6 +80,46 @@ async def sync_offline_progress(
         )
 
 
+@router.post("/children/{child_id}/sync/stream", status_code=status.HTTP_201_CREATED)
+async def sync_offline_progress_stream(
+    child_id: str,
+    request: Request,
+    offline_session_id: str = Query(
+        ..., min_length=1, max_length=OFFLINE_SESSION_ID_MAX_LENGTH, description="Offline session being synced"
+    ),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Sync a large offline backlog sent as newline-delimited JSON
+    
+    Each line is one progress event. The body may be gzip-compressed
+    (`Content-Encoding: gzip`) and is processed incrementally.
+    """
+    gzipped = request.headers.get("content-encoding", "").lower() == "gzip"
+    lines = iter_ndjson_lines(request.stream(), gzipped=gzipped)
+    
+    try:
+        result = await progress_service.sync_progress_stream(child_id, offline_session_id, lines)
+        return {
+            "message": "Progress synced successfully",
+            "synced_count": result["synced_count"],
+            "failed_count": result["failed_count"],
+            "failures": result.get("failures", []),
+            "already_synced": result.get("already_synced", False)
+        }
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Stream sync progress error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to sync progress"
+        )
+
+
 @router.get("/children/{child_id}/summary", response_model=ProgressSummary)
 async def get_progress_summary(
     child_id: str,
@@ -135,23 +182,62 @@ async def get_progress_report(
 @router.get("/children/{child_id}/history", response_model=List[ProgressResponse])
 async def get_progress_history(
     child_id: str,
+    response: Response,
     module_id: Optional[str] = Query(None, description="Filter by module ID"),
     limit: int = Query(100, ge=1, le=500, description="Number of records to return"),
+    cursor: Optional[Cursor] = Depends(get_cursor),
     current_user: User = Depends(get_current_parent)
 ):
     """
-    Get progress history for a child
+    Get progress history for a child, newest first
+    
+    When more records may follow, the X-Next-Cursor header holds the
+    `cursor` for the next page.
     """
     try:
         history = await progress_service.get_progress_history(
             child_id,
             module_id=module_id,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
+        set_next_cursor(response, history, limit)
         return history
     except Exception as e:
         logger.error(f"Get progress history error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve progress history"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/children/{child_id}/export")
+async def export_progress(
+    child_id: str,
+    format: str = Query("csv", pattern="^(csv|parquet)$", description="csv or parquet"),
+    current_user: User = Depends(get_current_parent)
+):
+    """
+    Export a child's full progress history as CSV or Parquet
+    
+    Rows are read and encoded page by page while the response is sent,
+    so memory stays flat however long the history is.
+    """
+    pages = progress_export.prefetch(progress_service.iter_progress_pages(child_id))
+    encode = progress_export.stream_parquet if format == "parquet" else progress_export.stream_csv
+    
+    return StreamingResponse(
+        _log_export_errors(encode(pages), child_id),
+        media_type=progress_export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="progress-{child_id}.{format}"'}
+    )
+
+
+async def _log_export_errors(chunks, child_id: str):
+    # Headers are already sent, so a failure can only end the stream early
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        logger.error(f"Progress export for {child_id} failed: {str(e)}")
+        raise
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from typing import Dict, List
+import hashlib
 import logging
 
 from app.schemas.recommendation import RecommendationResponse
@@ -15,10 +16,16 @@ ai_service = AIService()
 @router.get("/children/{child_id}", response_model=RecommendationResponse)
 async def get_recommendations(
     child_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
     Get AI-powered module recommendations for a child
+    
+    Responses carry an ETag and `Cache-Control: private, no-cache`, so
+    clients revalidate every time; a matching If-None-Match gets 304 Not
+    Modified.
     """
     try:
         recommendations = await ai_service.get_recommendations(child_id)
@@ -27,6 +34,12 @@ async def get_recommendations(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Child not found or insufficient data for recommendations"
             )
+        
+        headers = _cache_headers(recommendations)
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        response.headers.update(headers)
         return recommendations
     except HTTPException:
         raise
@@ -90,4 +103,26 @@ async def adjust_difficulty(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to adjust difficulty"
-        )
\ No newline at end of file
+        )
+
+
+def _cache_headers(recommendations: RecommendationResponse) -> Dict[str, str]:
+    """
+    ETag and Cache-Control for a recommendation response
+    
+    The cached response keeps its `generated_at` until it is recomputed,
+    so the ETag changes exactly when the recommendations do. New progress
+    can replace them before `valid_until`, so there is no max-age.
+    """
+    version = f"{recommendations.child_id}:{recommendations.generated_at.isoformat()}"
+    return {
+        "ETag": f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"',
+        "Cache-Control": "private, no-cache"
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
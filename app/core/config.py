@@ -23,6 +23,10 @@ class Settings(BaseSettings):
     # Supabase Configuration
     SUPABASE_URL: str
     SUPABASE_KEY: str
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = 50
+    SUPABASE_HTTP_MAX_KEEPALIVE: int = 20
+    SUPABASE_HTTP_TIMEOUT_SECONDS: float = 10.0
+    SUPABASE_SYNC_POOL_SIZE: int = 10
     
     # Security
     SECRET_KEY: str
@@ -30,6 +34,17 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Supabase access token verification
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    SUPABASE_JWKS_URL: Optional[str] = None
+    SUPABASE_JWKS_CACHE_SECONDS: int = 3600
+    AUTH_REVOCATION_CHECK_INTERVAL_SECONDS: int = 0
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_MAX_TTL_SECONDS: int = 300
+    AUTH_REMOTE_TOKEN_CACHE_TTL_SECONDS: int = 15
+    AUTH_NEGATIVE_CACHE_TTL_SECONDS: int = 30
+    
     # CORS - stored as string, parsed via computed_field
     CORS_ORIGINS_STR: str = "http://localhost:3000,http://localhost:8080,http://localhost:5173"
     
@@ -53,14 +68,30 @@ class Settings(BaseSettings):
     ML_MODEL_PATH: str = "./app/ml/models/saved_model"
     ML_MIN_DATA_POINTS: int = 10
     ML_CONFIDENCE_THRESHOLD: float = 0.7
+    AI_EVENT_WINDOW_SIZE: int = 100
+    AI_EVENT_WINDOW_CACHE_SIZE: int = 10000
+    AI_EVENT_WINDOW_TTL_SECONDS: int = 300
+    RECOMMENDATION_VALID_HOURS: int = 24
+    RECOMMENDATION_CACHE_SIZE: int = 5000
     
     # Content Configuration
+    MODULE_CATALOG_TTL_SECONDS: int = 300
     MAX_CHILDREN_PER_PARENT: int = 5
     MIN_CHILD_AGE: int = 4
     MAX_CHILD_AGE: int = 10
     
     # Offline Mode
     OFFLINE_BATCH_SIZE: int = 100
+    
+    # Progress write-behind buffer
+    PROGRESS_WRITE_BEHIND_ENABLED: bool = False
+    PROGRESS_BUFFER_MAX_EVENTS: int = 200
+    PROGRESS_BUFFER_FLUSH_INTERVAL_SECONDS: float = 1.0
+    PROGRESS_BUFFER_SPOOL_PATH: str = "./data/progress_spool.jsonl"
+    
+    # Progress summary/report cache
+    PROGRESS_REPORT_CACHE_SIZE: int = 1000
+    PROGRESS_REPORT_CACHE_TTL_SECONDS: int = 300
 
 
 @lru_cache()
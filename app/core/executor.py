@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict
+import asyncio
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SyncExecutor:
+    """
+    Bounded thread pool for legacy sync Supabase calls
+
+    Runs blocking `.execute()` chains off the event loop and keeps track of
+    how many calls are waiting for a worker and how long they waited.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="supabase-sync"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the pool and await its result
+        """
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task():
+            wait = time.perf_counter() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._started += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            if wait > 1.0:
+                logger.warning(f"Sync call waited {wait:.2f}s for a worker")
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool, task)
+        except RuntimeError:
+            # The pool is shut down and the task never got queued
+            with self._lock:
+                self._queued -= 1
+            raise
+        return await future
+
+    async def execute(self, query: Any) -> Any:
+        """
+        Execute a sync PostgREST query builder in the pool
+        """
+        return await self.run(query.execute)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth and wait time statistics"""
+        with self._lock:
+            avg_wait = self._total_wait / self._started if self._started else 0.0
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "avg_wait_ms": round(avg_wait * 1000, 2),
+                "max_wait_ms": round(self._max_wait * 1000, 2)
+            }
+
+    async def shutdown(self):
+        """
+        Stop accepting work and wait for running calls
+
+        The wait happens in a separate thread so the event loop keeps
+        serving other shutdown work.
+        """
+        await asyncio.to_thread(self._pool.shutdown, wait=True)
+
+
+@lru_cache()
+def get_sync_executor() -> SyncExecutor:
+    """
+    Get the shared sync executor sized from settings
+    """
+    return SyncExecutor(settings.SUPABASE_SYNC_POOL_SIZE)
+
+
+async def shutdown_sync_executor():
+    """
+    Shut down the shared sync executor on application shutdown
+    """
+    if get_sync_executor.cache_info().currsize:
+        await get_sync_executor().shutdown()
+        get_sync_executor.cache_clear()
@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import asyncio
 import logging
+import time
 
 from app.core.config import settings
+from app.core.supabase_client import get_http_transport
 
 logger = logging.getLogger(__name__)
 
@@ -66,19 +69,35 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return encoded_jwt
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+def verify_token(
+    token: str,
+    token_type: Optional[str] = "access",
+    key: Optional[Any] = None,
+    algorithms: Optional[List[str]] = None,
+    audience: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
     """
     Verify and decode JWT token
+    
+    Defaults to tokens issued by this API. Pass `key`, `algorithms` and
+    `audience` to verify tokens from another issuer, and `token_type=None`
+    when the issuer does not set a `type` claim.
     """
     try:
+        options = {"require_exp": True}
+        if audience:
+            options["require_aud"] = True
+        
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+            key if key is not None else settings.SECRET_KEY,
+            algorithms=algorithms or [settings.ALGORITHM],
+            audience=audience,
+            options=options
         )
         
         # Verify token type
-        if payload.get("type") != token_type:
+        if token_type is not None and payload.get("type") != token_type:
             logger.warning(f"Invalid token type: expected {token_type}, got {payload.get('type')}")
             return None
         
@@ -103,4 +122,107 @@ def decode_token_without_verification(token: str) -> Optional[Dict[str, Any]]:
         return payload
     except Exception as e:
         logger.error(f"Token decoding failed: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """
+    The `exp` claim of a token as a Unix timestamp, without verifying it
+    
+    Only for tokens already validated some other way, such as by the
+    Supabase auth server.
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+class JWKSCache:
+    """
+    Cached JSON Web Key Set of the Supabase auth server
+    
+    Keys are refetched after `ttl_seconds`, or earlier when a token names a
+    key id that is not in the cached set (key rotation), at most once per
+    `min_refresh_seconds`.
+    """
+    
+    def __init__(self, url: str, ttl_seconds: int, min_refresh_seconds: int = 60):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get the JWK for a key id"""
+        age = time.monotonic() - self._fetched_at
+        if age >= self.ttl_seconds or (kid not in self._keys and age >= self.min_refresh_seconds):
+            await self._refresh()
+        return self._keys.get(kid)
+    
+    async def _refresh(self):
+        async with self._lock:
+            if time.monotonic() - self._fetched_at < self.min_refresh_seconds:
+                return
+            try:
+                response = await get_http_transport().get(self.url)
+                response.raise_for_status()
+                self._keys = {k.get("kid"): k for k in response.json().get("keys", [])}
+                logger.info(f"Loaded {len(self._keys)} signing keys from JWKS")
+            except Exception as e:
+                logger.error(f"JWKS refresh failed: {str(e)}")
+            finally:
+                self._fetched_at = time.monotonic()
+
+
+SUPABASE_JWT_ALGORITHMS = {"HS256", "RS256", "ES256"}
+
+jwks_cache = JWKSCache(
+    settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+    ttl_seconds=settings.SUPABASE_JWKS_CACHE_SECONDS
+)
+
+
+def local_verification_enabled() -> bool:
+    """Whether Supabase access tokens can be verified without the auth server"""
+    return bool(settings.SUPABASE_JWT_SECRET or settings.SUPABASE_JWKS_URL)
+
+
+async def verify_supabase_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a Supabase access token locally
+    
+    HS256 tokens are checked against the project JWT secret, asymmetric
+    tokens against the cached JWKS. Signature, expiry and audience are
+    all verified.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        logger.warning(f"Token verification failed: {str(e)}")
+        return None
+    
+    algorithm = header.get("alg")
+    if algorithm not in SUPABASE_JWT_ALGORITHMS:
+        logger.warning(f"Unsupported token algorithm: {algorithm}")
+        return None
+    
+    if algorithm == "HS256":
+        key = settings.SUPABASE_JWT_SECRET
+    else:
+        key = await jwks_cache.get_key(header.get("kid"))
+    
+    if not key:
+        logger.warning(f"No verification key for {algorithm} token")
+        return None
+    
+    return verify_token(
+        token,
+        token_type=None,
+        key=key,
+        algorithms=[algorithm],
+        audience=settings.SUPABASE_JWT_AUDIENCE
+    )
\ No newline at end of file
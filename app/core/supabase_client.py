@@ -1,5 +1,6 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, AsyncClient, AsyncClientOptions
 from functools import lru_cache
+import httpx
 import logging
 
 from app.core.config import settings
@@ -30,3 +31,47 @@ def get_supabase_admin_client() -> Client:
     Use only for server-side operations that require bypassing RLS
     """
     return get_supabase_client()
+
+
+@lru_cache()
+def get_http_transport() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client shared by every async Supabase call
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE,
+        ),
+        timeout=settings.SUPABASE_HTTP_TIMEOUT_SECONDS,
+        follow_redirects=True,
+    )
+
+
+@lru_cache()
+def get_async_supabase_client() -> AsyncClient:
+    """
+    Get cached async Supabase client instance
+
+    Queries built from this client are awaited, so PostgREST round trips
+    no longer block the event loop.
+    """
+    try:
+        supabase = AsyncClient(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_KEY,
+            AsyncClientOptions(httpx_client=get_http_transport())
+        )
+        logger.info("Async Supabase client initialized successfully")
+        return supabase
+    except Exception as e:
+        logger.error(f"Failed to initialize async Supabase client: {str(e)}")
+        raise
+
+
+async def close_async_supabase_client():
+    """
+    Close the pooled HTTP transport on shutdown
+    """
+    if get_http_transport.cache_info().currsize:
+        await get_http_transport().aclose()
@@ -1,11 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, Dict, Any, Tuple
+import hashlib
 import logging
+import time
 
-from app.core.supabase_client import get_supabase_client
-from app.core.security import verify_token
+from app.core.config import settings
+from app.core.supabase_client import get_async_supabase_client
+from app.core.security import verify_token, verify_supabase_token, local_verification_enabled, token_expiry
 from app.schemas.user import User
+from app.utils.cache import TTLCache
+from app.utils.pagination import Cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -18,31 +23,29 @@ async def get_current_user(
     Dependency to get current authenticated user from JWT token
     """
     token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
     
     try:
-        # Verify token with Supabase
-        supabase = get_supabase_client()
-        user_response = supabase.auth.get_user(token)
+        cached = token_cache.get(cache_key, _MISSING)
+        if cached is _MISSING:
+            cached = await _authenticate(token)
+            _cache_authentication(cache_key, cached)
         
-        if not user_response or not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        if cached is None:
+            raise ValueError("Invalid token")
         
-        user_data = user_response.user
+        user, session_key, expires_at = cached
+        if expires_at is not None and expires_at <= time.time():
+            token_cache.pop(cache_key)
+            raise ValueError("Token has expired")
         
-        # Get user role from metadata or database
-        role = user_data.user_metadata.get("role", "parent")
+        try:
+            await _check_revocation(token, session_key)
+        except ValueError:
+            token_cache.set(cache_key, None, settings.AUTH_NEGATIVE_CACHE_TTL_SECONDS)
+            raise
         
-        return User(
-            id=user_data.id,
-            email=user_data.email,
-            role=role,
-            created_at=user_data.created_at,
-            full_name=user_data.user_metadata.get("full_name", "")
-        )
+        return user
         
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
@@ -53,6 +56,117 @@ async def get_current_user(
         )
 
 
+# Validated tokens keyed by SHA-256 of the token. Values are
+# (user, session key, exp) tuples, or None for tokens that failed validation.
+token_cache = TTLCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_MAX_TTL_SECONDS
+)
+_MISSING = object()
+
+
+async def _authenticate(token: str) -> Optional[Tuple[User, str, Optional[float]]]:
+    """
+    Validate a token, returning None when it is not valid
+    
+    Tokens checked with the auth server count as a revocation check for
+    their session.
+    """
+    if local_verification_enabled():
+        payload = await verify_supabase_token(token)
+        if not payload:
+            return None
+        
+        session_key = payload.get("session_id") or payload["sub"]
+        return _user_from_claims(payload), session_key, payload.get("exp")
+    
+    # Verify token with Supabase
+    supabase = get_async_supabase_client()
+    user_response = await supabase.auth.get_user(token)
+    
+    if not user_response or not user_response.user:
+        return None
+    
+    user_data = user_response.user
+    
+    # Get user role from metadata or database
+    role = user_data.user_metadata.get("role", "parent")
+    
+    user = User(
+        id=user_data.id,
+        email=user_data.email,
+        role=role,
+        created_at=user_data.created_at,
+        full_name=user_data.user_metadata.get("full_name", "")
+    )
+    _mark_revocation_checked(user.id)
+    return user, user.id, token_expiry(token)
+
+
+def _cache_authentication(cache_key: str, result: Optional[Tuple[User, str, Optional[float]]]):
+    """
+    Cache a validation result until the token expires or the max TTL
+    
+    Results from the auth server are kept for a much shorter TTL, since
+    without local verification they are the only revocation check.
+    """
+    if result is None:
+        token_cache.set(cache_key, None, settings.AUTH_NEGATIVE_CACHE_TTL_SECONDS)
+        return
+    
+    ttl = settings.AUTH_TOKEN_CACHE_MAX_TTL_SECONDS
+    if not local_verification_enabled():
+        ttl = min(ttl, settings.AUTH_REMOTE_TOKEN_CACHE_TTL_SECONDS)
+    expires_at = result[2]
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    token_cache.set(cache_key, result, ttl)
+
+
+def _user_from_claims(payload: Dict[str, Any]) -> User:
+    """Build the current user from verified Supabase token claims"""
+    metadata = payload.get("user_metadata") or {}
+    
+    return User(
+        id=payload["sub"],
+        email=payload.get("email", ""),
+        role=metadata.get("role", "parent"),
+        full_name=metadata.get("full_name", "")
+    )
+
+
+# Last time each session was confirmed with the Supabase auth server
+_revocation_checked_at: Dict[str, float] = {}
+MAX_TRACKED_SESSIONS = 10000
+
+
+async def _check_revocation(token: str, session_key: str):
+    """
+    Confirm with the auth server that a cached session is still live, at
+    most once per AUTH_REVOCATION_CHECK_INTERVAL_SECONDS
+    """
+    interval = settings.AUTH_REVOCATION_CHECK_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    
+    now = time.monotonic()
+    if now - _revocation_checked_at.get(session_key, float("-inf")) < interval:
+        return
+    
+    user_response = await get_async_supabase_client().auth.get_user(token)
+    if not user_response or not user_response.user:
+        _revocation_checked_at.pop(session_key, None)
+        raise ValueError("Session has been revoked")
+    
+    _mark_revocation_checked(session_key, now)
+
+
+def _mark_revocation_checked(session_key: str, now: Optional[float] = None):
+    if len(_revocation_checked_at) >= MAX_TRACKED_SESSIONS:
+        _revocation_checked_at.clear()
+    _revocation_checked_at[session_key] = time.monotonic() if now is None else now
+
+
 async def get_current_parent(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -81,12 +195,31 @@ async def get_current_educator(
     return current_user
 
 
+def get_cursor(cursor: Optional[str] = None) -> Optional[Cursor]:
+    """
+    Dependency for an opaque keyset cursor from a previous page's
+    X-Next-Cursor header
+    """
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
 def get_pagination_params(
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor)
 ) -> dict:
     """
     Dependency for pagination parameters
+    
+    A cursor takes precedence over `skip`, which is kept for existing clients.
     """
     if skip < 0:
         skip = 0
@@ -95,4 +228,4 @@ def get_pagination_params(
     if limit < 1:
         limit = 10
         
-    return {"skip": skip, "limit": limit}
\ No newline at end of file
+    return {"skip": skip, "limit": limit, "cursor": cursor}
@@ -0,0 +1 @@
+"""Background and maintenance jobs package"""
\ No newline at end of file
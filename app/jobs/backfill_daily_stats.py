@@ -0,0 +1,138 @@
+"""
+Backfill the child_daily_stats rollup from existing progress rows
+
+Usage:
+    python -m app.jobs.backfill_daily_stats [--child-id CHILD_ID]
+
+Totals are recomputed from scratch and written with an upsert, so the job
+can be re-run safely. Run it before relying on the rollup, or while no
+progress is being recorded for the children being backfilled.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import logging
+
+from app.core.supabase_client import get_async_supabase_client
+from app.services.daily_stats import build_daily_stats
+from app.services.module_catalog import ModuleCatalog
+from app.services.module_loader import ModuleLoader
+from app.utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+
+async def backfill_daily_stats(
+    supabase=None,
+    child_id: Optional[str] = None,
+    page_size: int = PAGE_SIZE
+) -> int:
+    """
+    Rebuild child_daily_stats from the progress table
+
+    Progress is read child by child in keyset pages on (child_id,
+    created_at, id), and each child's rollup rows are written as soon as
+    the pages move past them, so memory and page cost stay flat however
+    large the table is.
+
+    Args:
+        supabase: Async Supabase client, defaults to the shared one
+        child_id: Only backfill this child
+        page_size: Progress rows read per page
+
+    Returns:
+        Number of rollup rows written
+    """
+    supabase = supabase or get_async_supabase_client()
+    catalog = ModuleCatalog(supabase)
+    loader = ModuleLoader(supabase)
+    buckets: Dict[tuple, Dict[str, Any]] = {}
+    cursor: Optional[Tuple[str, str, str]] = None
+    read = 0
+    written = 0
+
+    while True:
+        query = supabase.table("progress")\
+            .select("id, child_id, module_id, is_correct, time_taken_seconds, points_earned, created_at")
+        if child_id:
+            query = query.eq("child_id", child_id)
+        if cursor:
+            query = query.or_(_after(*cursor))
+        response = await query\
+            .order("child_id")\
+            .order("created_at")\
+            .order("id")\
+            .limit(page_size)\
+            .execute()
+
+        rows = response.data or []
+        if not rows:
+            break
+
+        modules = await catalog.get_many({row["module_id"] for row in rows}, loader=loader)
+        for stat in build_daily_stats(rows, modules):
+            _merge(buckets, stat)
+
+        # Every child before the page's last one is complete
+        last = rows[-1]
+        cursor = last["child_id"], str(last["created_at"]), last["id"]
+        done = [stat for key, stat in buckets.items() if key[0] != last["child_id"]]
+        buckets = {key: stat for key, stat in buckets.items() if key[0] == last["child_id"]}
+        written += await _write(supabase, done, page_size)
+
+        read += len(rows)
+        logger.info(f"Backfill read {read} progress rows")
+        if len(rows) < page_size:
+            break
+
+    written += await _write(supabase, list(buckets.values()), page_size)
+
+    logger.info(f"Backfill wrote {written} daily stats rows")
+    return written
+
+
+def _after(child_id: str, created_at: str, row_id: str) -> str:
+    """`or_` filter for rows after (child_id, created_at, id)"""
+    return (
+        f'child_id.gt."{child_id}",'
+        f'and(child_id.eq."{child_id}",created_at.gt."{created_at}"),'
+        f'and(child_id.eq."{child_id}",created_at.eq."{created_at}",id.gt."{row_id}")'
+    )
+
+
+async def _write(supabase, stats: List[Dict[str, Any]], page_size: int) -> int:
+    """Upsert finished rollup rows in chunks of `page_size`"""
+    for start in range(0, len(stats), page_size):
+        await supabase.table("child_daily_stats")\
+            .upsert(stats[start:start + page_size], on_conflict="child_id,day,module_type")\
+            .execute()
+    return len(stats)
+
+
+def _merge(buckets: Dict[tuple, Dict[str, Any]], stat: Dict[str, Any]):
+    """Add one page's rollup row into the running totals"""
+    key = (stat["child_id"], stat["day"], stat["module_type"])
+    bucket = buckets.get(key)
+    if bucket is None:
+        buckets[key] = stat
+        return
+
+    for column in ("questions", "correct", "seconds", "points"):
+        bucket[column] += stat[column]
+    bucket["module_ids"].extend(m for m in stat["module_ids"] if m not in bucket["module_ids"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill child_daily_stats from progress")
+    parser.add_argument("--child-id", help="Only backfill this child")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(backfill_daily_stats(child_id=args.child_id))
+
+
+if __name__ == "__main__":
+    main()
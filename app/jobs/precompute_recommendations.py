@@ -0,0 +1,205 @@
+"""
+Precompute every child's recommendations into child_recommendations
+
+Usage:
+    python -m app.jobs.precompute_recommendations [--child-id CHILD_ID] [--workers N]
+
+Children are read in pages, with each page's recent progress fetched in
+bulk, and scored across a process pool while the next page is read. Rows
+are upserted, so the job can be re-run at any time; run it nightly.
+AIService serves a stored row until its `valid_until`, or until the child
+records new progress, and computes live otherwise.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.supabase_client import get_async_supabase_client
+from app.ml.recommendation_engine import RecommendationEngine
+from app.services.ai_service import build_recommendations
+from app.services.event_window import EventWindow, WINDOW_COLUMNS
+from app.services.module_catalog import fetch_modules
+from app.utils.logger import setup_logging
+from app.utils.pagination import keyset_page
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 200
+PROGRESS_PAGE_SIZE = 1000
+
+# Set once per worker process by _init_worker
+_modules: List[Dict[str, Any]] = []
+_modules_by_id: Dict[str, Dict[str, Any]] = {}
+_engine: Optional[RecommendationEngine] = None
+
+
+def _init_worker(modules: List[Dict[str, Any]]):
+    """Give a worker the module table once instead of with every child"""
+    global _modules, _modules_by_id, _engine
+    _modules = [m for m in modules if m.get("is_active", True)]
+    _modules_by_id = {m["id"]: m for m in modules}
+    _engine = RecommendationEngine()
+
+
+def _recommend(
+    child: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    capacity: int,
+    generated_at: datetime
+) -> Dict[str, Any]:
+    """Recommendations for one child as JSON, run in a worker process"""
+    window = EventWindow.from_rows(rows, capacity)
+    recommendations = build_recommendations(
+        child["id"], child, window, _modules, _modules_by_id, _engine, generated_at
+    )
+    return recommendations.model_dump(mode="json")
+
+
+async def precompute_recommendations(
+    supabase=None,
+    child_id: Optional[str] = None,
+    workers: Optional[int] = None,
+    page_size: int = PAGE_SIZE
+) -> int:
+    """
+    Write fresh recommendations for one child or every child
+
+    Args:
+        supabase: Async Supabase client, defaults to the shared one
+        child_id: Only precompute this child
+        workers: Worker processes, defaults to one per CPU
+        page_size: Children read per page
+
+    Returns:
+        Number of children written
+    """
+    supabase = supabase or get_async_supabase_client()
+    capacity = settings.AI_EVENT_WINDOW_SIZE
+
+    # Inactive modules are kept for the types of past attempts; only
+    # active ones are recommended, in catalog order
+    modules = await fetch_modules(supabase)
+
+    loop = asyncio.get_running_loop()
+    written = 0
+    last_id = None
+    pending = None
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(modules,)
+    ) as pool:
+        while True:
+            # Stamped before the page is read, so progress recorded while
+            # it is scored leaves children.updated_at after generated_at
+            # and the stored row is treated as stale
+            generated_at = datetime.utcnow()
+            query = supabase.table("children").select("*")
+            if child_id:
+                query = query.eq("id", child_id)
+            if last_id:
+                query = query.gt("id", last_id)
+            response = await query\
+                .order("id")\
+                .limit(page_size)\
+                .execute()
+
+            children = response.data or []
+            events = await _recent_events(supabase, [child["id"] for child in children], capacity)
+
+            # Score this page while the previous one is written and the
+            # next one is read
+            batch = asyncio.gather(*(
+                loop.run_in_executor(pool, _recommend, child, events[child["id"]], capacity, generated_at)
+                for child in children
+            ), return_exceptions=True)
+            if pending is not None:
+                written += await _write(supabase, pending[0], await pending[1])
+            pending = children, batch
+
+            if len(children) < page_size:
+                break
+            last_id = children[-1]["id"]
+
+        written += await _write(supabase, pending[0], await pending[1])
+
+    logger.info(f"Precomputed recommendations for {written} children")
+    return written
+
+
+async def _recent_events(
+    supabase,
+    child_ids: List[str],
+    capacity: int,
+    page_size: int = PROGRESS_PAGE_SIZE
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Newest `capacity` progress rows of each child, newest first
+
+    One keyset-paginated query covers the whole page of children; a child
+    is dropped from the filter once their window is full.
+    """
+    events: Dict[str, List[Dict[str, Any]]] = {child_id: [] for child_id in child_ids}
+    open_ids = set(child_ids)
+    cursor = None
+
+    while open_ids:
+        query = supabase.table("progress")\
+            .select(f"id, child_id, {WINDOW_COLUMNS}")\
+            .in_("child_id", sorted(open_ids))
+        response = await keyset_page(query, cursor, page_size, desc=True).execute()
+
+        rows = response.data or []
+        for row in rows:
+            child_events = events[row["child_id"]]
+            if len(child_events) < capacity:
+                child_events.append(row)
+                if len(child_events) == capacity:
+                    open_ids.discard(row["child_id"])
+
+        if len(rows) < page_size:
+            break
+        cursor = rows[-1]["created_at"], rows[-1]["id"]
+
+    return events
+
+
+async def _write(supabase, children: List[Dict[str, Any]], results: List[Any]) -> int:
+    """Upsert one page of results, logging children that failed"""
+    rows = []
+    for child, result in zip(children, results):
+        if isinstance(result, Exception):
+            logger.error(f"Precompute recommendations failed for child {child['id']}: {str(result)}")
+            continue
+        rows.append({
+            "child_id": child["id"],
+            "recommendations": result,
+            "generated_at": result["generated_at"],
+            "valid_until": result["valid_until"]
+        })
+
+    if rows:
+        await supabase.table("child_recommendations")\
+            .upsert(rows, on_conflict="child_id")\
+            .execute()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute recommendations for every child")
+    parser.add_argument("--child-id", help="Only precompute this child")
+    parser.add_argument("--workers", type=int, help="Worker processes, defaults to one per CPU")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(precompute_recommendations(child_id=args.child_id, workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Recompute children's streak state from their activity history
+
+Usage:
+    python -m app.jobs.recompute_streaks [--child-id CHILD_ID]
+
+Active days are read from the child_daily_stats rollup, so run
+app.jobs.backfill_daily_stats first if the rollup is incomplete. Use it to
+repair streaks after late offline syncs that the incremental update could
+not place, or after manual data fixes. Each page of children is written
+with one call to the `set_child_streaks` function from app/models/child.py.
+"""
+
+from typing import List, Optional
+import argparse
+import asyncio
+import logging
+
+from app.core.supabase_client import get_async_supabase_client
+from app.services.streaks import recompute_streak
+from app.utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+
+async def recompute_streaks(
+    supabase=None,
+    child_id: Optional[str] = None,
+    page_size: int = PAGE_SIZE
+) -> int:
+    """
+    Rewrite streak state for one child or every child
+
+    Args:
+        supabase: Async Supabase client, defaults to the shared one
+        child_id: Only recompute this child
+        page_size: Children, and each child's rollup rows, read per page
+
+    Returns:
+        Number of children updated
+    """
+    supabase = supabase or get_async_supabase_client()
+    updated = 0
+    last_id = None
+
+    while True:
+        query = supabase.table("children").select("id")
+        if child_id:
+            query = query.eq("id", child_id)
+        if last_id:
+            query = query.gt("id", last_id)
+        response = await query\
+            .order("id")\
+            .limit(page_size)\
+            .execute()
+
+        children = response.data or []
+        states = {}
+        for child in children:
+            days = await _active_days(supabase, child["id"], page_size)
+            states[child["id"]] = recompute_streak(days)
+
+        if states:
+            await supabase.rpc("set_child_streaks", {"p_states": states}).execute()
+            updated += len(states)
+
+        if len(children) < page_size:
+            break
+        last_id = children[-1]["id"]
+
+    logger.info(f"Recomputed streaks for {updated} children")
+    return updated
+
+
+async def _active_days(supabase, child_id: str, page_size: int) -> List[str]:
+    """
+    Days with activity for a child, read in pages
+
+    The rollup has a row per day and module type, so long-lived children
+    go past the PostgREST row limit.
+    """
+    days: List[str] = []
+    offset = 0
+
+    while True:
+        response = await supabase.table("child_daily_stats")\
+            .select("day")\
+            .eq("child_id", child_id)\
+            .order("day")\
+            .order("module_type")\
+            .range(offset, offset + page_size - 1)\
+            .execute()
+
+        rows = response.data or []
+        days.extend(row["day"] for row in rows)
+        offset += len(rows)
+        if len(rows) < page_size:
+            return days
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute children's streak state")
+    parser.add_argument("--child-id", help="Only recompute this child")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(recompute_streaks(child_id=args.child_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,13 @@ import logging
 
 from app.core.config import settings
 from app.core.errors import add_exception_handlers
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.core.supabase_client import close_async_supabase_client
+from app.core.executor import get_sync_executor, shutdown_sync_executor
 from app.api.v1.router import api_router
+from app.api.v1.endpoints.progress import progress_service
+from app.services.progress_buffer import ProgressWriteBuffer
+from app.dependencies import token_cache
 from app.utils.logger import setup_logging
 
 # Setup logging
@@ -29,10 +35,21 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug Mode: {settings.DEBUG}")
     
+    progress_buffer = None
+    if settings.PROGRESS_WRITE_BEHIND_ENABLED:
+        progress_buffer = ProgressWriteBuffer(progress_service)
+        await progress_buffer.start()
+        progress_service.write_buffer = progress_buffer
+    
     yield
     
     # Shutdown
     logger.info("Shutting down EduStart Backend API...")
+    if progress_buffer:
+        progress_service.write_buffer = None
+        await progress_buffer.close()
+    await close_async_supabase_client()
+    await shutdown_sync_executor()
 
 
 app = FastAPI(
@@ -51,6 +68,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Add exception handlers
@@ -66,7 +84,12 @@ async def health_check():
     return {
         "status": "healthy",
         "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT
+        "environment": settings.ENVIRONMENT,
+        "sync_executor": get_sync_executor().stats(),
+        "token_cache": token_cache.stats(),
+        "report_cache": progress_service.report_cache.stats(),
+        "event_windows": progress_service.event_windows.stats(),
+        "progress_buffer": progress_service.write_buffer.stats() if progress_service.write_buffer else None
     }
 
 
@@ -1,12 +1,66 @@
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import logging
 
+from sklearn.neighbors import KDTree
+
 from app.schemas.recommendation import RecommendationReason
 
 logger = logging.getLogger(__name__)
 
+# Reason factor codes. Scoring records codes per module; only the modules
+# that are returned get RecommendationReason objects
+REASON_NONE = 0
+REASON_HIGH_PERFORMANCE = 1
+REASON_GOOD_FIT = 2
+REASON_NEW_SUBJECT = 3
+REASON_VARIETY = 4
+REASON_POSITIVE_TREND = 5
+
+REASONS = {
+    REASON_HIGH_PERFORMANCE: ("high_performance", 0.9, "You're doing great with {module_type}! Ready for more challenges."),
+    REASON_GOOD_FIT: ("good_fit", 0.7, "Perfect difficulty level for your {module_type} skills."),
+    REASON_NEW_SUBJECT: ("new_subject", 0.6, "Explore something new with {module_type}!"),
+    REASON_VARIETY: ("variety", 0.8, "Try something different to keep learning fun!"),
+    REASON_POSITIVE_TREND: ("positive_trend", 0.9, "You're improving fast! Keep up the momentum.")
+}
+
+# Child profiles for collaborative filtering: module types as in the
+# modules table constraint, and the accuracy assumed for a type a child
+# has no attempts in
+PROFILE_TYPES = ("reading", "counting", "cognitive")
+PROFILE_WIDTH = 2 + len(PROFILE_TYPES)
+DEFAULT_TYPE_ACCURACY = 0.5
+# Pending profile changes that trigger a CollaborativeFilter rebuild
+REBUILD_THRESHOLD = 1000
+
+
+class ModuleFeatures:
+    """
+    Module catalog as feature columns for vectorized scoring
+    
+    Difficulty is kept as floats and module type and education level as
+    integer codes into `type_names` and `education_levels`.
+    """
+    
+    def __init__(self, modules: List[Dict[str, Any]]):
+        self.modules = modules
+        self.difficulty = np.array([m["difficulty_level"] for m in modules], dtype=np.float64)
+        self.type_names, self.type_index = self._encode([m["type"] for m in modules])
+        self.education_levels, self.education_index = self._encode(
+            [m.get("education_level", "TK") for m in modules]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.modules)
+    
+    @staticmethod
+    def _encode(values: List[Any]) -> tuple:
+        codes: Dict[Any, int] = {}
+        index = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.intp, count=len(values))
+        return list(codes), index
+
 
 class RecommendationEngine:
     """
@@ -21,6 +75,7 @@ class RecommendationEngine:
             "engagement_history": 0.15,
             "time_since_last": 0.15
         }
+        self._features: Optional[ModuleFeatures] = None
     
     async def generate_recommendations(
         self,
@@ -32,31 +87,41 @@ class RecommendationEngine:
         """
         Generate personalized module recommendations
         
+        See `recommend`, which does the work without awaiting anything.
+        """
+        return self.recommend(child_data, progress_analysis, available_modules, limit)
+    
+    def recommend(
+        self,
+        child_data: Dict[str, Any],
+        progress_analysis: Dict[str, Any],
+        available_modules: List[Dict[str, Any]],
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate personalized module recommendations
+        
+        Every module is scored at once over the module feature matrix;
+        reasons and expected difficulty are only worked out for the top
+        `limit` modules.
+        
         Returns:
             List of recommendations with confidence scores and reasons
         """
-        recommendations = []
+        features = self._module_features(available_modules)
+        scores, reason_codes = self._score_modules(features, child_data, progress_analysis)
         
-        # Calculate scores for each module
-        for module in available_modules:
-            score, reasons = self._calculate_module_score(
-                module=module,
-                child_data=child_data,
-                progress_analysis=progress_analysis
-            )
-            
-            if score > 0.3:  # Threshold for recommendation
-                recommendations.append({
-                    "module_id": module["id"],
-                    "confidence": score,
-                    "reasons": reasons,
-                    "expected_difficulty": self._predict_difficulty(
-                        module, progress_analysis
-                    )
-                })
-        
-        # Sort by confidence score
-        recommendations.sort(key=lambda x: x["confidence"], reverse=True)
+        recommendations = []
+        for i in self._top_k(scores, limit):
+            module = features.modules[i]
+            recommendations.append({
+                "module_id": module["id"],
+                "confidence": float(scores[i]),
+                "reasons": self._expand_reasons(reason_codes[i], module["type"]),
+                "expected_difficulty": self._predict_difficulty(
+                    module, progress_analysis
+                )
+            })
         
         # Apply diversity filter
         recommendations = self._apply_diversity_filter(recommendations, limit)
@@ -65,102 +130,122 @@ class RecommendationEngine:
         
         return recommendations[:limit]
     
-    def _calculate_module_score(
+    def _module_features(self, modules: List[Dict[str, Any]]) -> ModuleFeatures:
+        """
+        Feature matrix for the catalog, rebuilt only when the catalog hands
+        out a new module list, i.e. after a reload
+        """
+        if self._features is None or self._features.modules is not modules:
+            self._features = ModuleFeatures(modules)
+        return self._features
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k best modules above the recommendation threshold
+        
+        Same result as a stable sort on -scores cut to k, equal scores in
+        catalog order, but only the candidates tied with or above the k-th
+        best score are sorted.
+        """
+        candidates = np.flatnonzero(scores > 0.3)
+        if len(candidates) > k > 0:
+            negated = -scores[candidates]
+            kth = np.partition(negated, k - 1)[k - 1]
+            candidates = candidates[negated <= kth]
+        return candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+    
+    @staticmethod
+    def _expand_reasons(codes, module_type: str) -> List[RecommendationReason]:
+        """RecommendationReason objects for a module's reason codes"""
+        reasons = []
+        for code in codes:
+            if code != REASON_NONE:
+                factor, weight, description = REASONS[code]
+                reasons.append(RecommendationReason(
+                    factor=factor,
+                    weight=weight,
+                    description=description.format(module_type=module_type)
+                ))
+        return reasons
+    
+    def _score_modules(
         self,
-        module: Dict[str, Any],
+        features: ModuleFeatures,
         child_data: Dict[str, Any],
         progress_analysis: Dict[str, Any]
     ) -> tuple:
         """
-        Calculate recommendation score for a module
+        Weighted recommendation score of every module
+        
+        Factors are evaluated per module type, broadcast to modules, and
+        summed in the weights' order.
         
         Returns:
-            Tuple of (score, reasons)
+            Tuple of (scores, reason codes), the codes an int8 array with
+            one row per module holding its accuracy, variety and trend
+            reasons in order
         """
-        reasons = []
-        scores = {}
-        
-        # 1. Accuracy match - recommend modules at appropriate difficulty
         module_performance = progress_analysis.get("module_performance", {})
-        module_type = module["type"]
+        type_names = features.type_names
         
-        if module_type in module_performance:
-            type_accuracy = module_performance[module_type]["accuracy"]
-            avg_difficulty = module_performance[module_type]["avg_difficulty"]
-            
-            # Score based on how well difficulty matches performance
-            difficulty_diff = abs(module["difficulty_level"] - avg_difficulty)
-            
-            if type_accuracy > 0.8 and module["difficulty_level"] >= avg_difficulty:
-                scores["accuracy_match"] = 0.9
-                reasons.append(RecommendationReason(
-                    factor="high_performance",
-                    weight=0.9,
-                    description=f"You're doing great with {module_type}! Ready for more challenges."
-                ))
-            elif 0.6 <= type_accuracy <= 0.8 and difficulty_diff <= 1:
-                scores["accuracy_match"] = 0.7
-                reasons.append(RecommendationReason(
-                    factor="good_fit",
-                    weight=0.7,
-                    description=f"Perfect difficulty level for your {module_type} skills."
-                ))
-            else:
-                scores["accuracy_match"] = 0.5
-        else:
-            # New module type - moderate score
-            scores["accuracy_match"] = 0.6
-            reasons.append(RecommendationReason(
-                factor="new_subject",
-                weight=0.6,
-                description=f"Explore something new with {module_type}!"
-            ))
+        # 1. Accuracy match, from the child's performance per module type
+        known = np.array([t in module_performance for t in type_names], dtype=bool)
+        type_accuracy = np.array([
+            module_performance[t]["accuracy"] if t in module_performance else 0.0 for t in type_names
+        ], dtype=np.float64)
+        avg_difficulty = np.array([
+            module_performance[t]["avg_difficulty"] if t in module_performance else 0.0 for t in type_names
+        ], dtype=np.float64)
         
-        # 2. Difficulty progression
-        current_level = child_data.get("current_level", 1)
-        level_diff = module["difficulty_level"] - current_level
+        is_known = known[features.type_index]
+        accuracy = type_accuracy[features.type_index]
+        difficulty_avg = avg_difficulty[features.type_index]
         
-        if -1 <= level_diff <= 1:
-            scores["difficulty_progression"] = 0.9
-        elif -2 <= level_diff <= 2:
-            scores["difficulty_progression"] = 0.7
-        else:
-            scores["difficulty_progression"] = 0.4
+        accuracy_cases = [
+            is_known & (accuracy > 0.8) & (features.difficulty >= difficulty_avg),
+            is_known & (0.6 <= accuracy) & (accuracy <= 0.8) & (np.abs(features.difficulty - difficulty_avg) <= 1),
+            is_known
+        ]
+        accuracy_match = np.select(accuracy_cases, [0.9, 0.7, 0.5], 0.6)
+        accuracy_reason = np.select(
+            accuracy_cases, [REASON_HIGH_PERFORMANCE, REASON_GOOD_FIT, REASON_NONE], REASON_NEW_SUBJECT
+        )
         
-        # 3. Variety score - encourage trying different types
-        recent_types = self._get_recent_module_types(progress_analysis)
-        if module_type not in recent_types[:3]:
-            scores["variety"] = 0.8
-            reasons.append(RecommendationReason(
-                factor="variety",
-                weight=0.8,
-                description="Try something different to keep learning fun!"
-            ))
-        else:
-            scores["variety"] = 0.5
-        
-        # 4. Engagement history
-        learning_velocity = progress_analysis.get("learning_velocity", 0)
-        if learning_velocity > 0.1:
-            scores["engagement_history"] = 0.9
-            reasons.append(RecommendationReason(
-                factor="positive_trend",
-                weight=0.9,
-                description="You're improving fast! Keep up the momentum."
-            ))
-        else:
-            scores["engagement_history"] = 0.6
-        
-        # 5. Time-based factor
-        scores["time_since_last"] = 0.7  # Default
-        
-        # Calculate weighted final score
-        final_score = sum(
-            scores.get(factor, 0.5) * weight
-            for factor, weight in self.weights.items()
+        # 2. Difficulty progression
+        level_diff = features.difficulty - child_data.get("current_level", 1)
+        difficulty_progression = np.select(
+            [(-1 <= level_diff) & (level_diff <= 1), (-2 <= level_diff) & (level_diff <= 2)],
+            [0.9, 0.7],
+            0.4
         )
         
-        return final_score, reasons
+        # 3. Variety score - encourage trying different types
+        recent_types = self._get_recent_module_types(progress_analysis)[:3]
+        is_recent = np.array([t in recent_types for t in type_names], dtype=bool)
+        variety = np.where(is_recent[features.type_index], 0.5, 0.8)
+        variety_reason = np.where(is_recent[features.type_index], REASON_NONE, REASON_VARIETY)
+        
+        # 4. Engagement history and 5. time since last are the same for every module
+        positive_trend = progress_analysis.get("learning_velocity", 0) > 0.1
+        scores = {
+            "accuracy_match": accuracy_match,
+            "difficulty_progression": difficulty_progression,
+            "variety": variety,
+            "engagement_history": 0.9 if positive_trend else 0.6,
+            "time_since_last": 0.7
+        }
+        
+        final_score = np.zeros(len(features))
+        for factor, weight in self.weights.items():
+            final_score = final_score + scores.get(factor, 0.5) * weight
+        
+        reason_codes = np.empty((len(features), 3), dtype=np.int8)
+        reason_codes[:, 0] = accuracy_reason
+        reason_codes[:, 1] = variety_reason
+        reason_codes[:, 2] = REASON_POSITIVE_TREND if positive_trend else REASON_NONE
+        
+        return final_score, reason_codes
     
     def _predict_difficulty(
         self,
@@ -227,8 +312,99 @@ class RecommendationEngine:
 class CollaborativeFilter:
     """
     Collaborative filtering for recommendations based on similar children
+    
+    Instances keep child profiles in a KD-tree over `_profile_features`
+    for repeated queries. Profiles added, changed or removed since the
+    last build are held aside and searched directly until `rebuild()`.
+    Rebuilds only happen on their own once `rebuild_threshold` of them
+    are pending; whoever owns the instance calls `rebuild()` for any
+    other schedule.
     """
     
+    def __init__(self, rebuild_threshold: int = REBUILD_THRESHOLD):
+        self.rebuild_threshold = rebuild_threshold
+        self._ids: List[str] = []
+        self._features = np.zeros((0, PROFILE_WIDTH))
+        self._tree: Optional[KDTree] = None
+        # Profile rows changed since the last build, None once removed
+        self._pending: Dict[str, Optional[np.ndarray]] = {}
+    
+    def build(self, children: List[Dict[str, Any]]):
+        """Index these child profiles, replacing everything held so far"""
+        self._ids = [child["id"] for child in children]
+        self._features = _profile_features(children)
+        self._pending = {}
+        self._build_tree()
+    
+    def update(self, child: Dict[str, Any]):
+        """Add a child profile or replace their current one"""
+        self._pending[child["id"]] = _profile_features([child])[0]
+        self._rebuild_if_due()
+    
+    def remove(self, child_id: str):
+        """Stop returning a child"""
+        self._pending[child_id] = None
+        self._rebuild_if_due()
+    
+    def rebuild(self):
+        """Fold pending profile changes into the tree"""
+        keep = [i for i, child_id in enumerate(self._ids) if child_id not in self._pending]
+        added = [(child_id, row) for child_id, row in self._pending.items() if row is not None]
+        
+        self._ids = [self._ids[i] for i in keep] + [child_id for child_id, _ in added]
+        self._features = np.vstack([self._features[keep]] + [row[np.newaxis] for _, row in added])
+        self._pending = {}
+        self._build_tree()
+    
+    def similar_children(self, child_profile: Dict[str, Any], top_k: int = 10) -> List[str]:
+        """
+        Ids of the `top_k` children most similar to `child_profile`
+        
+        Same children as `find_similar_children` over the indexed
+        profiles, but children equally similar may come back in any order.
+        """
+        query = _profile_features([child_profile])[0]
+        excluded = self._pending.keys() | {child_profile["id"]}
+        ids: List[str] = []
+        distances: List[float] = []
+        
+        # Stale tree rows are skipped, so widen the search until enough
+        # current ones are found
+        found = []
+        k = top_k + 1
+        while self._tree is not None:
+            k = min(k, len(self._ids))
+            tree_distances, positions = self._tree.query(query[np.newaxis], k=k)
+            found = [
+                (self._ids[i], d) for i, d in zip(positions[0], tree_distances[0])
+                if self._ids[i] not in excluded
+            ]
+            if len(found) >= top_k or k == len(self._ids):
+                break
+            k *= 2
+        
+        for child_id, distance in found[:top_k]:
+            ids.append(child_id)
+            distances.append(distance)
+        
+        pending = [
+            (child_id, row) for child_id, row in self._pending.items()
+            if row is not None and child_id != child_profile["id"]
+        ]
+        if pending:
+            ids.extend(child_id for child_id, _ in pending)
+            distances.extend(np.abs(np.array([row for _, row in pending]) - query).sum(axis=1))
+        
+        order = np.argsort(distances, kind="stable")[:top_k]
+        return [ids[i] for i in order]
+    
+    def _build_tree(self):
+        self._tree = KDTree(self._features, metric="manhattan") if len(self._ids) else None
+    
+    def _rebuild_if_due(self):
+        if len(self._pending) >= self.rebuild_threshold:
+            self.rebuild()
+    
     @staticmethod
     def find_similar_children(
         child_profile: Dict[str, Any],
@@ -238,27 +414,31 @@ class CollaborativeFilter:
         """
         Find children with similar learning patterns
         
+        One-off search without an index: distances to every child at once,
+        and only the children tied with or above the k-th best are sorted,
+        equally similar ones in input order.
+        
         Returns:
             List of similar child IDs
         """
-        # Calculate similarity scores
-        similarities = []
+        candidates = np.array(
+            [i for i, child in enumerate(all_children_data) if child["id"] != child_profile["id"]],
+            dtype=np.intp
+        )
+        if not len(candidates) or top_k <= 0:
+            return []
         
-        for other_child in all_children_data:
-            if other_child["id"] == child_profile["id"]:
-                continue
-            
-            similarity = CollaborativeFilter._calculate_similarity(
-                child_profile,
-                other_child
-            )
-            
-            similarities.append((other_child["id"], similarity))
+        query = _profile_features([child_profile])[0]
+        features = _profile_features([all_children_data[i] for i in candidates])
+        distances = np.abs(features - query).sum(axis=1)
         
-        # Sort by similarity and return top k
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        if len(candidates) > top_k:
+            kth = np.partition(distances, top_k - 1)[top_k - 1]
+            nearest = np.flatnonzero(distances <= kth)
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.argsort(distances, kind="stable")[:top_k]
         
-        return [child_id for child_id, _ in similarities[:top_k]]
+        return [all_children_data[i]["id"] for i in candidates[order]]
     
     @staticmethod
     def _calculate_similarity(
@@ -267,7 +447,7 @@ class CollaborativeFilter:
     ) -> float:
         """
         Calculate similarity between two children
-        Uses age, performance, and preferences
+        Uses age, level, and accuracy per module type
         """
         similarity = 0.0
         
@@ -281,8 +461,35 @@ class CollaborativeFilter:
         level_similarity = max(0, 1 - (level_diff / 10))
         similarity += level_similarity * 0.4
         
-        # Performance similarity (if available)
-        # This would require comparing their progress patterns
-        similarity += 0.3  # Placeholder
+        # Performance similarity, from accuracy per module type
+        accuracy1 = child1.get("type_accuracy") or {}
+        accuracy2 = child2.get("type_accuracy") or {}
+        accuracy_diff = sum(
+            abs(accuracy1.get(t, DEFAULT_TYPE_ACCURACY) - accuracy2.get(t, DEFAULT_TYPE_ACCURACY))
+            for t in PROFILE_TYPES
+        ) / len(PROFILE_TYPES)
+        similarity += (1 - accuracy_diff) * 0.3
         
-        return similarity
\ No newline at end of file
+        return similarity
+
+
+def _profile_features(children: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Child profiles as rows for nearest-neighbour search
+    
+    Columns are age, level and accuracy per module type, each scaled by
+    its weight in `_calculate_similarity`, so the Manhattan distance
+    between two rows is 1 - their similarity for ages and levels in the
+    ranges the schema allows.
+    """
+    features = np.empty((len(children), PROFILE_WIDTH))
+    features[:, 0] = [child.get("age", 0) for child in children]
+    features[:, 0] *= 0.3 / 6
+    features[:, 1] = [child.get("current_level", 0) for child in children]
+    features[:, 1] *= 0.4 / 10
+    for j, module_type in enumerate(PROFILE_TYPES, start=2):
+        features[:, j] = [
+            (child.get("type_accuracy") or {}).get(module_type, DEFAULT_TYPE_ACCURACY) for child in children
+        ]
+        features[:, j] *= 0.3 / len(PROFILE_TYPES)
+    return features
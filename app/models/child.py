@@ -3,7 +3,7 @@ Child model definition
 """
 
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel
 
 
@@ -16,6 +16,10 @@ class ChildModel(BaseModel):
     parent_id: str
     current_level: int = 1
     total_points: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    streak_start_date: Optional[date] = None
+    last_active_date: Optional[date] = None
     created_at: datetime
     updated_at: datetime
     
@@ -33,6 +37,10 @@ CREATE TABLE children (
     parent_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     current_level INTEGER DEFAULT 1 CHECK (current_level >= 1 AND current_level <= 10),
     total_points INTEGER DEFAULT 0,
+    current_streak INTEGER DEFAULT 0,
+    longest_streak INTEGER DEFAULT 0,
+    streak_start_date DATE,
+    last_active_date DATE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -46,4 +54,110 @@ ALTER TABLE children ENABLE ROW LEVEL SECURITY;
 CREATE POLICY "Parents can manage their children"
     ON children FOR ALL
     USING (parent_id = auth.uid());
-"""
\ No newline at end of file
+"""
+
+# Atomic points increment, one delta per child: {"<child_id>": <delta>, ...}
+INCREMENT_CHILD_POINTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION increment_child_points(p_deltas JSONB)
+RETURNS TABLE (id UUID, total_points INTEGER)
+LANGUAGE sql
+AS $$
+    UPDATE children AS c
+    SET total_points = c.total_points + d.delta::INTEGER,
+        updated_at = NOW()
+    FROM jsonb_each_text(p_deltas) AS d(child_id, delta)
+    WHERE c.id = d.child_id::UUID
+    RETURNING c.id, c.total_points;
+$$;
+"""
+
+
+# O(1) streak update from newly active days: {"<child_id>": ["YYYY-MM-DD", ...]}
+# Mirrors advance_streak in app/services/streaks.py
+ADVANCE_CHILD_STREAKS_FUNCTION = """
+CREATE OR REPLACE FUNCTION advance_child_streaks(p_days JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_child RECORD;
+    v_day DATE;
+    v_start DATE;
+    v_last DATE;
+    v_current INTEGER;
+    v_longest INTEGER;
+BEGIN
+    FOR v_child IN SELECT key, value FROM jsonb_each(p_days) LOOP
+        SELECT streak_start_date, last_active_date, current_streak, longest_streak
+        INTO v_start, v_last, v_current, v_longest
+        FROM children
+        WHERE id = v_child.key::UUID
+        FOR UPDATE;
+
+        IF NOT FOUND THEN
+            CONTINUE;
+        END IF;
+
+        v_current := COALESCE(v_current, 0);
+        v_longest := COALESCE(v_longest, 0);
+
+        -- Days before the run are walked backwards so each can extend it
+        FOR v_day IN
+            SELECT DISTINCT d::DATE FROM jsonb_array_elements_text(v_child.value) AS d
+            WHERE v_start IS NOT NULL AND d::DATE < v_start
+            ORDER BY 1 DESC
+        LOOP
+            IF v_day = v_start - 1 THEN
+                v_start := v_day;
+                v_current := v_current + 1;
+                v_longest := GREATEST(v_longest, v_current);
+            END IF;
+        END LOOP;
+
+        FOR v_day IN
+            SELECT DISTINCT d::DATE FROM jsonb_array_elements_text(v_child.value) AS d
+            WHERE v_start IS NULL OR d::DATE >= v_start
+            ORDER BY 1
+        LOOP
+            IF v_last IS NULL OR v_day > v_last + 1 THEN
+                v_start := v_day;
+                v_last := v_day;
+                v_current := 1;
+            ELSIF v_day = v_last + 1 THEN
+                v_last := v_day;
+                v_current := v_current + 1;
+            END IF;
+            v_longest := GREATEST(v_longest, v_current);
+        END LOOP;
+
+        UPDATE children
+        SET streak_start_date = v_start,
+            last_active_date = v_last,
+            current_streak = v_current,
+            longest_streak = v_longest,
+            updated_at = NOW()
+        WHERE id = v_child.key::UUID;
+    END LOOP;
+END;
+$$;
+"""
+
+# Overwrite streak state for a page of children in one statement:
+# {"<child_id>": {"streak_start_date": ..., "last_active_date": ...,
+#  "current_streak": ..., "longest_streak": ...}, ...}
+# Used by app/jobs/recompute_streaks.py
+SET_CHILD_STREAKS_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_child_streaks(p_states JSONB)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE children AS c
+    SET streak_start_date = (s.state->>'streak_start_date')::DATE,
+        last_active_date = (s.state->>'last_active_date')::DATE,
+        current_streak = (s.state->>'current_streak')::INTEGER,
+        longest_streak = (s.state->>'longest_streak')::INTEGER,
+        updated_at = NOW()
+    FROM jsonb_each(p_states) AS s(child_id, state)
+    WHERE c.id = s.child_id::UUID;
+$$;
+"""
@@ -17,6 +17,7 @@ class ProgressModel(BaseModel):
     time_taken_seconds: int
     attempt_count: int = 1
     points_earned: int
+    client_event_id: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -34,6 +35,7 @@ CREATE TABLE progress (
     time_taken_seconds INTEGER NOT NULL,
     attempt_count INTEGER DEFAULT 1,
     points_earned INTEGER DEFAULT 0,
+    client_event_id VARCHAR(100),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -42,6 +44,9 @@ CREATE INDEX idx_progress_child_id ON progress(child_id);
 CREATE INDEX idx_progress_module_id ON progress(module_id);
 CREATE INDEX idx_progress_created_at ON progress(created_at DESC);
 CREATE INDEX idx_progress_child_module ON progress(child_id, module_id);
+-- Keyset pagination of a child's history on (created_at, id)
+CREATE INDEX idx_progress_child_created_at ON progress(child_id, created_at DESC, id DESC);
+CREATE UNIQUE INDEX idx_progress_child_client_event ON progress(child_id, client_event_id);
 
 -- Row Level Security
 ALTER TABLE progress ENABLE ROW LEVEL SECURITY;
@@ -61,4 +66,117 @@ CREATE POLICY "System can insert progress"
             SELECT id FROM children WHERE parent_id = auth.uid()
         )
     );
-"""
\ No newline at end of file
+"""
+
+
+# Ledger of synced offline batches, one row per (child, offline session)
+PROGRESS_SYNC_BATCH_TABLE_SCHEMA = """
+CREATE TABLE progress_sync_batches (
+    child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    offline_session_id VARCHAR(100) NOT NULL,
+    synced_count INTEGER NOT NULL,
+    failed_count INTEGER NOT NULL,
+    failures JSONB DEFAULT '[]',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (child_id, offline_session_id)
+);
+
+-- Row Level Security
+ALTER TABLE progress_sync_batches ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Parents can manage their children's sync batches"
+    ON progress_sync_batches FOR ALL
+    USING (
+        child_id IN (
+            SELECT id FROM children WHERE parent_id = auth.uid()
+        )
+    );
+"""
+
+
+# Per child, day and module type totals, maintained as progress is written
+CHILD_DAILY_STATS_TABLE_SCHEMA = """
+CREATE TABLE child_daily_stats (
+    child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    module_type VARCHAR(50) NOT NULL,
+    questions INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    seconds INTEGER NOT NULL DEFAULT 0,
+    points INTEGER NOT NULL DEFAULT 0,
+    module_ids UUID[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (child_id, day, module_type)
+);
+
+-- Row Level Security
+ALTER TABLE child_daily_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Parents can manage their children's daily stats"
+    ON child_daily_stats FOR ALL
+    USING (
+        child_id IN (
+            SELECT id FROM children WHERE parent_id = auth.uid()
+        )
+    );
+"""
+
+# Adds rollup deltas; p_rows holds at most one row per (child_id, day, module_type)
+APPLY_CHILD_DAILY_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION apply_child_daily_stats(p_rows JSONB)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO child_daily_stats AS s
+        (child_id, day, module_type, questions, correct, seconds, points, module_ids)
+    SELECT
+        (r->>'child_id')::UUID,
+        (r->>'day')::DATE,
+        r->>'module_type',
+        (r->>'questions')::INTEGER,
+        (r->>'correct')::INTEGER,
+        (r->>'seconds')::INTEGER,
+        (r->>'points')::INTEGER,
+        ARRAY(SELECT jsonb_array_elements_text(r->'module_ids')::UUID)
+    FROM jsonb_array_elements(p_rows) AS r
+    ON CONFLICT (child_id, day, module_type) DO UPDATE SET
+        questions = s.questions + EXCLUDED.questions,
+        correct = s.correct + EXCLUDED.correct,
+        seconds = s.seconds + EXCLUDED.seconds,
+        points = s.points + EXCLUDED.points,
+        module_ids = ARRAY(SELECT DISTINCT unnest(s.module_ids || EXCLUDED.module_ids)),
+        updated_at = NOW();
+$$;
+"""
+
+# Summary totals over a child's rollup rows since p_start_day, in one call.
+# Module types are resolved from modules when rollup rows are written.
+# Mirrors summarize_daily_stats in app/services/daily_stats.py
+CHILD_PROGRESS_SUMMARY_FUNCTION = """
+CREATE OR REPLACE FUNCTION child_progress_summary(p_child_id UUID, p_start_day DATE)
+RETURNS TABLE (
+    total_seconds BIGINT,
+    total_questions BIGINT,
+    total_correct BIGINT,
+    modules_completed BIGINT,
+    favorite_module_type VARCHAR
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH stats AS (
+        SELECT * FROM child_daily_stats
+        WHERE child_id = p_child_id AND day >= p_start_day
+    )
+    SELECT
+        COALESCE(SUM(s.seconds), 0),
+        COALESCE(SUM(s.questions), 0),
+        COALESCE(SUM(s.correct), 0),
+        (SELECT COUNT(DISTINCT m) FROM stats, unnest(stats.module_ids) AS m),
+        (SELECT module_type FROM stats
+         GROUP BY module_type
+         ORDER BY SUM(questions) DESC, module_type
+         LIMIT 1)
+    FROM stats s;
+$$;
+"""
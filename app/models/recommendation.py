@@ -0,0 +1,41 @@
+"""
+Precomputed recommendation model definition
+"""
+
+from typing import Any, Dict
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ChildRecommendationModel(BaseModel):
+    """Precomputed recommendations database model"""
+    child_id: str
+    recommendations: Dict[str, Any]  # RecommendationResponse as JSON
+    generated_at: datetime
+    valid_until: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+# SQL Schema
+# Written by app.jobs.precompute_recommendations, one row per child
+CHILD_RECOMMENDATIONS_TABLE_SCHEMA = """
+CREATE TABLE child_recommendations (
+    child_id UUID PRIMARY KEY REFERENCES children(id) ON DELETE CASCADE,
+    recommendations JSONB NOT NULL,
+    generated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_until TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Row Level Security
+ALTER TABLE child_recommendations ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Parents can view their children's recommendations"
+    ON child_recommendations FOR SELECT
+    USING (
+        child_id IN (
+            SELECT id FROM children WHERE parent_id = auth.uid()
+        )
+    );
+"""
@@ -28,6 +28,7 @@ class ModuleResponse(BaseModel):
     thumbnail_url: Optional[str] = None
     total_questions: int
     points_reward: int
+    created_at: Optional[datetime] = None
 
 
 class ModuleCreate(BaseModel):
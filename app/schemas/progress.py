@@ -2,6 +2,10 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime
 
+# Leaves room in client_event_id (VARCHAR(100)) for the ":<index>" suffix
+# of ids derived for events sent without one
+OFFLINE_SESSION_ID_MAX_LENGTH = 64
+
 
 class ProgressEventCreate(BaseModel):
     """Schema for creating a progress event"""
@@ -10,12 +14,14 @@ class ProgressEventCreate(BaseModel):
     is_correct: bool
     time_taken_seconds: int = Field(..., ge=0)
     attempt_count: int = Field(default=1, ge=1)
+    client_event_id: Optional[str] = Field(default=None, max_length=100)
+    occurred_at: Optional[datetime] = None
 
 
 class ProgressBatchCreate(BaseModel):
     """Schema for batch progress sync"""
     events: List[ProgressEventCreate]
-    offline_session_id: str
+    offline_session_id: str = Field(..., min_length=1, max_length=OFFLINE_SESSION_ID_MAX_LENGTH)
     synced_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -40,6 +46,7 @@ class ProgressSummary(BaseModel):
     total_questions_answered: int
     average_accuracy: float
     current_streak_days: int
+    longest_streak_days: int = 0
     total_points: int
     favorite_module_type: Optional[str] = None
     most_active_time: Optional[str] = None
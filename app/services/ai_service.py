@@ -1,9 +1,11 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Mapping
+from collections import ChainMap
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import numpy as np
 
-from app.core.supabase_client import get_supabase_client
+from app.core.supabase_client import get_async_supabase_client
 from app.schemas.recommendation import (
     RecommendationResponse,
     RecommendedModule,
@@ -13,6 +15,12 @@ from app.schemas.module import ModuleResponse
 from app.core.config import settings
 from app.ml.adaptive_model import AdaptiveLearningModel
 from app.ml.recommendation_engine import RecommendationEngine
+from app.services.module_loader import ModuleLoader
+from app.services.module_catalog import get_module_catalog, module_type_of
+from app.services.event_window import EventWindow, WINDOW_COLUMNS, get_event_windows
+from app.services.progress_versions import get_progress_versions
+from app.utils.cache import TTLCache
+from app.utils.pagination import parse_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -21,82 +29,129 @@ class AIService:
     """Service for AI-powered adaptive learning and recommendations"""
     
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_async_supabase_client()
+        self.catalog = get_module_catalog()
         self.adaptive_model = AdaptiveLearningModel()
         self.recommendation_engine = RecommendationEngine()
+        self.event_windows = get_event_windows()
+        self.progress_versions = get_progress_versions()
+        self.recommendation_cache = TTLCache(
+            maxsize=settings.RECOMMENDATION_CACHE_SIZE,
+            ttl_seconds=settings.RECOMMENDATION_VALID_HOURS * 3600
+        )
     
     async def get_recommendations(self, child_id: str) -> Optional[RecommendationResponse]:
         """
         Get personalized module recommendations for a child
+        
+        Rows precomputed by app.jobs.precompute_recommendations are served
+        while fresh; stale or missing ones are computed live. Responses are
+        cached until their `valid_until`, keyed by the catalog and the
+        child's progress version so module writes and new progress
+        recompute them.
+        """
+        key = (child_id, self.catalog.version, self.progress_versions.get(child_id))
+        cached = self.recommendation_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        recommendations, child = await self._stored_recommendations(child_id)
+        if recommendations is None:
+            recommendations = await self._compute_recommendations(child_id, child)
+        if recommendations:
+            ttl = (recommendations.valid_until - datetime.utcnow()).total_seconds()
+            self.recommendation_cache.set(key, recommendations, ttl)
+        
+        return recommendations
+    
+    async def _stored_recommendations(self, child_id: str) -> tuple:
+        """
+        The child's precomputed recommendations, or None when there are
+        none or they are stale, and the child row read alongside them
+        
+        A row is stale once past its `valid_until`, when the child row was
+        updated after it was generated (recording progress bumps
+        `children.updated_at`), or when a recommended module has left the
+        catalog.
         """
         try:
-            # Get child data
-            child = self.supabase.table("children")\
-                .select("*")\
-                .eq("id", child_id)\
-                .single()\
-                .execute()
+            stored, child = await asyncio.gather(
+                self.supabase.table("child_recommendations")\
+                    .select("recommendations")\
+                    .eq("child_id", child_id)\
+                    .limit(1)\
+                    .execute(),
+                self.supabase.table("children")\
+                    .select("*")\
+                    .eq("id", child_id)\
+                    .limit(1)\
+                    .execute()
+            )
             
-            if not child.data:
-                return None
+            child = child.data[0] if child.data else None
+            if not stored.data or not child:
+                return None, child
             
-            # Get child's progress history
-            progress = self.supabase.table("progress")\
-                .select("*")\
-                .eq("child_id", child_id)\
-                .order("created_at", desc=True)\
-                .limit(100)\
-                .execute()
+            recommendations = RecommendationResponse(**stored.data[0]["recommendations"])
+            if recommendations.valid_until <= datetime.utcnow():
+                return None, child
             
-            # Check if we have enough data for personalization
-            if len(progress.data) < settings.ML_MIN_DATA_POINTS:
-                # Return beginner modules
-                return await self._get_beginner_recommendations(child_id, child.data)
+            updated_at = child.get("updated_at")
+            if updated_at and _as_utc(updated_at) > recommendations.generated_at:
+                return None, child
             
-            # Analyze progress data
-            analysis = self._analyze_progress_data(progress.data)
+            modules = await self.catalog.by_id()
+            if any(rec.module.id not in modules for rec in recommendations.recommended_modules):
+                return None, child
             
-            # Get all available modules
-            modules = self.supabase.table("modules")\
-                .select("*")\
-                .execute()
+            return recommendations, child
             
-            # Generate recommendations using ML model
-            recommendations = await self.recommendation_engine.generate_recommendations(
-                child_data=child.data,
-                progress_analysis=analysis,
-                available_modules=modules.data
-            )
+        except Exception as e:
+            logger.error(f"Read stored recommendations failed: {str(e)}")
+            return None, None
+    
+    async def _compute_recommendations(
+        self,
+        child_id: str,
+        child: Optional[Dict[str, Any]] = None
+    ) -> Optional[RecommendationResponse]:
+        """
+        Compute recommendations from the child's recent progress
+        
+        `child` is the child row when the caller has already read it.
+        """
+        try:
+            # Get child data
+            if child is None:
+                response = await self.supabase.table("children")\
+                    .select("*")\
+                    .eq("id", child_id)\
+                    .single()\
+                    .execute()
+                child = response.data
             
-            # Convert to response format
-            recommended_modules = []
-            for rec in recommendations:
-                module_data = next((m for m in modules.data if m["id"] == rec["module_id"]), None)
-                if module_data:
-                    recommended_modules.append(
-                        RecommendedModule(
-                            module=ModuleResponse(**module_data),
-                            confidence_score=rec["confidence"],
-                            reasons=rec["reasons"],
-                            expected_difficulty=rec["expected_difficulty"]
-                        )
-                    )
+            if not child:
+                return None
             
-            # Determine personalization level
-            personalization_level = "high" if len(progress.data) > 50 else \
-                                   "medium" if len(progress.data) > 20 else "low"
+            # Get child's recent progress
+            window = await self._get_event_window(child_id)
             
-            logger.info(f"Generated {len(recommended_modules)} recommendations for child {child_id}")
+            # Get all available modules, plus any inactive module the
+            # child attempted, batched into one round trip
+            modules = await self.catalog.all()
+            modules_by_id = await self.catalog.by_id()
+            if len(window) >= settings.ML_MIN_DATA_POINTS:
+                attempted = await self.catalog.get_many(window.module_ids, loader=ModuleLoader(self.supabase))
+                modules_by_id = ChainMap({k: v for k, v in attempted.items() if v}, modules_by_id)
             
-            return RecommendationResponse(
-                child_id=child_id,
-                recommended_modules=recommended_modules,
-                next_best_module=recommended_modules[0] if recommended_modules else None,
-                personalization_level=personalization_level,
-                generated_at=datetime.utcnow(),
-                valid_until=datetime.utcnow() + timedelta(hours=24)
+            recommendations = build_recommendations(
+                child_id, child, window, modules, modules_by_id, self.recommendation_engine
             )
             
+            logger.info(f"Generated {len(recommendations.recommended_modules)} recommendations for child {child_id}")
+            
+            return recommendations
+            
         except Exception as e:
             logger.error(f"Get recommendations failed: {str(e)}")
             return None
@@ -104,6 +159,8 @@ class AIService:
     async def get_next_module(self, child_id: str) -> Optional[Dict[str, Any]]:
         """
         Get the next best module for immediate learning
+        
+        Read from the same cached recommendations as `get_recommendations`.
         """
         try:
             recommendations = await self.get_recommendations(child_id)
@@ -134,37 +191,28 @@ class AIService:
         """
         try:
             # Get recent progress for this module
-            recent_progress = self.supabase.table("progress")\
-                .select("*")\
-                .eq("child_id", child_id)\
-                .eq("module_id", module_id)\
-                .order("created_at", desc=True)\
-                .limit(10)\
-                .execute()
+            is_correct, seconds = await self._recent_module_events(child_id, module_id)
             
-            if not recent_progress.data:
+            if not len(is_correct):
                 raise ValueError("No progress data found for this module")
             
             # Calculate performance metrics
-            data = recent_progress.data
-            accuracy = sum(1 for p in data if p["is_correct"]) / len(data)
-            avg_time = sum(p["time_taken_seconds"] for p in data) / len(data)
+            accuracy = np.count_nonzero(is_correct) / len(is_correct)
+            avg_time = int(seconds.sum()) / len(seconds)
             
             # Get current module difficulty
-            module = self.supabase.table("modules")\
-                .select("difficulty_level")\
-                .eq("id", module_id)\
-                .single()\
-                .execute()
+            module = await self.catalog.get(module_id)
+            if not module:
+                raise ValueError("Module not found")
             
-            current_level = module.data["difficulty_level"]
+            current_level = module["difficulty_level"]
             
             # Determine new difficulty level
             new_level, reason = self._calculate_new_difficulty(
                 current_level=current_level,
                 accuracy=accuracy,
                 avg_time=avg_time,
-                attempt_count=len(data)
+                attempt_count=len(is_correct)
             )
             
             logger.info(f"Adjusted difficulty for child {child_id}, module {module_id}: {current_level} -> {new_level}")
@@ -185,149 +233,45 @@ class AIService:
             logger.error(f"Adjust difficulty failed: {str(e)}")
             raise
     
-    async def _get_beginner_recommendations(
-        self,
-        child_id: str,
-        child_data: Dict[str, Any]
-    ) -> RecommendationResponse:
+    async def _get_event_window(self, child_id: str) -> EventWindow:
         """
-        Get beginner-level recommendations for new users
+        The child's newest progress events, loaded on first use and kept
+        current by ProgressService as events are recorded
         """
-        age = child_data["age"]
-        
-        # Get age-appropriate beginner modules
-        modules = self.supabase.table("modules")\
-            .select("*")\
-            .lte("difficulty_level", 3)\
-            .limit(5)\
-            .execute()
-        
-        recommended_modules = []
-        for i, module_data in enumerate(modules.data):
-            reasons = [
-                RecommendationReason(
-                    factor="age_appropriate",
-                    weight=1.0,
-                    description=f"Suitable for age {age}"
-                ),
-                RecommendationReason(
-                    factor="beginner_level",
-                    weight=0.9,
-                    description="Great for starting your learning journey"
-                )
-            ]
-            
-            recommended_modules.append(
-                RecommendedModule(
-                    module=ModuleResponse(**module_data),
-                    confidence_score=0.8 - (i * 0.1),
-                    reasons=reasons,
-                    expected_difficulty=module_data["difficulty_level"]
-                )
-            )
-        
-        return RecommendationResponse(
-            child_id=child_id,
-            recommended_modules=recommended_modules,
-            next_best_module=recommended_modules[0] if recommended_modules else None,
-            personalization_level="low",
-            generated_at=datetime.utcnow(),
-            valid_until=datetime.utcnow() + timedelta(hours=24)
-        )
+        window = self.event_windows.get(child_id)
+        if window is None:
+            progress = await self.supabase.table("progress")\
+                .select(WINDOW_COLUMNS)\
+                .eq("child_id", child_id)\
+                .order("created_at", desc=True)\
+                .limit(self.event_windows.capacity)\
+                .execute()
+            window = self.event_windows.load(child_id, progress.data or [])
+        return window
     
-    def _analyze_progress_data(self, progress_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _recent_module_events(self, child_id: str, module_id: str, limit: int = 10) -> tuple:
         """
-        Analyze progress data to extract learning patterns
+        Correctness and time taken of the child's newest `limit` events
+        in a module, newest first
         """
-        if not progress_data:
-            return {}
-        
-        # Calculate overall metrics
-        total_questions = len(progress_data)
-        correct_answers = sum(1 for p in progress_data if p["is_correct"])
-        accuracy = correct_answers / total_questions if total_questions > 0 else 0
-        
-        # Calculate average time
-        avg_time = sum(p["time_taken_seconds"] for p in progress_data) / total_questions
-        
-        # Group by module type
-        module_performance = {}
-        for progress in progress_data:
-            module_id = progress["module_id"]
-            
-            # Get module info
-            module = self.supabase.table("modules")\
-                .select("type, difficulty_level")\
-                .eq("id", module_id)\
-                .single()\
-                .execute()
-            
-            if module.data:
-                module_type = module.data["type"]
-                if module_type not in module_performance:
-                    module_performance[module_type] = {
-                        "attempts": 0,
-                        "correct": 0,
-                        "total_time": 0,
-                        "difficulty_levels": []
-                    }
-                
-                module_performance[module_type]["attempts"] += 1
-                if progress["is_correct"]:
-                    module_performance[module_type]["correct"] += 1
-                module_performance[module_type]["total_time"] += progress["time_taken_seconds"]
-                module_performance[module_type]["difficulty_levels"].append(module.data["difficulty_level"])
-        
-        # Calculate accuracy by module type
-        for module_type, perf in module_performance.items():
-            perf["accuracy"] = perf["correct"] / perf["attempts"] if perf["attempts"] > 0 else 0
-            perf["avg_time"] = perf["total_time"] / perf["attempts"] if perf["attempts"] > 0 else 0
-            perf["avg_difficulty"] = np.mean(perf["difficulty_levels"]) if perf["difficulty_levels"] else 0
-        
-        # Identify learning velocity (improvement rate)
-        recent_accuracy = self._calculate_recent_accuracy(progress_data[-10:])
-        older_accuracy = self._calculate_recent_accuracy(progress_data[:10])
-        learning_velocity = recent_accuracy - older_accuracy
-        
-        return {
-            "overall_accuracy": accuracy,
-            "avg_time_seconds": avg_time,
-            "total_attempts": total_questions,
-            "module_performance": module_performance,
-            "learning_velocity": learning_velocity,
-            "consistency_score": self._calculate_consistency(progress_data)
-        }
-    
-    def _calculate_recent_accuracy(self, progress_data: List[Dict[str, Any]]) -> float:
-        """Calculate accuracy for a subset of progress data"""
-        if not progress_data:
-            return 0.0
-        correct = sum(1 for p in progress_data if p["is_correct"])
-        return correct / len(progress_data)
-    
-    def _calculate_consistency(self, progress_data: List[Dict[str, Any]]) -> float:
-        """Calculate learning consistency score (0-1)"""
-        if len(progress_data) < 7:
-            return 0.5
-        
-        # Group by date
-        dates = {}
-        for p in progress_data:
-            date = p["created_at"][:10]  # Extract date part
-            dates[date] = dates.get(date, 0) + 1
-        
-        # Calculate standard deviation of daily activity
-        daily_counts = list(dates.values())
-        if len(daily_counts) < 2:
-            return 0.5
-        
-        std_dev = np.std(daily_counts)
-        mean_count = np.mean(daily_counts)
+        window = await self._get_event_window(child_id)
+        positions = window.module_events(module_id, limit)
+        if positions is not None:
+            return window.is_correct[positions], window.seconds[positions]
         
-        # Lower std_dev relative to mean = higher consistency
-        consistency = max(0, 1 - (std_dev / (mean_count + 1)))
-        
-        return consistency
+        # Older events of this module fell out of the window
+        response = await self.supabase.table("progress")\
+            .select("is_correct, time_taken_seconds")\
+            .eq("child_id", child_id)\
+            .eq("module_id", module_id)\
+            .order("created_at", desc=True)\
+            .limit(limit)\
+            .execute()
+        data = response.data or []
+        return (
+            np.array([p["is_correct"] for p in data], dtype=bool),
+            np.array([p["time_taken_seconds"] for p in data], dtype=np.int64)
+        )
     
     def _calculate_new_difficulty(
         self,
@@ -369,6 +313,220 @@ class AIService:
         return new_level, reason
 
 
+def build_recommendations(
+    child_id: str,
+    child: Dict[str, Any],
+    window: EventWindow,
+    modules: List[Dict[str, Any]],
+    modules_by_id: Mapping[str, Dict[str, Any]],
+    engine: RecommendationEngine,
+    generated_at: Optional[datetime] = None
+) -> RecommendationResponse:
+    """
+    Recommendations for a child from their event window
+    
+    Does no I/O, so the nightly precompute job can run it in worker
+    processes. `modules` are the active modules in catalog order and
+    `modules_by_id` must also hold any inactive module the child attempted.
+    `generated_at` defaults to now; pass the time the child and window
+    were read so that later progress marks the result stale.
+    """
+    generated_at = generated_at or datetime.utcnow()
+    
+    # Check if we have enough data for personalization
+    if len(window) < settings.ML_MIN_DATA_POINTS:
+        # Return beginner modules
+        return _beginner_recommendations(child_id, child, modules, generated_at)
+    
+    # Analyze progress data
+    analysis = analyze_progress(window, modules_by_id)
+    
+    # Generate recommendations using ML model
+    recommendations = engine.recommend(
+        child_data=child,
+        progress_analysis=analysis,
+        available_modules=modules
+    )
+    
+    # Convert to response format
+    recommended_modules = []
+    for rec in recommendations:
+        module_data = modules_by_id.get(rec["module_id"])
+        if module_data:
+            recommended_modules.append(
+                RecommendedModule(
+                    module=ModuleResponse(**module_data),
+                    confidence_score=rec["confidence"],
+                    reasons=rec["reasons"],
+                    expected_difficulty=rec["expected_difficulty"]
+                )
+            )
+    
+    # Determine personalization level
+    personalization_level = "high" if len(window) > 50 else \
+                           "medium" if len(window) > 20 else "low"
+    
+    return RecommendationResponse(
+        child_id=child_id,
+        recommended_modules=recommended_modules,
+        next_best_module=recommended_modules[0] if recommended_modules else None,
+        personalization_level=personalization_level,
+        generated_at=generated_at,
+        valid_until=generated_at + timedelta(hours=settings.RECOMMENDATION_VALID_HOURS)
+    )
+
+
+def _beginner_recommendations(
+    child_id: str,
+    child_data: Dict[str, Any],
+    modules: List[Dict[str, Any]],
+    generated_at: datetime
+) -> RecommendationResponse:
+    """
+    Get beginner-level recommendations for new users
+    """
+    age = child_data["age"]
+    
+    # Get age-appropriate beginner modules
+    modules = [m for m in modules if m["difficulty_level"] <= 3][:5]
+    
+    recommended_modules = []
+    for i, module_data in enumerate(modules):
+        reasons = [
+            RecommendationReason(
+                factor="age_appropriate",
+                weight=1.0,
+                description=f"Suitable for age {age}"
+            ),
+            RecommendationReason(
+                factor="beginner_level",
+                weight=0.9,
+                description="Great for starting your learning journey"
+            )
+        ]
+        
+        recommended_modules.append(
+            RecommendedModule(
+                module=ModuleResponse(**module_data),
+                confidence_score=0.8 - (i * 0.1),
+                reasons=reasons,
+                expected_difficulty=module_data["difficulty_level"]
+            )
+        )
+    
+    return RecommendationResponse(
+        child_id=child_id,
+        recommended_modules=recommended_modules,
+        next_best_module=recommended_modules[0] if recommended_modules else None,
+        personalization_level="low",
+        generated_at=generated_at,
+        valid_until=generated_at + timedelta(hours=settings.RECOMMENDATION_VALID_HOURS)
+    )
+
+
+def analyze_progress(
+    window: EventWindow,
+    modules: Mapping[str, Optional[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Learning patterns in an event window
+    
+    `modules` maps the ids of attempted modules to their rows; events of
+    modules missing from it are left out of the per-type breakdown.
+    """
+    if not len(window):
+        return {}
+    
+    is_correct, seconds, module_index = window.is_correct, window.seconds, window.module_index
+    module_ids = list(window.module_ids)
+    
+    # Calculate overall metrics
+    total_questions = len(is_correct)
+    accuracy = np.count_nonzero(is_correct) / total_questions
+    
+    # Calculate average time
+    avg_time = int(seconds.sum()) / total_questions
+    
+    # Totals per module, then grouped by module type with types in
+    # order of their most recent attempt
+    attempts = np.bincount(module_index, minlength=len(module_ids))
+    correct = np.bincount(module_index, weights=is_correct, minlength=len(module_ids))
+    total_time = np.bincount(module_index, weights=seconds, minlength=len(module_ids))
+    codes, first_seen = np.unique(module_index, return_index=True)
+    
+    module_performance = {}
+    difficulty_totals = {}
+    for code in codes[np.argsort(first_seen, kind="stable")]:
+        module = modules.get(module_ids[code])
+        if not module:
+            continue
+        
+        module_type = module_type_of(module)
+        if module_type not in module_performance:
+            module_performance[module_type] = {"attempts": 0, "correct": 0, "total_time": 0}
+            difficulty_totals[module_type] = 0
+        
+        perf = module_performance[module_type]
+        perf["attempts"] += int(attempts[code])
+        perf["correct"] += int(correct[code])
+        perf["total_time"] += int(total_time[code])
+        difficulty_totals[module_type] += module["difficulty_level"] * int(attempts[code])
+    
+    # Calculate accuracy by module type
+    for module_type, perf in module_performance.items():
+        perf["accuracy"] = perf["correct"] / perf["attempts"]
+        perf["avg_time"] = perf["total_time"] / perf["attempts"]
+        perf["avg_difficulty"] = difficulty_totals[module_type] / perf["attempts"]
+    
+    # Identify learning velocity (improvement rate)
+    recent_accuracy = _recent_accuracy(is_correct[-10:])
+    older_accuracy = _recent_accuracy(is_correct[:10])
+    learning_velocity = recent_accuracy - older_accuracy
+    
+    return {
+        "overall_accuracy": accuracy,
+        "avg_time_seconds": avg_time,
+        "total_attempts": total_questions,
+        "module_performance": module_performance,
+        "learning_velocity": learning_velocity,
+        "consistency_score": _consistency(window)
+    }
+
+
+def _as_utc(value: Any) -> datetime:
+    """Naive UTC datetime of a timestamp, like the ones in responses"""
+    value = value if isinstance(value, datetime) else parse_timestamp(str(value))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _recent_accuracy(is_correct: np.ndarray) -> float:
+    """Calculate accuracy for a slice of the event window"""
+    if not len(is_correct):
+        return 0.0
+    return np.count_nonzero(is_correct) / len(is_correct)
+
+
+def _consistency(window: EventWindow) -> float:
+    """Calculate learning consistency score (0-1)"""
+    if len(window) < 7:
+        return 0.5
+    
+    # Calculate standard deviation of daily activity
+    daily_counts = window.daily_counts()
+    if len(daily_counts) < 2:
+        return 0.5
+    
+    std_dev = np.std(daily_counts)
+    mean_count = np.mean(daily_counts)
+    
+    # Lower std_dev relative to mean = higher consistency
+    consistency = max(0, 1 - (std_dev / (mean_count + 1)))
+    
+    return consistency
+
+
 class PerformanceAnalyzer:
     """Utility class for analyzing learning performance"""
     
@@ -2,7 +2,7 @@ from typing import Optional
 import logging
 from datetime import datetime, timedelta
 
-from app.core.supabase_client import get_supabase_client
+from app.core.supabase_client import get_async_supabase_client
 from app.schemas.user import UserRegister, UserLogin, UserResponse, TokenResponse
 from app.core.config import settings
 
@@ -13,7 +13,7 @@ class AuthService:
     """Service for authentication operations"""
     
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_async_supabase_client()
     
     async def register_user(self, user_data: UserRegister) -> UserResponse:
         """
@@ -21,7 +21,7 @@ class AuthService:
         """
         try:
             # Register with Supabase Auth
-            auth_response = self.supabase.auth.sign_up({
+            auth_response = await self.supabase.auth.sign_up({
                 "email": user_data.email,
                 "password": user_data.password,
                 "options": {
@@ -46,7 +46,7 @@ class AuthService:
                 "created_at": datetime.utcnow().isoformat()
             }
             
-            self.supabase.table("users").insert(profile_data).execute()
+            await self.supabase.table("users").insert(profile_data).execute()
             
             logger.info(f"User registered successfully: {user.email}")
             
@@ -67,7 +67,7 @@ class AuthService:
         Login user and return tokens
         """
         try:
-            auth_response = self.supabase.auth.sign_in_with_password({
+            auth_response = await self.supabase.auth.sign_in_with_password({
                 "email": credentials.email,
                 "password": credentials.password
             })
@@ -95,7 +95,7 @@ class AuthService:
         Logout user
         """
         try:
-            self.supabase.auth.sign_out()
+            await self.supabase.auth.sign_out()
             logger.info(f"User logged out: {user_id}")
             return True
         except Exception as e:
@@ -107,7 +107,7 @@ class AuthService:
         Refresh access token
         """
         try:
-            auth_response = self.supabase.auth.refresh_session(refresh_token)
+            auth_response = await self.supabase.auth.refresh_session(refresh_token)
             
             if not auth_response.session:
                 raise ValueError("Invalid refresh token")
@@ -130,7 +130,7 @@ class AuthService:
         Record user acceptance of privacy policy
         """
         try:
-            self.supabase.table("users").update({
+            await self.supabase.table("users").update({
                 "privacy_policy_accepted_at": datetime.utcnow().isoformat()
             }).eq("id", user_id).execute()
             
@@ -145,7 +145,7 @@ class AuthService:
         Get user profile including privacy policy status
         """
         try:
-            response = self.supabase.table("users").select("*").eq("id", user_id).single().execute()
+            response = await self.supabase.table("users").select("*").eq("id", user_id).single().execute()
             return response.data
         except Exception as e:
             logger.error(f"Failed to get user profile: {str(e)}")
@@ -2,9 +2,10 @@ from typing import List, Optional
 import logging
 from datetime import datetime
 
-from app.core.supabase_client import get_supabase_client
+from app.core.supabase_client import get_async_supabase_client
 from app.schemas.child import ChildCreate, ChildUpdate, ChildResponse
 from app.core.config import settings
+from app.utils.pagination import Cursor, keyset_page
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +14,7 @@ class ChildService:
     """Service for child management operations"""
     
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_async_supabase_client()
     
     async def create_child(self, child_data: ChildCreate, parent_id: str) -> ChildResponse:
         """
@@ -21,7 +22,7 @@ class ChildService:
         """
         try:
             # Check max children limit
-            existing = self.supabase.table("children")\
+            existing = await self.supabase.table("children")\
                 .select("id")\
                 .eq("parent_id", parent_id)\
                 .execute()
@@ -46,7 +47,7 @@ class ChildService:
                 "updated_at": now
             }
             
-            response = self.supabase.table("children").insert(child_record).execute()
+            response = await self.supabase.table("children").insert(child_record).execute()
             
             if not response.data:
                 raise ValueError("Failed to create child")
@@ -66,17 +67,25 @@ class ChildService:
         self,
         parent_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[Cursor] = None
     ) -> List[ChildResponse]:
         """
-        Get all children for a parent
+        Get all children for a parent, oldest first
+        
+        With a cursor the page starts after that child and `skip` is ignored.
         """
         try:
-            response = self.supabase.table("children")\
+            query = self.supabase.table("children")\
                 .select("*")\
-                .eq("parent_id", parent_id)\
-                .range(skip, skip + limit - 1)\
-                .execute()
+                .eq("parent_id", parent_id)
+            
+            if cursor:
+                query = keyset_page(query, cursor, limit)
+            else:
+                query = query.order("created_at").order("id").range(skip, skip + limit - 1)
+            
+            response = await query.execute()
             
             return [ChildResponse(**child) for child in response.data]
             
@@ -89,7 +98,7 @@ class ChildService:
         Get a specific child by ID
         """
         try:
-            response = self.supabase.table("children")\
+            response = await self.supabase.table("children")\
                 .select("*")\
                 .eq("id", child_id)\
                 .eq("parent_id", parent_id)\
@@ -132,7 +141,7 @@ class ChildService:
             
             update_data["updated_at"] = datetime.utcnow().isoformat()
             
-            response = self.supabase.table("children")\
+            response = await self.supabase.table("children")\
                 .update(update_data)\
                 .eq("id", child_id)\
                 .eq("parent_id", parent_id)\
@@ -154,7 +163,7 @@ class ChildService:
         Delete child profile
         """
         try:
-            response = self.supabase.table("children")\
+            response = await self.supabase.table("children")\
                 .delete()\
                 .eq("id", child_id)\
                 .eq("parent_id", parent_id)\
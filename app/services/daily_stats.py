@@ -0,0 +1,72 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.services.module_catalog import module_type_of
+
+# Rollup bucket for events whose module no longer exists
+UNKNOWN_MODULE_TYPE = "other"
+
+
+def build_daily_stats(
+    rows: Iterable[Dict[str, Any]],
+    modules: Dict[str, Optional[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate progress rows into child_daily_stats deltas
+
+    Rows are grouped by child, UTC day and module type; `modules` maps
+    module ids to module rows. Each result row holds the question, correct
+    answer, second and point totals plus the distinct module ids seen.
+    """
+    buckets: Dict[tuple, Dict[str, Any]] = {}
+
+    for row in rows:
+        module = modules.get(row["module_id"])
+        module_type = (module_type_of(module) if module else None) or UNKNOWN_MODULE_TYPE
+        key = (row["child_id"], str(row["created_at"])[:10], module_type)
+
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                "child_id": key[0],
+                "day": key[1],
+                "module_type": module_type,
+                "questions": 0,
+                "correct": 0,
+                "seconds": 0,
+                "points": 0,
+                "module_ids": []
+            }
+
+        bucket["questions"] += 1
+        bucket["correct"] += 1 if row["is_correct"] else 0
+        bucket["seconds"] += row["time_taken_seconds"]
+        bucket["points"] += row.get("points_earned") or 0
+        if row["module_id"] not in bucket["module_ids"]:
+            bucket["module_ids"].append(row["module_id"])
+
+    return list(buckets.values())
+
+
+def summarize_daily_stats(stats: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summary totals over rollup rows
+
+    The most practised module type wins, ties going to the first by name.
+    Mirrors CHILD_PROGRESS_SUMMARY_FUNCTION in app/models/progress.py.
+    """
+    totals = {"total_seconds": 0, "total_questions": 0, "total_correct": 0}
+    questions_by_type: Dict[str, int] = {}
+    module_ids = set()
+
+    for row in stats:
+        totals["total_seconds"] += row["seconds"]
+        totals["total_questions"] += row["questions"]
+        totals["total_correct"] += row["correct"]
+        questions_by_type[row["module_type"]] = questions_by_type.get(row["module_type"], 0) + row["questions"]
+        module_ids.update(row["module_ids"])
+
+    totals["modules_completed"] = len(module_ids)
+    totals["favorite_module_type"] = min(
+        questions_by_type, key=lambda module_type: (-questions_by_type[module_type], module_type)
+    ) if questions_by_type else None
+    return totals
@@ -0,0 +1,155 @@
+from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+WINDOW_COLUMNS = "module_id, is_correct, time_taken_seconds, created_at"
+
+
+class EventWindow:
+    """
+    A child's most recent progress events as NumPy columns, newest first
+
+    Holds at most `capacity` events, the same rows as a
+    `created_at DESC LIMIT capacity` query. `complete` is set while the
+    window holds the child's whole history, so per-module questions can
+    be answered without going back to the database.
+    """
+
+    def __init__(self, capacity: int, complete: bool):
+        self.capacity = capacity
+        self.complete = complete
+        self.is_correct = np.zeros(0, dtype=bool)
+        self.seconds = np.zeros(0, dtype=np.int64)
+        self.module_index = np.zeros(0, dtype=np.intp)
+        self.created_at = np.zeros(0, dtype="datetime64[us]")
+        # Module ids by code, as used in `module_index`
+        self.module_ids: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]], capacity: int) -> "EventWindow":
+        """Window over rows read newest first with a limit of `capacity`"""
+        window = cls(capacity, complete=len(rows) < capacity)
+        window._extend(rows)
+        return window
+
+    def __len__(self) -> int:
+        return len(self.is_correct)
+
+    def append(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Add newly written events, keeping the newest `capacity`
+
+        Offline events may be older than ones already held, so the window
+        is re-sorted; dropping events beyond capacity ends completeness.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+
+        self._extend(rows)
+        order = np.argsort(-self.created_at.astype(np.int64), kind="stable")[:self.capacity]
+        if len(order) < len(self.created_at):
+            self.complete = False
+
+        self.is_correct = self.is_correct[order]
+        self.seconds = self.seconds[order]
+        self.module_index = self.module_index[order]
+        self.created_at = self.created_at[order]
+
+    def module_events(self, module_id: str, limit: int) -> Optional[np.ndarray]:
+        """
+        Positions of the newest `limit` events of a module, or None when
+        the window cannot tell because older events were left out of it
+        """
+        code = self._codes.get(module_id)
+        positions = np.flatnonzero(self.module_index == code) if code is not None else np.zeros(0, dtype=np.intp)
+        if len(positions) < limit and not self.complete:
+            return None
+        return positions[:limit]
+
+    def daily_counts(self) -> np.ndarray:
+        """Events per UTC day, days in order of their newest event"""
+        days, first, counts = np.unique(
+            self.created_at.astype("datetime64[D]"), return_index=True, return_counts=True
+        )
+        return counts[np.argsort(first, kind="stable")]
+
+    def _extend(self, rows: List[Dict[str, Any]]):
+        codes = [self._code(row["module_id"]) for row in rows]
+        created_at = pd.to_datetime(
+            pd.Series([row["created_at"] for row in rows], dtype=object),
+            format="ISO8601",
+            utc=True
+        ).dt.tz_localize(None).to_numpy(dtype="datetime64[us]")
+
+        self.is_correct = np.concatenate([
+            self.is_correct, np.fromiter((row["is_correct"] for row in rows), dtype=bool, count=len(rows))
+        ])
+        self.seconds = np.concatenate([
+            self.seconds, np.fromiter((row["time_taken_seconds"] for row in rows), dtype=np.int64, count=len(rows))
+        ])
+        self.module_index = np.concatenate([self.module_index, np.array(codes, dtype=np.intp)])
+        self.created_at = np.concatenate([self.created_at, created_at])
+
+    def _code(self, module_id: str) -> int:
+        code = self._codes.get(module_id)
+        if code is None:
+            code = self._codes[module_id] = len(self.module_ids)
+            self.module_ids.append(module_id)
+        return code
+
+
+class EventWindows:
+    """
+    Bounded LRU of per-child event windows
+
+    Writers append to windows that are already loaded; a window missing
+    from the cache is loaded by the reader on its next request. The TTL
+    bounds how long writes made by other workers go unseen.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.AI_EVENT_WINDOW_CACHE_SIZE,
+        ttl_seconds: int = settings.AI_EVENT_WINDOW_TTL_SECONDS,
+        capacity: int = settings.AI_EVENT_WINDOW_SIZE
+    ):
+        self.capacity = capacity
+        self._windows = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    def get(self, child_id: str) -> Optional[EventWindow]:
+        return self._windows.get(child_id)
+
+    def load(self, child_id: str, rows: List[Dict[str, Any]]) -> EventWindow:
+        """Cache a window built from the child's newest `capacity` rows"""
+        window = EventWindow.from_rows(rows, self.capacity)
+        self._windows.set(child_id, window)
+        return window
+
+    def append(self, rows: Iterable[Dict[str, Any]]):
+        """Add written progress rows to the windows of their children"""
+        by_child: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_child.setdefault(row["child_id"], []).append(row)
+
+        for child_id, child_rows in by_child.items():
+            window = self._windows.get(child_id)
+            if window is not None:
+                window.append(child_rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._windows.stats()
+
+
+@lru_cache()
+def get_event_windows() -> EventWindows:
+    """
+    Get the process-wide event window cache
+    """
+    return EventWindows()
@@ -0,0 +1,203 @@
+from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.supabase_client import get_async_supabase_client
+from app.services.module_loader import ModuleLoader
+from app.utils.pagination import keyset_page
+
+logger = logging.getLogger(__name__)
+
+# PostgREST caps a response at 1000 rows by default
+CATALOG_PAGE_SIZE = 1000
+
+
+def module_type_of(module: Dict[str, Any]) -> Optional[str]:
+    """
+    Module type of a row
+
+    Rows written by ModuleService carry `module_type`; the reference schema
+    in app/models/module.py names the column `type`.
+    """
+    return module.get("module_type") or module.get("type")
+
+
+async def fetch_modules(supabase, page_size: int = CATALOG_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Every module row, active or not, in catalog order (created_at, id)
+
+    Read in keyset pages, so catalogs past the PostgREST row limit are
+    never truncated.
+    """
+    modules: List[Dict[str, Any]] = []
+    cursor = None
+
+    while True:
+        response = await keyset_page(supabase.table("modules").select("*"), cursor, page_size).execute()
+        rows = response.data or []
+        modules.extend(rows)
+        if len(rows) < page_size:
+            return modules
+        cursor = rows[-1]["created_at"], rows[-1]["id"]
+
+
+class ModuleCatalog:
+    """
+    Versioned in-process cache of all active modules
+
+    Rows are indexed by id, type, difficulty and education level. Writes go
+    through `invalidate()`, which bumps the version so the next read reloads
+    the catalog; the TTL bounds staleness for writes made by other workers.
+
+    Reads return the catalog's own lists, dicts and rows rather than
+    copies, so callers must treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        supabase,
+        ttl_seconds: int = settings.MODULE_CATALOG_TTL_SECONDS,
+        page_size: int = CATALOG_PAGE_SIZE
+    ):
+        self.supabase = supabase
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.version = 0
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._modules: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_difficulty: Dict[int, List[Dict[str, Any]]] = {}
+        self._by_education_level: Dict[str, List[Dict[str, Any]]] = {}
+
+    def invalidate(self):
+        """Mark the catalog stale after a module write"""
+        self.version += 1
+        logger.info(f"Module catalog invalidated (version {self.version})")
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_version == self.version
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def _ensure_loaded(self):
+        if self._is_fresh():
+            return
+
+        async with self._lock:
+            if self._is_fresh():
+                return
+
+            version = self.version
+            modules = await fetch_modules(self.supabase, self.page_size)
+
+            self._build_indexes([m for m in modules if m.get("is_active", True)])
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+            logger.info(f"Module catalog loaded {len(self._modules)} modules (version {version})")
+
+    def _build_indexes(self, modules: List[Dict[str, Any]]):
+        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        by_difficulty: Dict[int, List[Dict[str, Any]]] = {}
+        by_education_level: Dict[str, List[Dict[str, Any]]] = {}
+
+        for module in modules:
+            by_type.setdefault(module_type_of(module), []).append(module)
+            by_difficulty.setdefault(module.get("difficulty_level"), []).append(module)
+            by_education_level.setdefault(module.get("education_level", "TK"), []).append(module)
+
+        self._modules = modules
+        self._by_id = {module["id"]: module for module in modules}
+        self._by_type = by_type
+        self._by_difficulty = by_difficulty
+        self._by_education_level = by_education_level
+
+    async def all(self) -> List[Dict[str, Any]]:
+        """All active modules, the same list until the catalog reloads"""
+        await self._ensure_loaded()
+        return self._modules
+
+    async def by_id(self) -> Dict[str, Dict[str, Any]]:
+        """Active modules keyed by id, the same dict until the catalog reloads"""
+        await self._ensure_loaded()
+        return self._by_id
+
+    async def get(self, module_id: str) -> Optional[Dict[str, Any]]:
+        """Active module by id"""
+        await self._ensure_loaded()
+        return self._by_id.get(module_id)
+
+    async def get_many(
+        self,
+        module_ids: Iterable[str],
+        loader: Optional[ModuleLoader] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Modules by id, keyed by id
+
+        Ids missing from the catalog (inactive or deleted modules) are
+        fetched in one batch through `loader` when one is given.
+        """
+        await self._ensure_loaded()
+        modules = {module_id: self._by_id.get(module_id) for module_id in module_ids}
+
+        missing = [module_id for module_id, module in modules.items() if module is None]
+        if missing and loader:
+            modules.update(await loader.load_many(missing))
+
+        return modules
+
+    async def filter(
+        self,
+        module_type: Optional[str] = None,
+        difficulty_level: Optional[int] = None,
+        education_level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Active modules matching every given filter, in catalog order"""
+        await self._ensure_loaded()
+
+        candidates = self._modules
+        if module_type:
+            candidates = self._by_type.get(module_type, [])
+            if difficulty_level:
+                candidates = [m for m in candidates if m.get("difficulty_level") == difficulty_level]
+        elif difficulty_level:
+            candidates = self._by_difficulty.get(difficulty_level, [])
+        if education_level:
+            candidates = [m for m in candidates if m.get("education_level", "TK") == education_level]
+
+        return candidates
+
+    async def by_difficulty(self, difficulty_level: int) -> List[Dict[str, Any]]:
+        """Active modules at one difficulty level"""
+        await self._ensure_loaded()
+        return self._by_difficulty.get(difficulty_level, [])
+
+    async def by_education_level(self, education_level: str) -> List[Dict[str, Any]]:
+        """Active modules for one education level"""
+        await self._ensure_loaded()
+        return self._by_education_level.get(education_level, [])
+
+    async def type_counts(self) -> Dict[str, int]:
+        """Number of active modules per module type"""
+        await self._ensure_loaded()
+        return {t: len(modules) for t, modules in self._by_type.items() if t}
+
+    async def types(self) -> List[str]:
+        """Sorted list of module types in the catalog"""
+        await self._ensure_loaded()
+        return sorted(t for t in self._by_type if t)
+
+
+@lru_cache()
+def get_module_catalog() -> ModuleCatalog:
+    """
+    Get the shared module catalog
+    """
+    return ModuleCatalog(get_async_supabase_client())
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keeps the `id=in.(...)` filter well inside PostgREST URL length limits
+MAX_BATCH_SIZE = 100
+
+
+class ModuleLoader:
+    """
+    Per-request batching loader for module rows
+
+    Ids requested in the same tick are collected, deduplicated and fetched
+    with a single `in_("id", ...)` query. Create one loader per request so
+    the memoized rows never outlive it.
+    """
+
+    def __init__(self, supabase, columns: str = "*"):
+        self.supabase = supabase
+        self.columns = columns if columns == "*" or "id" in _split(columns) else f"id, {columns}"
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def load(self, module_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load one module row, batched with other loads in the same tick
+        """
+        if module_id in self._cache:
+            return self._cache[module_id]
+
+        if module_id not in self._pending:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+            self._pending[module_id] = loop.create_future()
+
+        return await self._pending[module_id]
+
+    async def load_many(self, module_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Load several module rows, returned as a dict keyed by id
+        """
+        module_ids = list(module_ids)
+        missing = [
+            module_id for module_id in dict.fromkeys(module_ids)
+            if module_id not in self._cache
+        ]
+        if missing:
+            self._cache.update(await self._fetch(missing))
+
+        return {module_id: self._cache.get(module_id) for module_id in module_ids}
+
+    async def _dispatch(self):
+        """Resolve every pending load with one batched fetch"""
+        batch, self._pending = self._pending, {}
+
+        try:
+            rows = await self._fetch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._cache.update(rows)
+        for module_id, future in batch.items():
+            if not future.done():
+                future.set_result(rows.get(module_id))
+
+    async def _fetch(self, module_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch module rows in chunks of MAX_BATCH_SIZE ids"""
+        rows: Dict[str, Optional[Dict[str, Any]]] = {module_id: None for module_id in module_ids}
+
+        for start in range(0, len(module_ids), MAX_BATCH_SIZE):
+            chunk = module_ids[start:start + MAX_BATCH_SIZE]
+            response = await self.supabase.table("modules")\
+                .select(self.columns)\
+                .in_("id", chunk)\
+                .execute()
+
+            for row in response.data or []:
+                rows[row["id"]] = row
+
+        logger.debug(f"Loaded {len(module_ids)} modules in batches of {MAX_BATCH_SIZE}")
+        return rows
+
+
+def _split(columns: str) -> List[str]:
+    return [column.strip() for column in columns.split(",")]
@@ -1,51 +1,68 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from bisect import bisect_right
+from datetime import datetime
 import logging
 
-from app.core.supabase_client import get_supabase_client
+from app.core.supabase_client import get_async_supabase_client
+from app.services.module_catalog import get_module_catalog
+from app.services.module_loader import ModuleLoader
 from app.schemas.module import ModuleResponse, ModuleDetail, Question, ModuleDownload
+from app.utils.pagination import Cursor, parse_timestamp
 
 logger = logging.getLogger(__name__)
 
 
+def _catalog_position(module: Dict[str, Any]) -> Tuple[datetime, str]:
+    # Compared as datetimes: stored timestamps trim trailing zeros
+    return parse_timestamp(str(module["created_at"])), module["id"]
+
+
 class ModuleService:
     """Service for learning module operations"""
     
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_async_supabase_client()
+        self.catalog = get_module_catalog()
     
     async def get_modules(
         self,
         module_type: Optional[str] = None,
         difficulty_level: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[Cursor] = None
     ) -> List[ModuleResponse]:
         """
         Get all modules with optional filters
+        
+        Modules come in catalog order, (created_at, id); with a cursor the
+        page starts after that module and `skip` is ignored.
         """
         try:
-            query = self.supabase.table("modules").select("*")
-            
-            if module_type:
-                query = query.eq("module_type", module_type)
-            if difficulty_level:
-                query = query.eq("difficulty_level", difficulty_level)
+            catalog_modules = await self.catalog.filter(
+                module_type=module_type,
+                difficulty_level=difficulty_level
+            )
             
-            response = query.range(skip, skip + limit - 1).execute()
+            if cursor:
+                position = parse_timestamp(cursor[0]), cursor[1]
+                skip = bisect_right(catalog_modules, position, key=_catalog_position)
             
             # Map database fields to response schema
             modules = []
-            for module in response.data:
+            for module in catalog_modules[skip:skip + limit]:
                 modules.append(ModuleResponse(
                     id=module["id"],
                     title=module["title"],
                     description=module.get("description", ""),
                     type=module["module_type"],
+                    education_level=module.get("education_level", "TK"),
                     difficulty_level=module["difficulty_level"],
                     estimated_duration_minutes=module.get("estimated_duration_minutes", 10),
                     thumbnail_url=module.get("thumbnail_url"),
                     total_questions=len(module.get("content", {}).get("questions", [])) if module.get("content") else 0,
-                    points_reward=module["difficulty_level"] * 10
+                    points_reward=module["difficulty_level"] * 10,
+                    created_at=module.get("created_at")
                 ))
             
             return modules
@@ -59,18 +76,16 @@ class ModuleService:
         Get detailed module information including questions from content field
         """
         try:
-            # Get module
-            module_response = self.supabase.table("modules")\
-                .select("*")\
-                .eq("id", module_id)\
-                .single()\
-                .execute()
+            # Get module; inactive modules are not in the catalog but can
+            # still be opened by id
+            module_data = await self.catalog.get(module_id)
+            if not module_data:
+                module_data = await ModuleLoader(self.supabase).load(module_id)
             
-            if not module_response.data:
+            if not module_data:
                 logger.warning(f"Module not found: {module_id}")
                 return None
             
-            module_data = module_response.data
             logger.info(f"Module data keys: {module_data.keys()}")
             logger.info(f"Content field: {module_data.get('content')}")
             
@@ -89,6 +104,7 @@ class ModuleService:
                 title=module_data["title"],
                 description=module_data.get("description", ""),
                 type=module_data["module_type"],
+                education_level=module_data.get("education_level", "TK"),
                 difficulty_level=module_data["difficulty_level"],
                 estimated_duration_minutes=module_data.get("estimated_duration_minutes", 10),
                 thumbnail_url=module_data.get("thumbnail_url"),
@@ -134,13 +150,7 @@ class ModuleService:
         Get list of all module types
         """
         try:
-            response = self.supabase.table("modules")\
-                .select("module_type")\
-                .execute()
-            
-            types = list(set([m["module_type"] for m in response.data]))
-            return sorted(types)
-            
+            return await self.catalog.types()
             
         except Exception as e:
             logger.error(f"Get module types failed: {str(e)}")
@@ -156,6 +166,7 @@ class ModuleService:
                 "title": data["title"],
                 "description": data["description"],
                 "module_type": data["module_type"],
+                "education_level": data.get("education_level", "TK"),
                 "difficulty_level": data["difficulty_level"],
                 "estimated_duration_minutes": data["estimated_duration_minutes"],
                 "thumbnail_url": data.get("thumbnail_url"),
@@ -163,13 +174,14 @@ class ModuleService:
                 "content": data["content"]
             }
             
-            response = self.supabase.table("modules")\
+            response = await self.supabase.table("modules")\
                 .insert(module_data)\
                 .execute()
                 
             if not response.data:
                 return None
                 
+            self.catalog.invalidate()
             new_module = response.data[0]
             
             return ModuleResponse(
@@ -177,6 +189,7 @@ class ModuleService:
                 title=new_module["title"],
                 description=new_module.get("description", ""),
                 type=new_module["module_type"],
+                education_level=new_module.get("education_level", "TK"),
                 difficulty_level=new_module["difficulty_level"],
                 estimated_duration_minutes=new_module.get("estimated_duration_minutes", 10),
                 thumbnail_url=new_module.get("thumbnail_url"),
@@ -198,7 +211,7 @@ class ModuleService:
             if not update_data:
                 return None
                 
-            response = self.supabase.table("modules")\
+            response = await self.supabase.table("modules")\
                 .update(update_data)\
                 .eq("id", module_id)\
                 .execute()
@@ -206,6 +219,7 @@ class ModuleService:
             if not response.data:
                 return None
                 
+            self.catalog.invalidate()
             updated = response.data[0]
             
             return ModuleResponse(
@@ -213,6 +227,7 @@ class ModuleService:
                 title=updated["title"],
                 description=updated.get("description", ""),
                 type=updated["module_type"],
+                education_level=updated.get("education_level", "TK"),
                 difficulty_level=updated["difficulty_level"],
                 estimated_duration_minutes=updated.get("estimated_duration_minutes", 10),
                 thumbnail_url=updated.get("thumbnail_url"),
@@ -229,13 +244,17 @@ class ModuleService:
         Delete a module
         """
         try:
-            response = self.supabase.table("modules")\
+            response = await self.supabase.table("modules")\
                 .delete()\
                 .eq("id", module_id)\
                 .execute()
                 
             # Check if any row was deleted (response.data should not be empty)
-            return len(response.data) > 0
+            if not response.data:
+                return False
+            
+            self.catalog.invalidate()
+            return True
             
         except Exception as e:
             logger.error(f"Delete module failed: {str(e)}")
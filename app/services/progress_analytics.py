@@ -0,0 +1,191 @@
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.progress import StrengthWeakness, SubjectProgress
+from app.services.daily_stats import UNKNOWN_MODULE_TYPE
+from app.services.module_catalog import module_type_of
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Same thresholds as PerformanceAnalyzer in app/services/ai_service.py
+STRENGTH_ACCURACY = 0.85
+WEAKNESS_ACCURACY = 0.6
+MIN_ATTEMPTS_PER_SKILL = 5
+MAX_SKILLS_REPORTED = 5
+
+EVENT_COLUMNS = ["module_id", "is_correct", "time_taken_seconds", "created_at"]
+
+
+@dataclass
+class EventBatch:
+    """
+    Columnar batch of a child's progress events
+
+    Per-event arrays index into the per-module arrays through
+    `module_index`, so grouping by module or module type is a bincount.
+    """
+    module_index: np.ndarray
+    is_correct: np.ndarray
+    seconds: np.ndarray
+    weekday: np.ndarray
+    module_ids: np.ndarray
+    module_types: np.ndarray
+    module_titles: np.ndarray
+    difficulty_levels: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.module_index)
+
+    @property
+    def module_count(self) -> int:
+        return len(self.module_ids)
+
+
+def build_event_batch(
+    rows: List[Dict[str, Any]],
+    modules: Dict[str, Optional[Dict[str, Any]]]
+) -> EventBatch:
+    """
+    Convert progress rows into an EventBatch joined to module data
+
+    `modules` maps module ids to module rows; events of unknown modules
+    are grouped under UNKNOWN_MODULE_TYPE.
+    """
+    module_index, module_ids = pd.factorize(
+        np.fromiter(map(itemgetter("module_id"), rows), dtype=object, count=len(rows))
+    )
+    known = [modules.get(module_id) or {} for module_id in module_ids]
+
+    created_at = pd.to_datetime(
+        pd.Series(list(map(itemgetter("created_at"), rows)), dtype=object),
+        format="ISO8601",
+        utc=True
+    )
+
+    return EventBatch(
+        module_index=module_index.astype(np.intp),
+        is_correct=np.fromiter(map(itemgetter("is_correct"), rows), dtype=bool, count=len(rows)),
+        seconds=np.fromiter(map(itemgetter("time_taken_seconds"), rows), dtype=np.int64, count=len(rows)),
+        weekday=created_at.dt.dayofweek.to_numpy(dtype=np.intp),
+        module_ids=np.asarray(module_ids, dtype=object),
+        module_types=np.array(
+            [module_type_of(module) or UNKNOWN_MODULE_TYPE for module in known], dtype=object
+        ),
+        module_titles=np.array(
+            [module.get("title") or module_id for module, module_id in zip(known, module_ids)], dtype=object
+        ),
+        difficulty_levels=np.array(
+            [module.get("difficulty_level") or 1 for module in known], dtype=np.int64
+        )
+    )
+
+
+def weekly_activity(events: EventBatch) -> Dict[str, int]:
+    """Minutes of activity per day of the week"""
+    seconds = np.bincount(events.weekday, weights=events.seconds, minlength=7)
+    return {day: int(seconds[i] // 60) for i, day in enumerate(WEEKDAYS)}
+
+
+def subject_progress(events: EventBatch, catalog_counts: Dict[str, int]) -> List[SubjectProgress]:
+    """
+    Accuracy, volume, level and coverage per module type
+
+    `level` is the highest difficulty attempted; `progress_percentage` is
+    the share of the type's active modules the child has practised, with
+    `catalog_counts` giving the number of active modules per type.
+    """
+    if not len(events):
+        return []
+
+    # Subjects in sorted order, as codes per module
+    subjects, module_subject = np.unique(events.module_types, return_inverse=True)
+    event_subject = module_subject[events.module_index]
+    n = len(subjects)
+
+    questions = np.bincount(event_subject, minlength=n)
+    correct = np.bincount(event_subject, weights=events.is_correct, minlength=n)
+    seconds = np.bincount(event_subject, weights=events.seconds, minlength=n)
+
+    # Every module in the batch was attempted at least once
+    modules_practised = np.bincount(module_subject, minlength=n)
+    level = np.zeros(n, dtype=np.int64)
+    np.maximum.at(level, module_subject, events.difficulty_levels)
+
+    available = np.array([catalog_counts.get(subject, 0) for subject in subjects])
+    coverage = np.where(
+        available > 0,
+        np.minimum(modules_practised / np.maximum(available, 1), 1.0) * 100,
+        0.0
+    )
+    accuracy = correct / questions * 100
+
+    return [
+        SubjectProgress(
+            subject=subject,
+            accuracy=round(float(accuracy[i]), 2),
+            total_questions=int(questions[i]),
+            time_spent_minutes=int(seconds[i] // 60),
+            level=int(level[i]),
+            progress_percentage=round(float(coverage[i]), 2)
+        )
+        for i, subject in enumerate(subjects)
+    ]
+
+
+def strengths_weaknesses(events: EventBatch) -> Tuple[List[StrengthWeakness], List[StrengthWeakness]]:
+    """
+    Strongest and weakest skills, one skill per module
+
+    Only modules with at least MIN_ATTEMPTS_PER_SKILL attempts are rated.
+    Strengths are at or above STRENGTH_ACCURACY and weaknesses below
+    WEAKNESS_ACCURACY, best and worst first respectively; ties keep
+    module type and id order.
+    """
+    if not len(events):
+        return [], []
+
+    attempts = np.bincount(events.module_index, minlength=events.module_count)
+    correct = np.bincount(events.module_index, weights=events.is_correct, minlength=events.module_count)
+    accuracy = correct / np.maximum(attempts, 1)
+    rated = attempts >= MIN_ATTEMPTS_PER_SKILL
+
+    # Only the few rated modules are sorted in Python
+    strong = sorted(
+        np.flatnonzero(rated & (accuracy >= STRENGTH_ACCURACY)),
+        key=lambda i: (-accuracy[i], events.module_types[i], events.module_ids[i])
+    )[:MAX_SKILLS_REPORTED]
+    weak = sorted(
+        np.flatnonzero(rated & (accuracy < WEAKNESS_ACCURACY)),
+        key=lambda i: (accuracy[i], events.module_types[i], events.module_ids[i])
+    )[:MAX_SKILLS_REPORTED]
+
+    strengths = _skill_ratings(
+        events, accuracy, strong,
+        "Great mastery! Try harder {category} modules to keep the challenge going."
+    )
+    weaknesses = _skill_ratings(
+        events, accuracy, weak,
+        "Practice more {category} modules at an easier level to build confidence."
+    )
+    return strengths, weaknesses
+
+
+def _skill_ratings(
+    events: EventBatch,
+    accuracy: np.ndarray,
+    modules: List[int],
+    recommendation: str
+) -> List[StrengthWeakness]:
+    return [
+        StrengthWeakness(
+            category=events.module_types[i],
+            skill_name=events.module_titles[i],
+            performance_score=round(float(accuracy[i]) * 100, 2),
+            recommendation=recommendation.format(category=events.module_types[i])
+        )
+        for i in modules
+    ]
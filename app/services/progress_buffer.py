@@ -0,0 +1,196 @@
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressWriteBuffer:
+    """
+    Write-behind buffer for progress events
+
+    Records are appended to a local spool file and kept in memory until a
+    flush writes them with the bulk insert path. A flush runs when
+    `max_events` records are pending or every `flush_interval` seconds, and
+    `close()` drains whatever is left. Records carry their own ids and are
+    written with `on_conflict="id"`, so replaying the spool after a crash
+    never duplicates rows. Records leave the spool only once their totals
+    are applied, so a crash never loses points, streaks or daily stats; at
+    worst it re-applies the totals of the batch that was being flushed.
+    Without a crash, a totals update that fails is retried on its own on
+    the next flush, so the updates that went through are not repeated.
+    """
+
+    def __init__(
+        self,
+        progress_service,
+        max_events: int = settings.PROGRESS_BUFFER_MAX_EVENTS,
+        flush_interval: float = settings.PROGRESS_BUFFER_FLUSH_INTERVAL_SECONDS,
+        spool_path: str = settings.PROGRESS_BUFFER_SPOOL_PATH
+    ):
+        self.progress_service = progress_service
+        self.max_events = max_events
+        self.flush_interval = flush_interval
+        self.spool_path = Path(spool_path)
+        self.rejected_path = self.spool_path.with_name(self.spool_path.name + ".rejected")
+        self._pending: List[Dict[str, Any]] = []
+        # Written records with the totals updates that failed for them,
+        # None when applying them failed before any update was issued
+        self._unapplied: List[Tuple[Optional[List[str]], List[Dict[str, Any]]]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._spool = None
+        self._flushed = 0
+        self._rejected = 0
+
+    async def start(self):
+        """Replay spooled records from a previous run and start flushing"""
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pending = self._read_spool()
+        self._spool = open(self.spool_path, "a", encoding="utf-8")
+
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} spooled progress events")
+            await self.flush()
+
+        self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, record: Dict[str, Any]):
+        """
+        Spool a progress record and schedule it for the next flush
+        """
+        self._spool.write(json.dumps(record) + "\n")
+        self._spool.flush()
+        self._pending.append(record)
+
+        if len(self._pending) >= self.max_events:
+            self._wakeup.set()
+
+    async def flush(self):
+        """
+        Write every pending record in bulk and apply the running totals
+        """
+        async with self._flush_lock:
+            retries, self._unapplied = self._unapplied, []
+            for steps, records in retries:
+                await self._apply_totals(records, steps)
+
+            batch, self._pending = self._pending, []
+            written = []
+            if batch:
+                inserted, failures = await self.progress_service._bulk_insert_progress(
+                    list(enumerate(batch)), on_conflict="id"
+                )
+
+                if failures and not inserted and len(failures) == len(batch):
+                    # Nothing got through; keep the batch for the next flush
+                    logger.error(f"Progress flush failed for all {len(batch)} events, will retry")
+                    self._pending = batch + self._pending
+                else:
+                    failed = {failure["index"] for failure in failures}
+                    if failures:
+                        self._reject([batch[index] for index in failed])
+
+                    # Records written by an earlier flush that crashed before
+                    # applying totals come back as duplicates, so totals are
+                    # applied for every written record, not just new rows
+                    written = [record for index, record in enumerate(batch) if index not in failed]
+                    await self._apply_totals(written)
+                    logger.info(f"Flushed {len(written)} progress events, {len(failures)} rejected")
+
+            if retries or written:
+                self._rewrite_spool()
+
+    async def _apply_totals(self, records: List[Dict[str, Any]], steps: Optional[List[str]] = None):
+        """Apply totals for written records, keeping any failed updates for a retry"""
+        try:
+            failed = await self.progress_service._apply_progress_totals(
+                records, steps=tuple(steps) if steps else None
+            )
+        except Exception as e:
+            logger.error(f"Applying totals for {len(records)} progress events failed, will retry: {str(e)}")
+            self._unapplied.append((steps, records))
+            return
+
+        if failed:
+            logger.error(f"Totals update {', '.join(failed)} failed for {len(records)} progress events, will retry")
+            self._unapplied.append((list(failed), records))
+        else:
+            self._flushed += len(records)
+
+    async def close(self):
+        """Stop the flush loop and drain pending records"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+        if self._spool:
+            self._spool.close()
+            self._spool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pending, flushed and rejected event counts"""
+        return {
+            "pending": len(self._pending) + sum(len(records) for _, records in self._unapplied),
+            "flushed": self._flushed,
+            "rejected": self._rejected
+        }
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Progress flush failed: {str(e)}")
+
+    def _read_spool(self) -> List[Dict[str, Any]]:
+        if not self.spool_path.exists():
+            return []
+
+        records = []
+        with open(self.spool_path, encoding="utf-8") as spool:
+            for line in spool:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write
+                    logger.warning("Skipping unreadable progress spool line")
+        return records
+
+    def _rewrite_spool(self):
+        """Replace the spool with the records that are still pending"""
+        tmp_path = self.spool_path.with_name(self.spool_path.name + ".tmp")
+        unapplied = [record for _, records in self._unapplied for record in records]
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            for record in unapplied + self._pending:
+                tmp.write(json.dumps(record) + "\n")
+
+        self._spool.close()
+        os.replace(tmp_path, self.spool_path)
+        self._spool = open(self.spool_path, "a", encoding="utf-8")
+
+    def _reject(self, records: List[Dict[str, Any]]):
+        """Move records the database refused to a dead-letter file"""
+        with open(self.rejected_path, "a", encoding="utf-8") as rejected:
+            for record in records:
+                rejected.write(json.dumps(record) + "\n")
+        self._rejected += len(records)
+        logger.error(f"Rejected {len(records)} progress events, see {self.rejected_path}")
@@ -0,0 +1,152 @@
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+import asyncio
+import csv
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_COLUMNS = [
+    "id",
+    "child_id",
+    "module_id",
+    "question_id",
+    "is_correct",
+    "time_taken_seconds",
+    "attempt_count",
+    "points_earned",
+    "client_event_id",
+    "created_at"
+]
+
+PARQUET_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("child_id", pa.string()),
+    ("module_id", pa.string()),
+    ("question_id", pa.string()),
+    ("is_correct", pa.bool_()),
+    ("time_taken_seconds", pa.int64()),
+    ("attempt_count", pa.int64()),
+    ("points_earned", pa.int64()),
+    ("client_event_id", pa.string()),
+    ("created_at", pa.timestamp("us", tz="UTC"))
+])
+
+# Pages read ahead of the encoder; bounds memory when the client is slow
+PREFETCH_PAGES = 2
+ROW_GROUP_SIZE = 10000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+async def prefetch(
+    pages: AsyncIterable[List[Dict[str, Any]]],
+    max_pages: int = PREFETCH_PAGES
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Read pages ahead into a bounded queue
+
+    Database reads overlap with encoding and sending, but at most
+    `max_pages` pages wait in memory. Errors from the reader are raised
+    to the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pages)
+    done = object()
+
+    async def produce():
+        try:
+            async for page in pages:
+                await queue.put(page)
+            await queue.put(done)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+
+
+async def stream_csv(pages: AsyncIterable[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """Encode pages of progress rows as CSV, one chunk per page"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+
+    async for page in pages:
+        writer.writerows(page)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the caller"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def stream_parquet(
+    pages: AsyncIterable[List[Dict[str, Any]]],
+    row_group_size: int = ROW_GROUP_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Encode pages of progress rows as Parquet
+
+    Pages are gathered into row groups of `row_group_size` rows, and each
+    group is sent as soon as it is written, so only one group is held in
+    memory whatever the length of the history.
+    """
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, PARQUET_SCHEMA)
+    pending: List[Dict[str, Any]] = []
+
+    async for page in pages:
+        pending.extend(page)
+        while len(pending) >= row_group_size:
+            writer.write_table(_to_table(pending[:row_group_size]))
+            pending = pending[row_group_size:]
+            yield sink.take()
+
+    if pending:
+        writer.write_table(_to_table(pending))
+    writer.close()
+    yield sink.take()
+
+
+def _to_table(rows: List[Dict[str, Any]]) -> pa.Table:
+    frame = pd.DataFrame(rows, columns=EXPORT_COLUMNS)
+    frame["created_at"] = pd.to_datetime(frame["created_at"], format="ISO8601", utc=True)
+    return pa.Table.from_pandas(frame, schema=PARQUET_SCHEMA, preserve_index=False)
@@ -1,8 +1,22 @@
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterable, AsyncIterator
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import uuid
 
-from app.core.supabase_client import get_supabase_client
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.supabase_client import get_async_supabase_client
+from app.utils.cache import TTLCache
+from app.utils.pagination import Cursor, keyset_page
+from app.services.module_loader import ModuleLoader
+from app.services.module_catalog import get_module_catalog
+from app.services.daily_stats import build_daily_stats, summarize_daily_stats
+from app.services.streaks import current_streak_days
+from app.services.event_window import get_event_windows
+from app.services.progress_versions import get_progress_versions
+from app.services import progress_analytics, progress_export
 from app.schemas.progress import (
     ProgressEventCreate,
     ProgressBatchCreate,
@@ -15,12 +29,37 @@ from app.schemas.progress import (
 
 logger = logging.getLogger(__name__)
 
+# Cap on failures echoed back by a streamed sync
+MAX_REPORTED_FAILURES = 100
+
+# PostgREST returns at most 1000 rows per request by default
+EVENT_PAGE_SIZE = 1000
+STATS_PAGE_SIZE = 1000
+
+# The running totals `_apply_progress_totals` keeps up to date
+TOTALS_STEPS = ("points", "streaks", "daily_stats")
+
+
+def _is_missing_function(error: Exception) -> bool:
+    """Whether an RPC failed because the function is not in the schema"""
+    return "PGRST202" in str(error) or "Could not find the function" in str(error)
+
 
 class ProgressService:
     """Service for progress tracking operations"""
     
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_async_supabase_client()
+        self.catalog = get_module_catalog()
+        self.write_buffer = None
+        # Other workers' writes are only seen once entries age out
+        self.report_cache = TTLCache(
+            settings.PROGRESS_REPORT_CACHE_SIZE,
+            settings.PROGRESS_REPORT_CACHE_TTL_SECONDS
+        )
+        self.progress_versions = get_progress_versions()
+        self._summary_rpc_available = True
+        self.event_windows = get_event_windows()
     
     async def record_progress_event(
         self,
@@ -29,30 +68,34 @@ class ProgressService:
     ) -> ProgressResponse:
         """
         Record a single progress event
+        
+        With a write buffer attached (PROGRESS_WRITE_BEHIND_ENABLED) the
+        event is validated, given an id and queued; the insert and points
+        update happen on the buffer's next flush.
+        
+        A retry with the same `client_event_id` returns the row stored by
+        the first request and adds no points.
         """
         try:
-            # Calculate points
-            points = self._calculate_points(progress_data)
+            record = self._build_progress_record(
+                child_id, progress_data, datetime.utcnow().isoformat()
+            )
             
-            now = datetime.utcnow().isoformat()
-            record = {
-                "child_id": child_id,
-                "module_id": progress_data.module_id,
-                "question_id": progress_data.question_id,
-                "is_correct": progress_data.is_correct,
-                "time_taken_seconds": progress_data.time_taken_seconds,
-                "attempt_count": progress_data.attempt_count,
-                "points_earned": points,
-                "created_at": now
-            }
+            if self.write_buffer is not None:
+                return await self._buffer_progress_event(record)
             
-            response = self.supabase.table("progress").insert(record).execute()
+            if progress_data.client_event_id:
+                response = await self._write_progress(record, on_conflict="child_id,client_event_id")
+                if not response.data:
+                    return await self._get_client_event(child_id, progress_data.client_event_id)
+            else:
+                response = await self.supabase.table("progress").insert(record).execute()
             
             if not response.data:
                 raise ValueError("Failed to record progress")
             
-            # Update child's total points
-            await self._update_child_points(child_id, points)
+            # Update child's total points and daily stats
+            await self._apply_progress_totals(response.data)
             
             logger.info(f"Progress recorded for child {child_id}")
             
@@ -62,30 +105,307 @@ class ProgressService:
             logger.error(f"Record progress failed: {str(e)}")
             raise
     
+    async def _get_client_event(self, child_id: str, client_event_id: str) -> ProgressResponse:
+        """The progress row already recorded for a client event id"""
+        response = await self.supabase.table("progress")\
+            .select("*")\
+            .eq("child_id", child_id)\
+            .eq("client_event_id", client_event_id)\
+            .limit(1)\
+            .execute()
+        
+        if not response.data:
+            raise ValueError("Failed to record progress")
+        
+        logger.info(f"Progress event {client_event_id} already recorded for child {child_id}")
+        return ProgressResponse(**response.data[0])
+    
+    async def _buffer_progress_event(self, record: Dict[str, Any]) -> ProgressResponse:
+        """Validate a progress record and hand it to the write buffer"""
+        modules = await self.catalog.get_many(
+            [record["module_id"]],
+            loader=ModuleLoader(self.supabase, columns="id")
+        )
+        if not modules.get(record["module_id"]):
+            raise ValueError("Module not found")
+        
+        record["id"] = str(uuid.uuid4())
+        await self.write_buffer.enqueue(record)
+        
+        return ProgressResponse(**record)
+    
     async def sync_batch_progress(
         self,
         child_id: str,
         batch_data: ProgressBatchCreate
-    ) -> Dict[str, int]:
+    ) -> Dict[str, Any]:
         """
         Sync batch progress from offline mode
+        
+        Events are validated and scored in memory, written with one
+        multi-row insert per OFFLINE_BATCH_SIZE chunk, and the child's
+        points are updated once with the aggregated delta.
+        
+        Sync is idempotent: a batch already recorded in the sync ledger
+        for (child_id, offline_session_id) returns the stored result, and
+        events are written on (child_id, client_event_id) so a retried
+        batch never inserts or scores an event twice.
+        """
+        session_id = batch_data.offline_session_id
+        previous = await self._get_synced_batch(child_id, session_id)
+        if previous:
+            return previous
+        
+        result = await self._sync_events(
+            child_id, session_id, list(enumerate(batch_data.events))
+        )
+        failures = result.pop("failures")
+        
+        summary = {
+            "synced_count": result["synced_count"],
+            "failed_count": len(failures),
+            "failures": failures
+        }
+        
+        # Insert errors may be transient, so only settled batches are recorded
+        if not result["insert_failed_count"]:
+            await self._record_synced_batch(child_id, session_id, summary)
+        
+        logger.info(
+            f"Synced {summary['synced_count']} events "
+            f"({result['inserted_count']} new), {len(failures)} failed"
+        )
+        
+        return summary
+    
+    async def sync_progress_stream(
+        self,
+        child_id: str,
+        session_id: str,
+        lines: AsyncIterable[bytes]
+    ) -> Dict[str, Any]:
+        """
+        Sync offline progress from a stream of NDJSON event lines
+        
+        Lines are parsed as they arrive and written through the bulk path
+        every OFFLINE_BATCH_SIZE events, so memory does not grow with the
+        size of the backlog. Only the first MAX_REPORTED_FAILURES failures
+        are returned; `failed_count` covers all of them. Idempotency works
+        as in `sync_batch_progress`, with line numbers as event positions.
         """
+        previous = await self._get_synced_batch(child_id, session_id)
+        if previous:
+            return previous
+        
         synced_count = 0
         failed_count = 0
+        insert_failed_count = 0
+        failures: List[Dict[str, Any]] = []
+        chunk: List[Tuple[int, ProgressEventCreate]] = []
+        
+        def add_failures(new_failures: List[Dict[str, Any]]):
+            nonlocal failed_count
+            failed_count += len(new_failures)
+            failures.extend(new_failures[:MAX_REPORTED_FAILURES - len(failures)])
+        
+        async def flush():
+            nonlocal synced_count, insert_failed_count
+            result = await self._sync_events(child_id, session_id, chunk)
+            synced_count += result["synced_count"]
+            insert_failed_count += result["insert_failed_count"]
+            add_failures(result["failures"])
+            chunk.clear()
+        
+        index = 0
+        async for line in lines:
+            try:
+                chunk.append((index, ProgressEventCreate.model_validate_json(line)))
+            except ValidationError as e:
+                add_failures([{"index": index, "error": f"Invalid event: {e.errors()[0]['msg']}"}])
+            index += 1
+            
+            if len(chunk) >= settings.OFFLINE_BATCH_SIZE:
+                await flush()
+        
+        if chunk:
+            await flush()
+        
+        summary = {
+            "synced_count": synced_count,
+            "failed_count": failed_count,
+            "failures": failures
+        }
+        
+        if not insert_failed_count:
+            await self._record_synced_batch(child_id, session_id, summary)
+        
+        logger.info(f"Stream synced {synced_count} of {index} events, {failed_count} failed")
+        
+        return summary
+    
+    async def _sync_events(
+        self,
+        child_id: str,
+        session_id: str,
+        events: List[Tuple[int, ProgressEventCreate]]
+    ) -> Dict[str, Any]:
+        """
+        Validate, score and bulk-write offline events, then award points
         
-        for event in batch_data.events:
+        Takes (position, event) pairs. Events are upserted on
+        (child_id, client_event_id), so only newly written rows earn points.
+        """
+        now = datetime.utcnow().isoformat()
+        
+        # Validate every referenced module in one pass over the catalog
+        modules = await self.catalog.get_many(
+            {event.module_id for _, event in events},
+            loader=ModuleLoader(self.supabase)
+        )
+        
+        records = []
+        failures = []
+        for index, event in events:
+            if not modules.get(event.module_id):
+                failures.append({"index": index, "error": f"Module {event.module_id} not found"})
+                continue
+            record = self._build_progress_record(child_id, event, now)
+            # Events from older clients get an id derived from their position
+            record["client_event_id"] = event.client_event_id or f"{session_id}:{index}"
+            records.append((index, record))
+        
+        inserted, insert_failures = await self._bulk_insert_progress(
+            records, on_conflict="child_id,client_event_id"
+        )
+        failures.extend(insert_failures)
+        failures.sort(key=lambda f: f["index"])
+        
+        await self._apply_progress_totals(inserted, modules)
+        
+        # Events skipped as duplicates were synced by an earlier attempt
+        return {
+            "synced_count": len(records) - len(insert_failures),
+            "inserted_count": len(inserted),
+            "insert_failed_count": len(insert_failures),
+            "failures": failures
+        }
+    
+    async def _get_synced_batch(self, child_id: str, session_id: str) -> Optional[Dict[str, Any]]:
+        """Stored result of an already synced offline batch, if any"""
+        response = await self.supabase.table("progress_sync_batches")\
+            .select("*")\
+            .eq("child_id", child_id)\
+            .eq("offline_session_id", session_id)\
+            .limit(1)\
+            .execute()
+        
+        if not response.data:
+            return None
+        
+        previous = response.data[0]
+        logger.info(f"Offline session {session_id} already synced for child {child_id}")
+        return {
+            "synced_count": previous["synced_count"],
+            "failed_count": previous["failed_count"],
+            "failures": previous.get("failures") or [],
+            "already_synced": True
+        }
+    
+    async def _record_synced_batch(self, child_id: str, session_id: str, result: Dict[str, Any]):
+        """Record a synced offline batch in the ledger"""
+        try:
+            await self.supabase.table("progress_sync_batches")\
+                .upsert(
+                    {
+                        "child_id": child_id,
+                        "offline_session_id": session_id,
+                        **result
+                    },
+                    on_conflict="child_id,offline_session_id",
+                    ignore_duplicates=True
+                )\
+                .execute()
+        except Exception as e:
+            # Event ids still keep a retry from duplicating anything
+            logger.error(f"Record synced batch failed: {str(e)}")
+    
+    async def _bulk_insert_progress(
+        self,
+        records: List[Tuple[int, Dict[str, Any]]],
+        on_conflict: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Insert progress records with one multi-row insert per chunk
+        
+        Takes (index, record) pairs. When a chunk is rejected its rows are
+        retried one by one so failures can be reported per row. With
+        `on_conflict`, rows that already exist are skipped and left out of
+        the inserted rows, which makes replays safe.
+        
+        Returns:
+            Tuple of (inserted rows, failures)
+        """
+        inserted = []
+        failures = []
+        chunk_size = settings.OFFLINE_BATCH_SIZE
+        
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
             try:
-                await self.record_progress_event(child_id, event)
-                synced_count += 1
+                response = await self._write_progress(
+                    [record for _, record in chunk], on_conflict
+                )
+                inserted.extend(response.data)
+                continue
             except Exception as e:
-                logger.error(f"Failed to sync event: {str(e)}")
-                failed_count += 1
+                logger.warning(f"Bulk insert of {len(chunk)} events failed, retrying per row: {str(e)}")
+            
+            for index, record in chunk:
+                try:
+                    response = await self._write_progress(record, on_conflict)
+                    inserted.extend(response.data)
+                except Exception as e:
+                    logger.error(f"Failed to sync event: {str(e)}")
+                    failures.append({"index": index, "error": str(e)})
+        
+        return inserted, failures
+    
+    async def _write_progress(self, rows, on_conflict: Optional[str] = None):
+        """Insert progress rows, skipping existing ones when `on_conflict` is set"""
+        query = self.supabase.table("progress")
+        if on_conflict:
+            return await query.upsert(rows, on_conflict=on_conflict, ignore_duplicates=True).execute()
+        return await query.insert(rows).execute()
+    
+    def _build_progress_record(
+        self,
+        child_id: str,
+        progress_data: ProgressEventCreate,
+        created_at: str
+    ) -> Dict[str, Any]:
+        """
+        Build the progress row for an event, including earned points
         
-        logger.info(f"Synced {synced_count} events, {failed_count} failed")
+        Offline events keep the time they happened (`occurred_at`, in UTC)
+        so streaks and daily stats land on the right day; times in the
+        future are clamped to `created_at`.
+        """
+        occurred_at = progress_data.occurred_at
+        if occurred_at is not None:
+            if occurred_at.tzinfo is not None:
+                occurred_at = occurred_at.astimezone(timezone.utc).replace(tzinfo=None)
+            created_at = min(occurred_at, datetime.fromisoformat(created_at)).isoformat()
         
         return {
-            "synced_count": synced_count,
-            "failed_count": failed_count
+            "child_id": child_id,
+            "module_id": progress_data.module_id,
+            "question_id": progress_data.question_id,
+            "is_correct": progress_data.is_correct,
+            "time_taken_seconds": progress_data.time_taken_seconds,
+            "attempt_count": progress_data.attempt_count,
+            "client_event_id": progress_data.client_event_id,
+            "points_earned": self._calculate_points(progress_data),
+            "created_at": created_at
         }
     
     async def get_progress_summary(
@@ -95,70 +415,90 @@ class ProgressService:
     ) -> Optional[ProgressSummary]:
         """
         Get progress summary for a child
+        
+        Summaries are cached until the child's progress version changes.
         """
+        key = ("summary", child_id, days, datetime.utcnow().date(), self.progress_versions.get(child_id))
+        cached = self.report_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            
-            # Get progress data
-            response = self.supabase.table("progress")\
-                .select("*")\
-                .eq("child_id", child_id)\
-                .gte("created_at", start_date)\
-                .execute()
+            start_day = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
             
-            if not response.data:
-                return None
-            
-            data = response.data
-            
-            # Calculate metrics
-            total_time = sum(p["time_taken_seconds"] for p in data) // 60
-            total_questions = len(data)
-            correct_answers = sum(1 for p in data if p["is_correct"])
-            accuracy = (correct_answers / total_questions * 100) if total_questions > 0 else 0
-            
-            # Get child's total points
-            child = self.supabase.table("children")\
-                .select("total_points")\
-                .eq("id", child_id)\
-                .single()\
-                .execute()
-            
-            # Calculate streak
-            streak = await self._calculate_streak(child_id)
-            
-            # Find favorite module type
-            module_counts = {}
-            for p in data:
-                module_response = self.supabase.table("modules")\
-                    .select("type")\
-                    .eq("id", p["module_id"])\
+            # Rollup totals plus the child's points and streak state, read
+            # concurrently
+            totals, child = await asyncio.gather(
+                self._summary_totals(child_id, start_day),
+                self.supabase.table("children")\
+                    .select("total_points, current_streak, longest_streak, last_active_date")\
+                    .eq("id", child_id)\
                     .single()\
                     .execute()
-                if module_response.data:
-                    module_type = module_response.data["type"]
-                    module_counts[module_type] = module_counts.get(module_type, 0) + 1
+            )
             
-            favorite = max(module_counts, key=module_counts.get) if module_counts else None
+            if not totals["total_questions"]:
+                return None
             
-            # Count completed modules
-            completed_modules = len(set(p["module_id"] for p in data))
+            accuracy = totals["total_correct"] / totals["total_questions"] * 100
+            child_data = child.data or {}
             
-            return ProgressSummary(
+            summary = ProgressSummary(
                 child_id=child_id,
-                total_time_minutes=total_time,
-                total_modules_completed=completed_modules,
-                total_questions_answered=total_questions,
+                total_time_minutes=totals["total_seconds"] // 60,
+                total_modules_completed=totals["modules_completed"],
+                total_questions_answered=totals["total_questions"],
                 average_accuracy=round(accuracy, 2),
-                current_streak_days=streak,
-                total_points=child.data["total_points"] if child.data else 0,
-                favorite_module_type=favorite
+                current_streak_days=current_streak_days(child_data),
+                longest_streak_days=child_data.get("longest_streak") or 0,
+                total_points=child_data.get("total_points", 0),
+                favorite_module_type=totals["favorite_module_type"]
             )
+            self.report_cache.set(key, summary)
+            
+            return summary
             
         except Exception as e:
             logger.error(f"Get progress summary failed: {str(e)}")
             return None
     
+    async def _summary_totals(self, child_id: str, start_day: str) -> Dict[str, Any]:
+        """
+        Summary totals since `start_day`, aggregated by the database
+        
+        Falls back to summing the rollup rows here, read in pages of
+        STATS_PAGE_SIZE, when the child_progress_summary function is not
+        installed.
+        """
+        if self._summary_rpc_available:
+            try:
+                response = await self.supabase.rpc("child_progress_summary", {
+                    "p_child_id": child_id,
+                    "p_start_day": start_day
+                }).execute()
+                return response.data[0]
+            except Exception as e:
+                if not _is_missing_function(e):
+                    raise
+                logger.warning("child_progress_summary is not installed, summing rollups in Python")
+                self._summary_rpc_available = False
+        
+        stats = []
+        while True:
+            response = await self.supabase.table("child_daily_stats")\
+                .select("seconds, questions, correct, module_type, module_ids")\
+                .eq("child_id", child_id)\
+                .gte("day", start_day)\
+                .order("day")\
+                .order("module_type")\
+                .range(len(stats), len(stats) + STATS_PAGE_SIZE - 1)\
+                .execute()
+            
+            rows = response.data or []
+            stats.extend(rows)
+            if len(rows) < STATS_PAGE_SIZE:
+                return summarize_daily_stats(stats)
+    
     async def get_detailed_report(
         self,
         child_id: str,
@@ -167,36 +507,45 @@ class ProgressService:
     ) -> Optional[ProgressReport]:
         """
         Generate detailed progress report
+        
+        Reports are cached per requested period until the child's progress
+        version changes.
         """
+        key = ("report", child_id, start_date, end_date, datetime.utcnow().date(), self.progress_versions.get(child_id))
+        cached = self.report_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
             if not start_date:
                 start_date = datetime.utcnow() - timedelta(days=30)
             if not end_date:
                 end_date = datetime.utcnow()
             
-            # Get overall summary
+            # Summary, the period's events, catalog counts and achievements
+            # are independent reads, so they are issued concurrently. One
+            # columnar batch of events feeds every analytics section.
             days = (end_date - start_date).days
-            summary = await self.get_progress_summary(child_id, days)
+            summary, events, catalog_counts, achievements = await asyncio.gather(
+                self.get_progress_summary(child_id, days),
+                self._fetch_event_batch(child_id, start_date, end_date),
+                self.catalog.type_counts(),
+                self._get_recent_achievements(child_id)
+            )
             
             if not summary:
                 return None
             
             # Get subject-specific progress
-            subject_progress = await self._analyze_subject_progress(
-                child_id, start_date, end_date
-            )
+            subject_progress = self._analyze_subject_progress(events, catalog_counts)
             
             # Analyze strengths and weaknesses
-            strengths, weaknesses = await self._analyze_strengths_weaknesses(
-                child_id, start_date, end_date
-            )
+            strengths, weaknesses = self._analyze_strengths_weaknesses(events)
             
             # Get weekly activity
-            weekly_activity = await self._get_weekly_activity(
-                child_id, start_date, end_date
-            )
+            weekly_activity = self._get_weekly_activity(events)
             
-            return ProgressReport(
+            report = ProgressReport(
                 child_id=child_id,
                 period_start=start_date,
                 period_end=end_date,
@@ -204,10 +553,13 @@ class ProgressService:
                 subject_progress=subject_progress,
                 strengths=strengths,
                 areas_for_improvement=weaknesses,
-                recent_achievements=await self._get_recent_achievements(child_id),
+                recent_achievements=achievements,
                 weekly_activity=weekly_activity,
                 generated_at=datetime.utcnow()
             )
+            self.report_cache.set(key, report)
+            
+            return report
             
         except Exception as e:
             logger.error(f"Generate report failed: {str(e)}")
@@ -217,10 +569,14 @@ class ProgressService:
         self,
         child_id: str,
         module_id: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[Cursor] = None
     ) -> List[ProgressResponse]:
         """
-        Get progress history for a child
+        Get progress history for a child, newest first
+        
+        Pass the position of the last row returned as `cursor` to read the
+        next page.
         """
         try:
             query = self.supabase.table("progress")\
@@ -230,7 +586,7 @@ class ProgressService:
             if module_id:
                 query = query.eq("module_id", module_id)
             
-            response = query.order("created_at", desc=True).limit(limit).execute()
+            response = await keyset_page(query, cursor, limit, desc=True).execute()
             
             return [ProgressResponse(**p) for p in response.data]
             
@@ -238,6 +594,29 @@ class ProgressService:
             logger.error(f"Get progress history failed: {str(e)}")
             return []
     
+    async def iter_progress_pages(
+        self,
+        child_id: str,
+        page_size: int = EVENT_PAGE_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Read a child's full progress history oldest first, one keyset page
+        at a time
+        """
+        cursor = None
+        while True:
+            query = self.supabase.table("progress")\
+                .select(", ".join(progress_export.EXPORT_COLUMNS))\
+                .eq("child_id", child_id)
+            response = await keyset_page(query, cursor, page_size).execute()
+            
+            rows = response.data or []
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            cursor = (rows[-1]["created_at"], rows[-1]["id"])
+    
     def _calculate_points(self, progress_data: ProgressEventCreate) -> int:
         """Calculate points earned for an event"""
         if not progress_data.is_correct:
@@ -257,58 +636,176 @@ class ProgressService:
         
         return base_points
     
-    async def _update_child_points(self, child_id: str, points: int):
-        """Update child's total points"""
+    async def _apply_progress_totals(
+        self,
+        rows: List[Dict[str, Any]],
+        modules: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+        steps: Optional[Tuple[str, ...]] = None
+    ) -> List[str]:
+        """
+        Fold newly written progress rows into the running totals
+        
+        Adds the earned points to each child, advances their streaks and
+        adds the rows to the child_daily_stats rollup, issuing the three
+        independent updates concurrently. Bumping the children's progress
+        versions retires their cached reports and recommendations, and
+        loaded AI event windows are extended. Only pass rows that were
+        actually inserted, so replays are never counted twice.
+        
+        A retry passes the `steps` that failed before, and only those
+        updates are issued again; windows are extended on the first call.
+        
+        Returns:
+            The steps of TOTALS_STEPS that failed, already logged
+        """
+        if not rows:
+            return []
+        
+        deltas: Dict[str, int] = {}
+        active_days: Dict[str, set] = {}
+        for row in rows:
+            deltas[row["child_id"]] = deltas.get(row["child_id"], 0) + (row.get("points_earned") or 0)
+            active_days.setdefault(row["child_id"], set()).add(str(row["created_at"])[:10])
+        
+        if modules is None:
+            modules = await self.catalog.get_many(
+                {row["module_id"] for row in rows},
+                loader=ModuleLoader(self.supabase)
+            )
+        
+        for child_id in deltas:
+            self.progress_versions.bump(child_id)
+        if steps is None:
+            self.event_windows.append(rows)
+            steps = TOTALS_STEPS
+        
+        updates = {
+            "points": lambda: self._increment_child_points(deltas),
+            "streaks": lambda: self._advance_streaks(active_days),
+            "daily_stats": lambda: self._apply_daily_stats(build_daily_stats(rows, modules))
+        }
+        applied = await asyncio.gather(*(updates[step]() for step in steps))
+        return [step for step, ok in zip(steps, applied) if not ok]
+    
+    async def _apply_daily_stats(self, stats: List[Dict[str, Any]]) -> bool:
+        """
+        Add rollup deltas through the `apply_child_daily_stats` function
+        
+        Returns:
+            Whether the update was applied
+        """
         try:
-            child = self.supabase.table("children")\
-                .select("total_points")\
-                .eq("id", child_id)\
-                .single()\
-                .execute()
-            
-            if child.data:
-                new_total = child.data["total_points"] + points
-                self.supabase.table("children")\
-                    .update({"total_points": new_total})\
-                    .eq("id", child_id)\
-                    .execute()
+            await self.supabase.rpc(
+                "apply_child_daily_stats",
+                {"p_rows": stats}
+            ).execute()
+            return True
+        except Exception as e:
+            logger.error(f"Update daily stats failed: {str(e)}")
+            return False
+    
+    async def _increment_child_points(self, deltas: Dict[str, int]) -> bool:
+        """
+        Atomically add points to one or more children
+        
+        Runs the `increment_child_points` function from app/models/child.py,
+        so concurrent events for the same child never overwrite each other
+        and a batch costs a single round trip.
+        
+        Returns:
+            Whether the points were added
+        """
+        deltas = {child_id: delta for child_id, delta in deltas.items() if delta}
+        if not deltas:
+            return True
+        
+        try:
+            await self.supabase.rpc(
+                "increment_child_points",
+                {"p_deltas": deltas}
+            ).execute()
+            return True
         except Exception as e:
             logger.error(f"Update child points failed: {str(e)}")
+            return False
     
-    async def _calculate_streak(self, child_id: str) -> int:
-        """Calculate current learning streak in days"""
-        # Simplified implementation
-        return 0
+    async def _advance_streaks(self, active_days: Dict[str, set]) -> bool:
+        """
+        Advance each child's streak with the days they were active
+        
+        Runs the `advance_child_streaks` function from app/models/child.py,
+        which updates the stored streak state in O(1) per day.
+        
+        Returns:
+            Whether the streaks were advanced
+        """
+        try:
+            await self.supabase.rpc(
+                "advance_child_streaks",
+                {"p_days": {child_id: sorted(days) for child_id, days in active_days.items()}}
+            ).execute()
+            return True
+        except Exception as e:
+            logger.error(f"Update streaks failed: {str(e)}")
+            return False
     
-    async def _analyze_subject_progress(
+    async def _fetch_event_batch(
         self,
         child_id: str,
         start_date: datetime,
         end_date: datetime
+    ) -> progress_analytics.EventBatch:
+        """
+        Fetch a child's events in a period as one columnar batch
+        
+        Rows are read in pages of EVENT_PAGE_SIZE and joined to module
+        type, title and difficulty through the catalog. The first page
+        carries the total row count, so the remaining pages are fetched
+        concurrently.
+        """
+        def page(offset: int, count: Optional[str] = None):
+            return self.supabase.table("progress")\
+                .select(", ".join(progress_analytics.EVENT_COLUMNS), count=count)\
+                .eq("child_id", child_id)\
+                .gte("created_at", start_date.isoformat())\
+                .lte("created_at", end_date.isoformat())\
+                .order("created_at")\
+                .order("id")\
+                .range(offset, offset + EVENT_PAGE_SIZE - 1)\
+                .execute()
+        
+        first = await page(0, count="exact")
+        rows: List[Dict[str, Any]] = list(first.data or [])
+        total = first.count if first.count is not None else len(rows)
+        
+        if len(rows) == EVENT_PAGE_SIZE and total > EVENT_PAGE_SIZE:
+            pages = await asyncio.gather(*(
+                page(offset) for offset in range(EVENT_PAGE_SIZE, total, EVENT_PAGE_SIZE)
+            ))
+            for response in pages:
+                rows.extend(response.data or [])
+        
+        modules = await self.catalog.get_many(
+            {row["module_id"] for row in rows},
+            loader=ModuleLoader(self.supabase)
+        )
+        return progress_analytics.build_event_batch(rows, modules)
+    
+    def _analyze_subject_progress(
+        self,
+        events: progress_analytics.EventBatch,
+        catalog_counts: Dict[str, int]
     ) -> List[SubjectProgress]:
         """Analyze progress by subject"""
-        # Simplified implementation
-        return []
+        return progress_analytics.subject_progress(events, catalog_counts)
     
-    async def _analyze_strengths_weaknesses(
-        self,
-        child_id: str,
-        start_date: datetime,
-        end_date: datetime
-    ) -> tuple:
+    def _analyze_strengths_weaknesses(self, events: progress_analytics.EventBatch) -> tuple:
         """Analyze strengths and weaknesses"""
-        # Simplified implementation
-        return [], []
+        return progress_analytics.strengths_weaknesses(events)
     
-    async def _get_weekly_activity(
-        self,
-        child_id: str,
-        start_date: datetime,
-        end_date: datetime
-    ) -> Dict[str, int]:
-        """Get activity by day of week"""
-        # Simplified implementation
-        return {}
+    def _get_weekly_activity(self, events: progress_analytics.EventBatch) -> Dict[str, int]:
+        """Get minutes of activity by day of week"""
+        return progress_analytics.weekly_activity(events)
     
     async def _get_recent_achievements(self, child_id: str) -> List[str]:
         """Get recent achievements"""
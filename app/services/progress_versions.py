@@ -0,0 +1,30 @@
+from typing import Dict
+from functools import lru_cache
+
+
+class ProgressVersions:
+    """
+    Per-child progress version counters
+
+    Bumped for a child on every progress write, so caches keyed by the
+    version (reports, recommendations) stop serving that child's stale
+    entries. Counters are per process; caches bound staleness from other
+    workers' writes with their TTLs.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+
+    def get(self, child_id: str) -> int:
+        return self._versions.get(child_id, 0)
+
+    def bump(self, child_id: str):
+        self._versions[child_id] = self.get(child_id) + 1
+
+
+@lru_cache()
+def get_progress_versions() -> ProgressVersions:
+    """
+    Get the process-wide progress version counters
+    """
+    return ProgressVersions()
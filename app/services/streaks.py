@@ -0,0 +1,75 @@
+from typing import Any, Dict, Iterable, Optional
+from datetime import date, datetime, timedelta
+
+ONE_DAY = timedelta(days=1)
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def advance_streak(state: Dict[str, Any], days: Iterable[date]) -> Dict[str, Any]:
+    """
+    Fold newly active days into a child's streak state
+
+    `state` holds `streak_start_date`, `last_active_date`, `current_streak`
+    and `longest_streak`. Each day costs O(1): it extends the current run
+    forwards or backwards, starts a new run, or is ignored when it falls
+    inside the run. Days older than the run that do not touch it cannot be
+    placed without history; `recompute_streak` repairs those cases.
+    Mirrors ADVANCE_CHILD_STREAKS_FUNCTION in app/models/child.py.
+    """
+    start = _as_date(state.get("streak_start_date"))
+    last = _as_date(state.get("last_active_date"))
+    current = state.get("current_streak") or 0
+    longest = state.get("longest_streak") or 0
+
+    days = sorted({_as_date(day) for day in days})
+    # Days before the run are walked backwards so each can extend it
+    earlier = [day for day in days if start is not None and day < start]
+    later = [day for day in days if start is None or day >= start]
+
+    for day in reversed(earlier):
+        if day == start - ONE_DAY:
+            start = day
+            current += 1
+            longest = max(longest, current)
+
+    for day in later:
+        if last is None or day > last + ONE_DAY:
+            start = last = day
+            current = 1
+        elif day == last + ONE_DAY:
+            last = day
+            current += 1
+        longest = max(longest, current)
+
+    return {
+        "streak_start_date": start.isoformat() if start else None,
+        "last_active_date": last.isoformat() if last else None,
+        "current_streak": current,
+        "longest_streak": longest
+    }
+
+
+def recompute_streak(days: Iterable[date]) -> Dict[str, Any]:
+    """
+    Streak state from a child's full set of active days
+    """
+    return advance_streak({}, days)
+
+
+def current_streak_days(child: Dict[str, Any], today: Optional[date] = None) -> int:
+    """
+    Current streak as shown to users
+
+    A run is still current while the child was last active today or
+    yesterday (UTC, like the stored days); otherwise it reads as 0.
+    """
+    last = _as_date(child.get("last_active_date"))
+    today = today or datetime.utcnow().date()
+    if last is None or last < today - ONE_DAY:
+        return 0
+    return child.get("current_streak") or 0
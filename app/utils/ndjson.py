@@ -0,0 +1,54 @@
+from typing import AsyncIterable, AsyncIterator
+import zlib
+
+# A single event is a few hundred bytes; anything far larger is malformed
+MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes],
+    gzipped: bool = False,
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Split a streamed request body into newline-delimited JSON lines
+
+    Decompresses gzip on the fly when `gzipped` is set. Only the current
+    partial line is buffered, so memory stays bounded by `max_line_bytes`
+    whatever the size of the body. Blank lines are skipped.
+
+    Raises:
+        ValueError: If a line exceeds `max_line_bytes` or the gzip data is corrupt
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+    buffer = b""
+
+    async for chunk in chunks:
+        for piece in _inflate(decompressor, chunk, max_line_bytes) if decompressor else (chunk,):
+            buffer += piece
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+
+            if len(buffer) > max_line_bytes:
+                raise ValueError(f"Line exceeds {max_line_bytes} bytes")
+
+    if decompressor:
+        buffer += decompressor.flush()
+    for line in buffer.split(b"\n"):
+        if line.strip():
+            yield line
+
+
+def _inflate(decompressor, chunk: bytes, max_length: int):
+    """Decompress a chunk in pieces of at most `max_length` bytes"""
+    try:
+        data = decompressor.decompress(chunk, max_length)
+        while True:
+            yield data
+            if not decompressor.unconsumed_tail:
+                return
+            data = decompressor.decompress(decompressor.unconsumed_tail, max_length)
+    except zlib.error as e:
+        raise ValueError(f"Invalid gzip data: {str(e)}")
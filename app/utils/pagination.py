@@ -0,0 +1,96 @@
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+import base64
+import json
+import re
+
+from dateutil.parser import isoparse
+
+# Keyset position: the (created_at, id) of the last row already returned
+Cursor = Tuple[str, str]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_ROW_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a stored ISO 8601 timestamp
+
+    PostgREST trims trailing zeros from fractional seconds, which
+    `datetime.fromisoformat` rejects before Python 3.11.
+
+    Raises:
+        ValueError: If the value is not a timestamp
+    """
+    return isoparse(value)
+
+
+def encode_cursor(created_at: Any, row_id: str) -> str:
+    """Opaque, URL-safe cursor for the row at (created_at, id)"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([str(created_at), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Parse a cursor made by `encode_cursor`
+
+    Both parts are validated, since they end up in a query filter.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        parse_timestamp(created_at)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(row_id, str) or not _ROW_ID.match(row_id):
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
+
+
+def keyset_page(query, cursor: Optional[Cursor], limit: int, desc: bool = False):
+    """
+    Order a query by (created_at, id) and start it after `cursor`
+
+    The filter only touches the leading index columns, so each page costs
+    the same however deep it is, unlike an offset `range()`.
+    """
+    if cursor:
+        created_at, row_id = cursor
+        op = "lt" if desc else "gt"
+        query = query.or_(
+            f'created_at.{op}."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.{op}."{row_id}")'
+        )
+
+    return query\
+        .order("created_at", desc=desc)\
+        .order("id", desc=desc)\
+        .limit(limit)
+
+
+def next_cursor(items: List[Any], limit: int) -> Optional[str]:
+    """
+    Cursor for the page after `items`, or None when this was the last page
+
+    A full page always gets a cursor, so the last page may come back empty.
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def set_next_cursor(response, items: List[Any], limit: int):
+    """Expose the next page's cursor in the X-Next-Cursor response header"""
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
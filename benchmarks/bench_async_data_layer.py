@@ -0,0 +1,80 @@
+"""
+Concurrent-request throughput: blocking Supabase client vs async data layer
+
+Both clients talk to an in-process PostgREST stand-in that answers after a
+fixed latency, so the numbers only reflect how the event loop is used.
+
+Usage:
+    python -m benchmarks.bench_async_data_layer [--requests 200] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, Client, ClientOptions
+
+SUPABASE_URL = "https://bench.supabase.co"
+SUPABASE_KEY = "bench-key"
+ROWS = [{"id": "prog-1", "child_id": "child-1", "is_correct": True}]
+
+
+def _response() -> httpx.Response:
+    return httpx.Response(200, content=json.dumps(ROWS), headers={"Content-Type": "application/json"})
+
+
+def build_sync_client(latency: float) -> Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return _response()
+
+    transport = httpx.Client(transport=httpx.MockTransport(handler))
+    return Client(SUPABASE_URL, SUPABASE_KEY, ClientOptions(httpx_client=transport))
+
+
+def build_async_client(latency: float) -> AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return _response()
+
+    transport = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncClient(SUPABASE_URL, SUPABASE_KEY, AsyncClientOptions(httpx_client=transport))
+
+
+async def blocking_request(client: Client):
+    """Request handler shape before: sync .execute() inside an async def"""
+    return client.table("progress").select("*").eq("child_id", "child-1").execute()
+
+
+async def async_request(client: AsyncClient):
+    """Request handler shape after: awaited .execute() on the async client"""
+    return await client.table("progress").select("*").eq("child_id", "child-1").execute()
+
+
+async def run(handler, client, requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(client) for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+
+    before = asyncio.run(run(blocking_request, build_sync_client(latency), args.requests))
+    after = asyncio.run(run(async_request, build_async_client(latency), args.requests))
+
+    print(f"{args.requests} concurrent requests, {args.latency_ms:.0f} ms PostgREST latency")
+    print(f"  before (sync client):  {before:8.3f} s  {args.requests / before:10.1f} req/s")
+    print(f"  after  (async client): {after:8.3f} s  {args.requests / after:10.1f} req/s")
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
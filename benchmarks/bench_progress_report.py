@@ -0,0 +1,132 @@
+"""
+Report analytics for a year of events: per-row Python loops vs NumPy
+
+Builds the weekly activity, subject progress and strengths/weaknesses
+sections of a ProgressReport from in-memory event rows, so the numbers
+only reflect the analytics themselves, not database reads.
+
+Usage:
+    python -m benchmarks.bench_progress_report [--days 365] [--events-per-day 100]
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import random
+import time
+
+from app.schemas.progress import ProgressReport, ProgressSummary
+from app.services import progress_analytics
+from app.services.module_catalog import module_type_of
+
+MODULE_TYPES = ["reading", "counting", "cognitive"]
+
+
+def build_modules(count: int):
+    return {
+        f"mod-{i}": {
+            "id": f"mod-{i}",
+            "type": MODULE_TYPES[i % 3],
+            "title": f"Module {i}",
+            "difficulty_level": i % 10 + 1
+        }
+        for i in range(count)
+    }
+
+
+def build_rows(days: int, events_per_day: int, module_count: int):
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1, 8, 0)
+    return [
+        {
+            "module_id": f"mod-{rng.randrange(module_count)}",
+            "is_correct": rng.random() < 0.7,
+            "time_taken_seconds": rng.randrange(5, 60),
+            "created_at": (start + timedelta(days=day, minutes=i)).isoformat()
+        }
+        for day in range(days)
+        for i in range(events_per_day)
+    ]
+
+
+def loop_report(rows, modules):
+    """Report sections shape before: one Python pass per section, row by row"""
+    weekly = {day: 0 for day in progress_analytics.WEEKDAYS}
+    for row in rows:
+        weekday = datetime.fromisoformat(row["created_at"]).weekday()
+        weekly[progress_analytics.WEEKDAYS[weekday]] += row["time_taken_seconds"]
+
+    subjects = {}
+    for row in rows:
+        module = modules[row["module_id"]]
+        stats = subjects.setdefault(module_type_of(module), {"questions": 0, "correct": 0, "modules": set()})
+        stats["questions"] += 1
+        stats["correct"] += row["is_correct"]
+        stats["modules"].add(row["module_id"])
+
+    skills = {}
+    for row in rows:
+        stats = skills.setdefault(row["module_id"], [0, 0])
+        stats[0] += 1
+        stats[1] += row["is_correct"]
+
+    return weekly, subjects, skills
+
+
+def vectorized_report(rows, modules, catalog_counts):
+    """Report sections shape after: one columnar batch, bincounts per section"""
+    events = progress_analytics.build_event_batch(rows, modules)
+    strengths, weaknesses = progress_analytics.strengths_weaknesses(events)
+    return ProgressReport(
+        child_id="child-1",
+        period_start=datetime(2024, 1, 1),
+        period_end=datetime(2024, 12, 31),
+        overall_summary=ProgressSummary(
+            child_id="child-1",
+            total_time_minutes=0,
+            total_modules_completed=0,
+            total_questions_answered=len(rows),
+            average_accuracy=0,
+            current_streak_days=0,
+            total_points=0
+        ),
+        subject_progress=progress_analytics.subject_progress(events, catalog_counts),
+        strengths=strengths,
+        areas_for_improvement=weaknesses,
+        recent_achievements=[],
+        weekly_activity=progress_analytics.weekly_activity(events),
+        generated_at=datetime.utcnow()
+    )
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--events-per-day", type=int, default=100)
+    parser.add_argument("--modules", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    modules = build_modules(args.modules)
+    rows = build_rows(args.days, args.events_per_day, args.modules)
+    catalog_counts = {t: sum(1 for m in modules.values() if m["type"] == t) for t in MODULE_TYPES}
+
+    before = best_of(lambda: loop_report(rows, modules), args.repeat)
+    after = best_of(lambda: vectorized_report(rows, modules, catalog_counts), args.repeat)
+
+    print(f"{len(rows)} events over {args.days} days, {args.modules} modules")
+    print(f"  before (row loops):           {before * 1000:8.1f} ms")
+    print(f"  after  (NumPy, full report):  {after * 1000:8.1f} ms")
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Similar-children search: pairwise loop vs KD-tree index
+
+Finds the 10 most similar children the way CollaborativeFilter did before
+(one `_calculate_similarity` call per child, then a full sort) and with a
+CollaborativeFilter index built once up front, as it is between rebuilds.
+
+Usage:
+    python -m benchmarks.bench_similar_children [--children 300000]
+"""
+
+import argparse
+import random
+import time
+
+from app.ml.recommendation_engine import CollaborativeFilter, PROFILE_TYPES
+
+
+def build_children(count: int):
+    rng = random.Random(7)
+    children = []
+    for i in range(count):
+        child = {"id": f"child-{i}", "age": rng.randint(4, 10), "current_level": rng.randint(1, 10)}
+        if rng.random() < 0.7:
+            child["type_accuracy"] = {t: rng.random() for t in PROFILE_TYPES if rng.random() < 0.6}
+        children.append(child)
+    return children
+
+
+def loop_similar_children(child, children, top_k=10):
+    """Search shape before: one Python call per child and a full sort"""
+    similarities = []
+    for other in children:
+        if other["id"] == child["id"]:
+            continue
+        similarities.append((other["id"], CollaborativeFilter._calculate_similarity(child, other)))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return [child_id for child_id, _ in similarities[:top_k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--children", type=int, default=300000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    children = build_children(args.children)
+    queries = random.Random(3).sample(children, args.queries)
+
+    start = time.perf_counter()
+    index = CollaborativeFilter()
+    index.build(children)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_similar_children(queries[0], children)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for child in queries:
+        index.similar_children(child)
+    after = (time.perf_counter() - start) / len(queries)
+
+    print(f"{args.children} children, top 10")
+    print(f"  index build:               {build * 1000:8.2f} ms")
+    print(f"  before (pairwise loop):    {before * 1000:8.2f} ms per query")
+    print(f"  after  (KD-tree query):    {after * 1000:8.3f} ms per query")
+    print(f"  speedup: {before / after:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
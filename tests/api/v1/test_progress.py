@@ -3,6 +3,8 @@ from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch
 from app.schemas.progress import ProgressResponse, ProgressSummary, ProgressReport, StrengthWeakness
 from datetime import datetime
+import gzip
+import json
 
 # Setup Mocks
 @pytest.fixture
@@ -71,6 +73,28 @@ async def test_sync_progress(async_client: AsyncClient, mock_progress_service, o
     data = response.json()
     assert data["synced_count"] == 1
 
+@pytest.mark.asyncio
+async def test_sync_progress_stream_gzip(async_client: AsyncClient, mock_progress_service, override_get_current_user):
+    # Prepare
+    event = json.dumps({"module_id": "mod-1", "is_correct": True, "time_taken_seconds": 10})
+    body = gzip.compress("\n".join([event] * 3).encode())
+    
+    async def consume(child_id, session_id, lines):
+        return {"synced_count": len([line async for line in lines]), "failed_count": 0}
+    
+    mock_progress_service.sync_progress_stream = consume
+    
+    # Act
+    response = await async_client.post(
+        "/api/v1/progress/children/child-1/sync/stream?offline_session_id=sess-123",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+    )
+    
+    # Assert
+    assert response.status_code == 201
+    assert response.json()["synced_count"] == 3
+
 @pytest.mark.asyncio
 async def test_get_progress_summary(async_client: AsyncClient, mock_progress_service, override_get_current_user):
     # Prepare
@@ -171,6 +195,32 @@ async def test_get_progress_history(async_client: AsyncClient, mock_progress_ser
     assert len(data) == 1
     assert data[0]["id"] == "prog-1"
 
+
+@pytest.mark.asyncio
+async def test_progress_history_cursor(async_client: AsyncClient, mock_progress_service, override_get_current_user):
+    created_at = datetime(2024, 3, 4, 9, 0)
+    mock_progress_service.get_progress_history = AsyncMock(return_value=[
+        ProgressResponse(
+            id="prog-2",
+            child_id="child-1",
+            module_id="mod-1",
+            is_correct=True,
+            time_taken_seconds=15,
+            attempt_count=1,
+            points_earned=15,
+            created_at=created_at
+        )
+    ])
+    
+    response = await async_client.get("/api/v1/progress/children/child-1/history?limit=1")
+    cursor = response.headers["X-Next-Cursor"]
+    await async_client.get(f"/api/v1/progress/children/child-1/history?limit=1&cursor={cursor}")
+    
+    assert mock_progress_service.get_progress_history.call_args.kwargs["cursor"] == (created_at.isoformat(), "prog-2")
+    
+    response = await async_client.get("/api/v1/progress/children/child-1/history?cursor=bogus")
+    assert response.status_code == 400
+
 @pytest.mark.asyncio
 async def test_record_progress_invalid_data(async_client: AsyncClient, mock_progress_service, override_get_current_user):
     # Prepare - Invalid time_taken (negative)
@@ -189,3 +239,33 @@ async def test_record_progress_invalid_data(async_client: AsyncClient, mock_prog
     # Assert
     assert response.status_code == 400
 
+
+@pytest.mark.asyncio
+async def test_export_progress_csv(async_client: AsyncClient, mock_progress_service, override_get_current_user):
+    async def pages(child_id):
+        yield [{"id": "prog-1", "child_id": child_id, "module_id": "mod-1", "is_correct": True,
+                "time_taken_seconds": 15, "created_at": "2024-03-04T09:00:00"}]
+
+    mock_progress_service.iter_progress_pages = pages
+    
+    response = await async_client.get("/api/v1/progress/children/child-1/export?format=csv")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[1].startswith("prog-1,child-1,mod-1")
+    
+    response = await async_client.get("/api/v1/progress/children/child-1/export?format=xlsx")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_sync_progress_stream_rejects_long_session_id(async_client: AsyncClient, mock_progress_service, override_get_current_user):
+    # Act
+    response = await async_client.post(
+        "/api/v1/progress/children/child-1/sync/stream?offline_session_id=" + "s" * 65,
+        content=b"",
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    
+    # Assert
+    assert response.status_code == 400
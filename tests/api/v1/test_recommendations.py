@@ -52,6 +52,15 @@ async def test_get_recommendations(async_client: AsyncClient, mock_ai_service, o
     data = response.json()
     assert len(data["recommended_modules"]) == 1
     mock_ai_service.get_recommendations.assert_called_once()
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    
+    # Revalidation with the ETag is answered without a body
+    response = await async_client.get(
+        "/api/v1/recommendations/children/child-1",
+        headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
 
 @pytest.mark.asyncio
 async def test_get_next_module(async_client: AsyncClient, mock_ai_service, override_get_current_user):
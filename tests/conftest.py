@@ -5,9 +5,13 @@ from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.dependencies import get_current_user, get_supabase_client
+from app.dependencies import get_current_user, get_async_supabase_client
 from app.schemas.user import User
+from app.services.streaks import advance_streak
+from app.services.daily_stats import summarize_daily_stats
 from datetime import datetime
+import uuid
+import asyncio
 
 # Mock User Data
 MOCK_USER_ID = "test-user-id"
@@ -25,7 +29,7 @@ def mock_user() -> User:
 
 @pytest.fixture
 def mock_supabase():
-    with patch("app.dependencies.get_supabase_client") as mock:
+    with patch("app.dependencies.get_async_supabase_client") as mock:
         client = MagicMock()
         mock.return_value = client
         yield client
@@ -47,3 +51,280 @@ import pytest_asyncio
 async def async_client() -> AsyncGenerator:
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Minimal in-memory stand-in for a PostgREST query builder"""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.row_limit = None
+        self.row_offset = 0
+        self.is_single = False
+        self.count = None
+
+    def select(self, columns="*", count=None, **kwargs):
+        self.count = count
+        return self
+
+    def insert(self, data, **kwargs):
+        self.operation, self.payload = "insert", data
+        return self
+
+    def upsert(self, data, on_conflict="id", ignore_duplicates=False, **kwargs):
+        self.operation, self.payload = "upsert", data
+        self.on_conflict = [c.strip() for c in on_conflict.split(",")]
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, data, **kwargs):
+        self.operation, self.payload = "update", data
+        return self
+
+    def delete(self, **kwargs):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) <= value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) < value)
+        return self
+
+    def or_(self, filters, **kwargs):
+        self.filters.append(_logic_tree("or", filters))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def range(self, start, end):
+        self.row_offset, self.row_limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self.is_single = True
+        return self
+
+    def _matches(self, row):
+        return all(f(row) for f in self.filters)
+
+    async def execute(self):
+        await self.db.round_trip()
+        rows = self.db.tables.setdefault(self.table, [])
+
+        if self.operation in ("insert", "upsert"):
+            records = self.payload if isinstance(self.payload, list) else [self.payload]
+            written = []
+            for record in records:
+                record = {"id": str(uuid.uuid4()), "created_at": datetime.utcnow().isoformat(), **record}
+                if self.operation == "upsert":
+                    key = lambda row: tuple(row.get(c) for c in self.on_conflict)
+                    existing = next((r for r in rows if key(r) == key(record)), None)
+                    if existing is not None:
+                        if not self.ignore_duplicates:
+                            existing.update(record)
+                            written.append(existing)
+                        continue
+                rows.append(record)
+                written.append(record)
+            return FakeResponse(written)
+
+        matched = [row for row in rows if self._matches(row)]
+
+        if self.operation == "update":
+            for row in matched:
+                row.update(self.payload)
+            return FakeResponse(matched)
+
+        if self.operation == "delete":
+            self.db.tables[self.table] = [row for row in rows if not self._matches(row)]
+            return FakeResponse(matched)
+
+        for column, desc in reversed(self.orders):
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column) if row.get(column) is not None else 0), reverse=desc)
+        total = len(matched) if self.count else None
+        end = None if self.row_limit is None else self.row_offset + self.row_limit
+        matched = matched[self.row_offset:end]
+
+        if self.is_single:
+            return FakeResponse(dict(matched[0]) if matched else None)
+        return FakeResponse([dict(row) for row in matched], count=total)
+
+
+_OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b
+}
+
+
+def _split_conditions(filters):
+    """Split a PostgREST logic tree on top-level commas"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(filters):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in "()":
+            depth += 1 if char == "(" else -1
+        elif not quoted and char == "," and depth == 0:
+            parts.append(filters[start:i])
+            start = i + 1
+    parts.append(filters[start:])
+    return parts
+
+
+def _logic_tree(operator, filters):
+    """Row predicate for `or_`/`and(...)` filter strings such as
+    'created_at.lt."x",and(created_at.eq."x",id.lt."y")'"""
+    predicates = []
+    for condition in _split_conditions(filters):
+        if condition.startswith(("and(", "or(")):
+            name, inner = condition[:-1].split("(", 1)
+            predicates.append(_logic_tree(name, inner))
+            continue
+        column, op, value = condition.split(".", 2)
+        value = value.strip('"')
+        predicates.append(
+            lambda row, column=column, op=op, value=value:
+                row.get(column) is not None and _OPERATORS[op](str(row.get(column)), value)
+        )
+    combine = any if operator == "or" else all
+    return lambda row: combine(predicate(row) for predicate in predicates)
+
+
+class FakeRPC:
+    def __init__(self, db, fn, params):
+        self.db = db
+        self.fn = fn
+        self.params = params
+
+    async def execute(self):
+        await self.db.round_trip()
+        if self.fn not in self.db.functions:
+            raise Exception(f"Could not find the function public.{self.fn}")
+        return FakeResponse(self.db.functions[self.fn](self.db, **self.params))
+
+
+class FakeSupabase:
+    """In-memory async Supabase client that counts database round trips"""
+
+    def __init__(self, tables=None, functions=None):
+        self.tables = {name: [dict(row) for row in rows] for name, rows in (tables or {}).items()}
+        self.functions = dict(functions or {})
+        self.round_trips = 0
+        self.latency = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def round_trip(self):
+        """Count a request and, with `latency` set, simulate network time"""
+        self.round_trips += 1
+        if self.latency:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(self.latency)
+            self.in_flight -= 1
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, fn, params=None):
+        return FakeRPC(self, fn, params or {})
+
+
+def fake_increment_child_points(db, p_deltas):
+    """Python stand-in for INCREMENT_CHILD_POINTS_FUNCTION"""
+    updated = []
+    for child in db.tables.get("children", []):
+        if child["id"] in p_deltas:
+            child["total_points"] = child.get("total_points", 0) + int(p_deltas[child["id"]])
+            updated.append({"id": child["id"], "total_points": child["total_points"]})
+    return updated
+
+
+def fake_apply_child_daily_stats(db, p_rows):
+    """Python stand-in for APPLY_CHILD_DAILY_STATS_FUNCTION"""
+    stats = db.tables.setdefault("child_daily_stats", [])
+    for row in p_rows:
+        key = (row["child_id"], row["day"], row["module_type"])
+        existing = next((s for s in stats if (s["child_id"], s["day"], s["module_type"]) == key), None)
+        if existing is None:
+            stats.append({**row, "module_ids": list(row["module_ids"])})
+            continue
+        for column in ("questions", "correct", "seconds", "points"):
+            existing[column] += row[column]
+        existing["module_ids"] = list(dict.fromkeys(existing["module_ids"] + row["module_ids"]))
+    return None
+
+
+def fake_advance_child_streaks(db, p_days):
+    """Python stand-in for ADVANCE_CHILD_STREAKS_FUNCTION"""
+    for child in db.tables.get("children", []):
+        if child["id"] in p_days:
+            child.update(advance_streak(child, p_days[child["id"]]))
+    return None
+
+
+def fake_set_child_streaks(db, p_states):
+    """Python stand-in for SET_CHILD_STREAKS_FUNCTION"""
+    for child in db.tables.get("children", []):
+        if child["id"] in p_states:
+            child.update(p_states[child["id"]])
+    return None
+
+
+def fake_child_progress_summary(db, p_child_id, p_start_day):
+    """Python stand-in for CHILD_PROGRESS_SUMMARY_FUNCTION"""
+    return [summarize_daily_stats(
+        s for s in db.tables.get("child_daily_stats", [])
+        if s["child_id"] == p_child_id and s["day"] >= p_start_day
+    )]
+
+
+@pytest.fixture
+def fake_supabase() -> FakeSupabase:
+    return FakeSupabase(functions={
+        "increment_child_points": fake_increment_child_points,
+        "apply_child_daily_stats": fake_apply_child_daily_stats,
+        "advance_child_streaks": fake_advance_child_streaks,
+        "set_child_streaks": fake_set_child_streaks,
+        "child_progress_summary": fake_child_progress_summary
+    })
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executor import SyncExecutor, get_sync_executor, shutdown_sync_executor
+
+
+class FakeQuery:
+    def __init__(self, data):
+        self.data = data
+
+    def execute(self):
+        return self.data
+
+
+@pytest.mark.asyncio
+async def test_run_and_execute_return_results_off_the_loop():
+    executor = SyncExecutor(max_workers=2)
+
+    assert await executor.run(threading.current_thread) is not threading.current_thread()
+    assert await executor.run(lambda a, b=0: a + b, 1, b=2) == 3
+    assert await executor.execute(FakeQuery([{"id": 1}])) == [{"id": 1}]
+
+    await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stats_count_queued_and_completed_calls():
+    executor = SyncExecutor(max_workers=1)
+    release = threading.Event()
+
+    blocked = asyncio.ensure_future(executor.run(release.wait))
+    waiting = asyncio.ensure_future(executor.run(lambda: "done"))
+    while executor.stats()["running"] == 0:
+        await asyncio.sleep(0.01)
+
+    stats = executor.stats()
+    assert stats["running"] == 1
+    assert stats["queue_depth"] == 1
+
+    release.set()
+    assert await waiting == "done"
+    await blocked
+
+    stats = executor.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 2
+    assert stats["max_wait_ms"] >= stats["avg_wait_ms"] > 0
+
+    await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_for_running_calls_without_blocking_the_loop():
+    executor = SyncExecutor(max_workers=1)
+    release = threading.Event()
+    running = asyncio.ensure_future(executor.run(release.wait))
+    while executor.stats()["running"] == 0:
+        await asyncio.sleep(0.01)
+
+    shutdown = asyncio.ensure_future(executor.shutdown())
+    await asyncio.sleep(0.05)
+    # the loop is still free while the pool drains
+    assert not shutdown.done()
+
+    release.set()
+    await shutdown
+    assert await running is True
+    with pytest.raises(RuntimeError):
+        await executor.run(lambda: None)
+    assert executor.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shutdown_sync_executor_resets_the_shared_pool():
+    executor = get_sync_executor()
+
+    await shutdown_sync_executor()
+
+    assert get_sync_executor.cache_info().currsize == 0
+    assert get_sync_executor() is not executor
+    await shutdown_sync_executor()
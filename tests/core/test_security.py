@@ -0,0 +1,142 @@
+import time
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.config import settings
+from app.core.security import verify_supabase_token
+from app.dependencies import get_current_user, token_cache
+
+JWT_SECRET = "test-project-jwt-secret"
+
+
+def make_token(secret=JWT_SECRET, audience="authenticated", expires_in=timedelta(hours=1)):
+    claims = {
+        "sub": "user-1",
+        "email": "parent@example.com",
+        "aud": audience,
+        "exp": datetime.utcnow() + expires_in,
+        "session_id": "session-1",
+        "user_metadata": {"role": "educator", "full_name": "Ibu Guru"}
+    }
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", JWT_SECRET)
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_verify_supabase_token_valid(jwt_secret):
+    payload = await verify_supabase_token(make_token())
+    assert payload["sub"] == "user-1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token_kwargs", [
+    {"secret": "wrong-secret"},
+    {"audience": "anon"},
+    {"expires_in": timedelta(seconds=-10)},
+])
+async def test_verify_supabase_token_rejects(jwt_secret, token_kwargs):
+    assert await verify_supabase_token(make_token(**token_kwargs)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_verifies_locally(jwt_secret, mock_supabase):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+
+    user = await get_current_user(credentials)
+
+    assert user.id == "user-1"
+    assert user.role == "educator"
+    mock_supabase.auth.get_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_revocation_check_runs_once_per_interval(jwt_secret, mock_supabase, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_REVOCATION_CHECK_INTERVAL_SECONDS", 300)
+    mock_supabase.auth.get_user = AsyncMock(return_value=MagicMock(user=MagicMock()))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+
+    await get_current_user(credentials)
+    await get_current_user(credentials)
+
+    mock_supabase.auth.get_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_validated_tokens_are_cached(jwt_secret, monkeypatch):
+    verify = AsyncMock(wraps=verify_supabase_token)
+    monkeypatch.setattr("app.dependencies.verify_supabase_token", verify)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+
+    first = await get_current_user(credentials)
+    second = await get_current_user(credentials)
+
+    assert first is second
+    verify.assert_awaited_once()
+    assert token_cache.stats()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_tokens_are_cached_as_negatives(jwt_secret, monkeypatch):
+    verify = AsyncMock(wraps=verify_supabase_token)
+    monkeypatch.setattr("app.dependencies.verify_supabase_token", verify)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token(secret="forged"))
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(credentials)
+        assert exc.value.status_code == 401
+
+    verify.assert_awaited_once()
+
+
+@pytest.fixture
+def remote_auth(monkeypatch, mock_supabase):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", None)
+    monkeypatch.setattr(settings, "SUPABASE_JWKS_URL", None)
+    user = MagicMock(id="user-1", email="parent@example.com", created_at=datetime.utcnow(),
+                     user_metadata={"role": "parent", "full_name": "Ibu"})
+    mock_supabase.auth.get_user = AsyncMock(return_value=MagicMock(user=user))
+    token_cache.clear()
+    yield mock_supabase
+    token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_remote_tokens_are_not_served_after_they_expire(remote_auth, monkeypatch):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token(expires_in=timedelta(seconds=2)))
+
+    assert (await get_current_user(credentials)).id == "user-1"
+
+    now = time.time()
+    monkeypatch.setattr("app.dependencies.time.time", lambda: now + 3)
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(credentials)
+
+    assert exc.value.status_code == 401
+    remote_auth.auth.get_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_remote_tokens_are_cached_briefly(remote_auth, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_REVOCATION_CHECK_INTERVAL_SECONDS", 300)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token())
+
+    await get_current_user(credentials)
+    await get_current_user(credentials)
+
+    # validating the token counted as the session's revocation check
+    remote_auth.auth.get_user.assert_awaited_once()
+    [(expires_at, _)] = token_cache._data.values()
+    assert expires_at - time.monotonic() <= settings.AUTH_REMOTE_TOKEN_CACHE_TTL_SECONDS
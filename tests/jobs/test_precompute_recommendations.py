@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs import precompute_recommendations as precompute_job
+from app.jobs.precompute_recommendations import precompute_recommendations
+from app.services.ai_service import AIService
+from app.services.event_window import EventWindows
+from app.services.module_catalog import ModuleCatalog
+
+
+@pytest.fixture
+def ai_service(fake_supabase):
+    fake_supabase.tables["modules"] = [
+        {"id": f"mod-{i}", "title": f"Module {i}", "description": "", "type": ["reading", "counting"][i % 2],
+         "education_level": "TK", "difficulty_level": i % 5 + 1, "estimated_duration_minutes": 10,
+         "total_questions": 5, "points_reward": 10, "created_at": f"2024-01-0{i + 1}T00:00:00",
+         "is_active": i != 5}
+        for i in range(6)
+    ]
+    fake_supabase.tables["children"] = [
+        {"id": f"child-{c}", "age": 6, "current_level": c + 1, "updated_at": "2024-01-01T00:00:00+00:00"}
+        for c in range(3)
+    ]
+    now = datetime.utcnow()
+    # child-2 has too little progress and gets beginner modules
+    fake_supabase.tables["progress"] = [
+        {"id": f"prog-{c}-{i:03d}", "child_id": f"child-{c}", "module_id": f"mod-{(i + c) % 6}",
+         "is_correct": (i + c) % 3 != 0, "time_taken_seconds": 10 + c, "points_earned": 10,
+         "created_at": (now - timedelta(hours=i)).isoformat()}
+        for c, count in enumerate([150, 40, 3]) for i in range(count)
+    ]
+
+    service = AIService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    service.event_windows = EventWindows(maxsize=10, ttl_seconds=60, capacity=100)
+    return service
+
+
+def summary(recommendations):
+    return (
+        [m.module.id for m in recommendations.recommended_modules],
+        [m.confidence_score for m in recommendations.recommended_modules],
+        recommendations.personalization_level
+    )
+
+
+@pytest.mark.asyncio
+async def test_precomputed_rows_match_live_recommendations(ai_service, fake_supabase):
+    written = await precompute_recommendations(fake_supabase, workers=2, page_size=2)
+
+    assert written == 3
+    stored = {row["child_id"]: row for row in fake_supabase.tables["child_recommendations"]}
+    assert sorted(stored) == ["child-0", "child-1", "child-2"]
+
+    for child_id in stored:
+        served = await ai_service.get_recommendations(child_id)
+        live = await ai_service._compute_recommendations(child_id)
+        assert served.generated_at.isoformat() == stored[child_id]["generated_at"]
+        assert summary(served) == summary(live)
+
+
+@pytest.mark.asyncio
+async def test_stored_row_is_served_without_live_compute(ai_service, fake_supabase):
+    await precompute_recommendations(fake_supabase, child_id="child-0", workers=1)
+    await ai_service.catalog.all()
+    fake_supabase.round_trips = 0
+
+    recommendations = await ai_service.get_recommendations("child-0")
+
+    # the stored row and the child row, no progress reads
+    assert fake_supabase.round_trips == 2
+    assert recommendations.personalization_level == "high"
+
+
+@pytest.mark.asyncio
+async def test_stale_rows_are_computed_live(ai_service, fake_supabase):
+    await precompute_recommendations(fake_supabase, workers=1)
+    [stored_0, stored_1, _] = sorted(fake_supabase.tables["child_recommendations"], key=lambda r: r["child_id"])
+
+    # new progress after the job ran
+    fake_supabase.tables["children"][0]["updated_at"] = (datetime.utcnow() + timedelta(seconds=1)).isoformat() + "+00:00"
+    # expired
+    stored_1["recommendations"]["valid_until"] = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+
+    for child_id, stored in (("child-0", stored_0), ("child-1", stored_1)):
+        recommendations = await ai_service.get_recommendations(child_id)
+        assert recommendations.generated_at.isoformat() != stored["generated_at"]
+
+
+@pytest.mark.asyncio
+async def test_progress_recorded_while_a_page_is_scored_marks_the_row_stale(ai_service, fake_supabase, monkeypatch):
+    recent_events = precompute_job._recent_events
+
+    async def record_progress_after_read(supabase, child_ids, capacity):
+        events = await recent_events(supabase, child_ids, capacity)
+        # progress lands after the read, before the workers score the page
+        fake_supabase.tables["children"][0]["updated_at"] = datetime.utcnow().isoformat() + "+00:00"
+        return events
+
+    monkeypatch.setattr(precompute_job, "_recent_events", record_progress_after_read)
+    await precompute_recommendations(fake_supabase, child_id="child-0", workers=1)
+    [stored] = fake_supabase.tables["child_recommendations"]
+
+    recommendations = await ai_service.get_recommendations("child-0")
+
+    assert recommendations.generated_at.isoformat() != stored["generated_at"]
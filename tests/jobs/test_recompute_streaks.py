@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs.recompute_streaks import recompute_streaks
+
+
+@pytest.mark.asyncio
+async def test_recompute_repairs_streak_state(fake_supabase):
+    today = datetime.utcnow().date()
+    fake_supabase.tables["children"] = [
+        {"id": "child-1", "current_streak": 1, "longest_streak": 1},
+        {"id": "child-2", "current_streak": 9, "longest_streak": 9}
+    ]
+    fake_supabase.tables["child_daily_stats"] = [
+        {"child_id": "child-1", "day": (today - timedelta(days=n)).isoformat(), "module_type": t}
+        for n in (0, 1, 2, 6, 7, 8, 9) for t in ("reading", "counting")
+    ]
+
+    updated = await recompute_streaks(fake_supabase, page_size=1)
+
+    child_1, child_2 = fake_supabase.tables["children"]
+    assert updated == 2
+    assert child_1["current_streak"] == 3
+    assert child_1["longest_streak"] == 4
+    assert child_1["last_active_date"] == today.isoformat()
+    assert child_2["current_streak"] == 0
+    assert child_2["last_active_date"] is None
+
+
+@pytest.mark.asyncio
+async def test_recompute_writes_each_page_of_children_in_one_call(fake_supabase):
+    fake_supabase.tables["children"] = [{"id": f"child-{i}", "current_streak": 5} for i in range(5)]
+    fake_supabase.tables["child_daily_stats"] = []
+    rpc = fake_supabase.rpc
+    calls = []
+
+    def spy(fn, params=None):
+        calls.append((fn, sorted((params or {}).get("p_states", {}))))
+        return rpc(fn, params)
+
+    fake_supabase.rpc = spy
+    updated = await recompute_streaks(fake_supabase, page_size=2)
+
+    assert updated == 5
+    assert calls == [
+        ("set_child_streaks", ["child-0", "child-1"]),
+        ("set_child_streaks", ["child-2", "child-3"]),
+        ("set_child_streaks", ["child-4"])
+    ]
+    assert all(child["current_streak"] == 0 for child in fake_supabase.tables["children"])
@@ -0,0 +1,201 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.ml.recommendation_engine import (
+    REASON_GOOD_FIT,
+    REASON_HIGH_PERFORMANCE,
+    REASON_NEW_SUBJECT,
+    REASON_NONE,
+    REASON_POSITIVE_TREND,
+    REASON_VARIETY,
+    CollaborativeFilter,
+    ModuleFeatures,
+    RecommendationEngine
+)
+
+TYPES = ["reading", "counting", "cognitive", "writing"]
+
+
+def make_modules(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        {"id": f"mod-{i}", "type": rng.choice(TYPES), "difficulty_level": rng.randint(1, 10)}
+        for i in range(count)
+    ]
+
+
+PINNED_MODULES = [
+    {"id": "mod-0", "type": "reading", "difficulty_level": 5},
+    {"id": "mod-1", "type": "reading", "difficulty_level": 6},
+    {"id": "mod-2", "type": "counting", "difficulty_level": 4},
+    {"id": "mod-3", "type": "cognitive", "difficulty_level": 8},
+    {"id": "mod-4", "type": "counting", "difficulty_level": 7}
+]
+PINNED_ANALYSIS = {
+    "module_performance": {
+        "reading": {"accuracy": 0.9, "avg_difficulty": 3.0},
+        "counting": {"accuracy": 0.7, "avg_difficulty": 4.0}
+    },
+    "learning_velocity": 0.2
+}
+
+
+def test_scores_and_reason_codes_are_pinned():
+    engine = RecommendationEngine()
+
+    scores, reason_codes = engine._score_modules(
+        ModuleFeatures(PINNED_MODULES), {"current_level": 4}, PINNED_ANALYSIS
+    )
+
+    # 0.3 accuracy + 0.25 difficulty + 0.15 variety + 0.15 engagement + 0.15 time
+    assert scores == pytest.approx([0.81, 0.76, 0.75, 0.64, 0.565])
+    assert reason_codes.tolist() == [
+        [REASON_HIGH_PERFORMANCE, REASON_NONE, REASON_POSITIVE_TREND],
+        [REASON_HIGH_PERFORMANCE, REASON_NONE, REASON_POSITIVE_TREND],
+        [REASON_GOOD_FIT, REASON_NONE, REASON_POSITIVE_TREND],
+        [REASON_NEW_SUBJECT, REASON_VARIETY, REASON_POSITIVE_TREND],
+        [REASON_NONE, REASON_NONE, REASON_POSITIVE_TREND]
+    ]
+
+
+def test_scores_without_progress_are_pinned():
+    engine = RecommendationEngine()
+
+    scores, reason_codes = engine._score_modules(ModuleFeatures(PINNED_MODULES[:1]), {}, {})
+
+    assert scores == pytest.approx([0.18 + 0.1 + 0.12 + 0.09 + 0.105])
+    assert reason_codes.tolist() == [[REASON_NEW_SUBJECT, REASON_VARIETY, REASON_NONE]]
+
+
+@pytest.mark.asyncio
+async def test_recommendations_are_ranked_with_reasons():
+    engine = RecommendationEngine()
+
+    recommendations = await engine.generate_recommendations(
+        {"current_level": 4}, PINNED_ANALYSIS, PINNED_MODULES, limit=3
+    )
+
+    assert [r["module_id"] for r in recommendations] == ["mod-0", "mod-1", "mod-2"]
+    assert [r["confidence"] for r in recommendations] == pytest.approx([0.81, 0.76, 0.75])
+    assert [reason.factor for reason in recommendations[2]["reasons"]] == ["good_fit", "positive_trend"]
+    assert recommendations[0]["reasons"][0].description == "You're doing great with reading! Ready for more challenges."
+    assert [r["expected_difficulty"] for r in recommendations] == [4, 5, 4]
+
+
+@pytest.mark.asyncio
+async def test_feature_matrix_is_rebuilt_only_for_a_new_catalog():
+    engine = RecommendationEngine()
+    modules = make_modules(10)
+
+    await engine.generate_recommendations({}, {}, modules)
+    features = engine._features
+    await engine.generate_recommendations({"current_level": 3}, {}, modules)
+    assert engine._features is features
+
+    await engine.generate_recommendations({}, {}, list(modules))
+    assert engine._features is not features
+
+
+@pytest.mark.parametrize("k", [1, 3, 5, 50])
+def test_top_k_matches_full_stable_sort(k):
+    rng = np.random.default_rng(k)
+    # few distinct values, so the k-th score is usually tied
+    scores = rng.choice([0.2, 0.5, 0.6, 0.7, 0.8], size=1000)
+
+    candidates = np.flatnonzero(scores > 0.3)
+    expected = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+
+    assert list(RecommendationEngine._top_k(scores, k)) == list(expected)
+
+
+@pytest.mark.asyncio
+async def test_reasons_are_expanded_for_returned_modules():
+    engine = RecommendationEngine()
+    modules = [{"id": "mod-1", "type": "counting", "difficulty_level": 2}]
+    analysis = {"module_performance": {}, "learning_velocity": 0.5}
+
+    [recommendation] = await engine.generate_recommendations({"current_level": 2}, analysis, modules)
+
+    assert [r.factor for r in recommendation["reasons"]] == ["new_subject", "variety", "positive_trend"]
+    assert recommendation["reasons"][0].description == "Explore something new with counting!"
+
+
+def make_children(count, seed=5):
+    rng = random.Random(seed)
+    children = []
+    for i in range(count):
+        child = {"id": f"child-{i}", "age": rng.randint(4, 10), "current_level": rng.randint(1, 10)}
+        if rng.random() < 0.7:
+            child["type_accuracy"] = {t: rng.choice([0.4, 0.5, 0.75, 0.9]) for t in rng.sample(TYPES[:3], 2)}
+        children.append(child)
+    return children
+
+
+def loop_similarities(child, children, top_k=10):
+    """Similarity of the top_k children found with one `_calculate_similarity` per child"""
+    similarities = sorted(
+        (CollaborativeFilter._calculate_similarity(child, other) for other in children if other["id"] != child["id"]),
+        reverse=True
+    )
+    return similarities[:top_k]
+
+
+def similarities_of(child, ids, children):
+    by_id = {c["id"]: c for c in children}
+    return [CollaborativeFilter._calculate_similarity(child, by_id[i]) for i in ids]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_find_similar_children_matches_pairwise_similarity(seed):
+    children = make_children(500, seed)
+    child = children[seed]
+
+    ids = CollaborativeFilter.find_similar_children(child, children)
+
+    assert child["id"] not in ids
+    assert similarities_of(child, ids, children) == pytest.approx(loop_similarities(child, children))
+
+
+def test_find_similar_children_keeps_input_order_for_ties():
+    children = [{"id": f"child-{i}", "age": 6, "current_level": 3} for i in range(30)]
+
+    ids = CollaborativeFilter.find_similar_children(children[0], children, top_k=5)
+
+    assert ids == ["child-1", "child-2", "child-3", "child-4", "child-5"]
+
+
+def test_index_answers_like_a_full_scan_through_updates():
+    children = make_children(2000)
+    index = CollaborativeFilter(rebuild_threshold=50)
+    index.build(children)
+
+    # changed profiles, new children and removals, left pending
+    rng = random.Random(1)
+    current = {c["id"]: c for c in children}
+    for i in range(20):
+        changed = {**children[i], "age": rng.randint(4, 10), "current_level": rng.randint(1, 10)}
+        current[changed["id"]] = changed
+        index.update(changed)
+    for child in make_children(10, seed=9):
+        child["id"] = f"new-{child['id']}"
+        current[child["id"]] = child
+        index.update(child)
+    for i in range(20, 30):
+        del current[f"child-{i}"]
+        index.remove(f"child-{i}")
+    assert index._pending
+
+    remaining = list(current.values())
+    for child in remaining[:40:3]:
+        ids = index.similar_children(child)
+        assert len(set(ids)) == 10 and child["id"] not in ids
+        assert all(i in current for i in ids)
+        assert similarities_of(child, ids, remaining) == pytest.approx(loop_similarities(child, remaining))
+
+    # past the threshold the pending changes are folded into the tree
+    for child in [c for c in remaining if c["id"] not in index._pending][:10]:
+        index.update(child)
+    assert not index._pending
+    assert sorted(index._ids) == sorted(current)
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.ai_service import AIService
+from app.services.event_window import EventWindows
+from app.services.module_catalog import ModuleCatalog
+from app.services.progress_service import ProgressService
+
+
+@pytest.fixture
+def services(fake_supabase):
+    fake_supabase.tables["modules"] = [
+        {"id": f"mod-{i}", "title": f"Module {i}", "description": "", "type": ["reading", "counting"][i % 2],
+         "education_level": "TK", "difficulty_level": i % 5 + 1, "estimated_duration_minutes": 10,
+         "total_questions": 5, "points_reward": 10}
+        for i in range(6)
+    ]
+    fake_supabase.tables["children"] = [{"id": "child-1", "age": 6, "current_level": 2, "total_points": 0}]
+    now = datetime.utcnow()
+    fake_supabase.tables["progress"] = [
+        {"id": f"prog-{i}", "child_id": "child-1", "module_id": f"mod-{i % 6}", "is_correct": i % 4 != 0,
+         "time_taken_seconds": 12, "points_earned": 10, "created_at": (now - timedelta(hours=i)).isoformat()}
+        for i in range(40)
+    ]
+    catalog = ModuleCatalog(fake_supabase)
+    windows = EventWindows(maxsize=10, ttl_seconds=60, capacity=100)
+
+    ai_service = AIService()
+    ai_service.supabase = fake_supabase
+    ai_service.catalog = catalog
+    ai_service.event_windows = windows
+
+    progress_service = ProgressService()
+    progress_service.supabase = fake_supabase
+    progress_service.catalog = catalog
+    progress_service.event_windows = windows
+    return ai_service, progress_service
+
+
+@pytest.mark.asyncio
+async def test_recommendations_are_cached_until_progress_changes(services, fake_supabase):
+    ai_service, progress_service = services
+
+    first = await ai_service.get_recommendations("child-1")
+    round_trips = fake_supabase.round_trips
+
+    assert await ai_service.get_recommendations("child-1") is first
+    assert (await ai_service.get_next_module("child-1"))["module"]["id"] == first.next_best_module.module.id
+    assert fake_supabase.round_trips == round_trips
+
+    await progress_service._apply_progress_totals([
+        {"child_id": "child-1", "module_id": "mod-1", "is_correct": True, "time_taken_seconds": 5,
+         "points_earned": 10, "created_at": datetime.utcnow().isoformat()}
+    ])
+
+    assert await ai_service.get_recommendations("child-1") is not first
+
+
+@pytest.mark.asyncio
+async def test_catalog_changes_recompute_recommendations(services):
+    ai_service, _ = services
+
+    first = await ai_service.get_recommendations("child-1")
+    ai_service.catalog.invalidate()
+
+    assert await ai_service.get_recommendations("child-1") is not first
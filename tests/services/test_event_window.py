@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.ai_service import AIService, analyze_progress
+from app.services.event_window import EventWindow, EventWindows
+from app.services.module_catalog import ModuleCatalog
+
+NOW = datetime(2024, 3, 4, 12, 0)
+
+
+def make_rows(count, module_count=3, start=0):
+    # newest first, as read from the database
+    return [
+        {
+            "child_id": "child-1",
+            "module_id": f"mod-{i % module_count}",
+            "is_correct": i % 3 != 0,
+            "time_taken_seconds": 10 + i % 7,
+            "created_at": (NOW - timedelta(hours=5 * i)).isoformat()
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def test_append_keeps_newest_events():
+    window = EventWindow.from_rows(make_rows(4, start=1), capacity=4)
+    assert window.complete is False
+
+    window.append([{**make_rows(1)[0], "module_id": "mod-new"}])
+
+    assert len(window) == 4
+    assert window.module_ids[window.module_index[0]] == "mod-new"
+    assert window.created_at[0] == np.datetime64(NOW)
+    assert (np.diff(window.created_at.astype(np.int64)) < 0).all()
+
+
+def test_module_events_need_full_history_or_enough_events():
+    rows = make_rows(12, module_count=3)
+
+    partial = EventWindow.from_rows(rows, capacity=12)
+    complete = EventWindow.from_rows(rows, capacity=20)
+
+    assert partial.module_events("mod-0", 10) is None
+    assert list(partial.module_events("mod-0", 3)) == [0, 3, 6]
+    assert list(complete.module_events("mod-0", 10)) == [0, 3, 6, 9]
+    assert len(complete.module_events("mod-9", 10)) == 0
+
+
+def test_windows_are_only_extended_once_loaded():
+    windows = EventWindows(maxsize=10, ttl_seconds=60, capacity=100)
+    windows.append(make_rows(1))
+    assert windows.get("child-1") is None
+
+    windows.load("child-1", make_rows(5, start=1))
+    windows.append(make_rows(1))
+
+    assert len(windows.get("child-1")) == 6
+
+
+@pytest.fixture
+def ai_service(fake_supabase):
+    fake_supabase.tables["modules"] = [
+        {"id": f"mod-{i}", "title": f"Module {i}", "description": "", "type": module_type,
+         "education_level": "TK", "difficulty_level": level, "estimated_duration_minutes": 10,
+         "total_questions": 5, "points_reward": level * 10}
+        for i, (module_type, level) in enumerate([("reading", 2), ("counting", 3), ("reading", 5)])
+    ]
+    fake_supabase.tables["children"] = [{"id": "child-1", "age": 6, "current_level": 2}]
+    fake_supabase.tables["progress"] = make_rows(30)
+    service = AIService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    service.event_windows = EventWindows(maxsize=10, ttl_seconds=60, capacity=100)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_analysis_matches_row_by_row_metrics(ai_service):
+    rows = make_rows(30)
+
+    window = await ai_service._get_event_window("child-1")
+    analysis = analyze_progress(window, await ai_service.catalog.by_id())
+
+    reading = [r for r in rows if r["module_id"] in ("mod-0", "mod-2")]
+    assert analysis["overall_accuracy"] == sum(r["is_correct"] for r in rows) / 30
+    assert analysis["avg_time_seconds"] == sum(r["time_taken_seconds"] for r in rows) / 30
+    assert list(analysis["module_performance"]) == ["reading", "counting"]
+    assert analysis["module_performance"]["reading"]["attempts"] == len(reading)
+    assert analysis["module_performance"]["reading"]["avg_difficulty"] == np.mean(
+        [2 if r["module_id"] == "mod-0" else 5 for r in reading]
+    )
+    assert analysis["learning_velocity"] == (
+        sum(r["is_correct"] for r in rows[-10:]) / 10 - sum(r["is_correct"] for r in rows[:10]) / 10
+    )
+    assert 0 <= analysis["consistency_score"] <= 1
+
+
+@pytest.mark.asyncio
+async def test_window_is_read_once(ai_service, fake_supabase):
+    await ai_service.get_recommendations("child-1")
+    ai_service.recommendation_cache.clear()
+    fake_supabase.round_trips = 0
+
+    await ai_service.get_recommendations("child-1")
+    result = await ai_service.adjust_difficulty_level("child-1", "mod-1")
+
+    # only the stored recommendations and the child row; progress comes
+    # from the window
+    assert fake_supabase.round_trips == 2
+    assert result["performance_metrics"]["accuracy"] == 100.0
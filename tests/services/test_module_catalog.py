@@ -0,0 +1,115 @@
+import pytest
+
+from app.services.module_catalog import ModuleCatalog
+from app.services.module_service import ModuleService
+from app.utils.pagination import decode_cursor, next_cursor
+
+
+def make_module(i, **overrides):
+    module = {
+        "id": f"mod-{i}",
+        "title": f"Module {i}",
+        "description": "",
+        "module_type": ["reading", "counting"][i % 2],
+        "education_level": "TK",
+        "difficulty_level": i % 3 + 1,
+        "content": {"questions": []},
+        "created_at": f"2024-01-0{i + 1}T00:00:00"
+    }
+    module.update(overrides)
+    return module
+
+
+@pytest.fixture
+def module_service(fake_supabase):
+    fake_supabase.tables["modules"] = [make_module(i) for i in range(6)]
+    fake_supabase.tables["modules"].append(make_module(6, is_active=False))
+    service = ModuleService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_catalog_indexes(fake_supabase):
+    fake_supabase.tables["modules"] = [make_module(i) for i in range(6)]
+    catalog = ModuleCatalog(fake_supabase)
+
+    assert [m["id"] for m in await catalog.filter(module_type="counting")] == ["mod-1", "mod-3", "mod-5"]
+    assert [m["id"] for m in await catalog.by_difficulty(1)] == ["mod-0", "mod-3"]
+    assert len(await catalog.by_education_level("TK")) == 6
+    assert await catalog.types() == ["counting", "reading"]
+    assert fake_supabase.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_hit_database(module_service, fake_supabase):
+    await module_service.get_modules()
+    await module_service.get_modules(module_type="reading", difficulty_level=1)
+    await module_service.get_module_by_id("mod-2")
+    await module_service.get_module_types()
+
+    assert fake_supabase.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_inactive_modules_are_hidden_from_listings(module_service):
+    modules = await module_service.get_modules()
+
+    assert len(modules) == 6
+    # but still open by id, as before the catalog
+    assert (await module_service.get_module_by_id("mod-6")).id == "mod-6"
+
+
+@pytest.mark.asyncio
+async def test_catalog_loads_past_one_page(fake_supabase):
+    fake_supabase.tables["modules"] = [
+        make_module(i, created_at="2024-01-01T00:00:00" if i < 4 else "2024-01-02T00:00:00")
+        for i in range(7)
+    ]
+    catalog = ModuleCatalog(fake_supabase, page_size=3)
+
+    assert [m["id"] for m in await catalog.all()] == [f"mod-{i}" for i in range(7)]
+    assert await catalog.get("mod-6") is not None
+    assert fake_supabase.round_trips == 3
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_catalog(module_service, fake_supabase):
+    assert len(await module_service.get_modules()) == 6
+
+    await module_service.create_module({
+        "title": "New",
+        "description": "",
+        "module_type": "cognitive",
+        "difficulty_level": 2,
+        "estimated_duration_minutes": 10,
+        "content": {"questions": []}
+    })
+    assert "cognitive" in await module_service.get_module_types()
+
+    await module_service.update_module("mod-0", {"title": "Renamed"})
+    assert (await module_service.get_module_by_id("mod-0")).title == "Renamed"
+
+    await module_service.delete_module("mod-1")
+    assert await module_service.get_module_by_id("mod-1") is None
+    assert module_service.catalog.version == 3
+
+
+@pytest.mark.asyncio
+async def test_modules_page_with_cursor(module_service):
+    first = await module_service.get_modules(limit=4)
+    rest = await module_service.get_modules(limit=4, cursor=decode_cursor(next_cursor(first, 4)))
+
+    assert [m.id for m in first + rest] == [f"mod-{i}" for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_modules_page_with_trimmed_fractional_timestamps(module_service, fake_supabase):
+    for i, module in enumerate(fake_supabase.tables["modules"]):
+        module["created_at"] = f"2024-01-01T00:00:0{i}.12345+00:00"
+
+    first = await module_service.get_modules(limit=4)
+    rest = await module_service.get_modules(limit=4, cursor=decode_cursor(next_cursor(first, 4)))
+
+    assert [m.id for m in first + rest] == [f"mod-{i}" for i in range(6)]
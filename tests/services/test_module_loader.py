@@ -0,0 +1,106 @@
+import pytest
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services import ai_service
+from app.services.ai_service import AIService, analyze_progress
+from app.services.event_window import EventWindows
+from app.services.module_catalog import ModuleCatalog
+from app.services.module_loader import ModuleLoader, MAX_BATCH_SIZE
+
+
+def make_modules(count):
+    return [
+        {"id": f"mod-{i}", "title": f"Module {i}", "description": "", "type": ["reading", "counting", "cognitive"][i % 3],
+         "education_level": "TK", "difficulty_level": i % 10 + 1, "estimated_duration_minutes": 10,
+         "total_questions": 5, "points_reward": 10}
+        for i in range(count)
+    ]
+
+
+def make_progress(count, module_count):
+    now = datetime.utcnow()
+    return [
+        {
+            "id": f"prog-{i}",
+            "child_id": "child-1",
+            "module_id": f"mod-{i % module_count}",
+            "is_correct": i % 2 == 0,
+            "time_taken_seconds": 10,
+            "points_earned": 10,
+            "created_at": (now - timedelta(minutes=i)).isoformat()
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_load_many_dedupes_into_one_query(fake_supabase):
+    fake_supabase.tables["modules"] = make_modules(5)
+    loader = ModuleLoader(fake_supabase)
+
+    modules = await loader.load_many(["mod-1", "mod-2", "mod-1", "mod-missing", "mod-2"])
+
+    assert fake_supabase.round_trips == 1
+    assert modules["mod-1"]["type"] == "counting"
+    assert modules["mod-missing"] is None
+
+
+@pytest.mark.asyncio
+async def test_load_many_reuses_cached_rows(fake_supabase):
+    fake_supabase.tables["modules"] = make_modules(5)
+    loader = ModuleLoader(fake_supabase)
+
+    await loader.load_many(["mod-1", "mod-2"])
+    await loader.load_many(["mod-2", "mod-1"])
+
+    assert fake_supabase.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_load_many_chunks_large_batches(fake_supabase):
+    fake_supabase.tables["modules"] = make_modules(MAX_BATCH_SIZE + 1)
+    loader = ModuleLoader(fake_supabase)
+
+    modules = await loader.load_many(f"mod-{i}" for i in range(MAX_BATCH_SIZE + 1))
+
+    assert fake_supabase.round_trips == 2
+    assert all(modules.values())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_query(fake_supabase):
+    fake_supabase.tables["modules"] = make_modules(5)
+    loader = ModuleLoader(fake_supabase)
+
+    rows = await asyncio.gather(*(loader.load(f"mod-{i % 3}") for i in range(10)))
+
+    assert fake_supabase.round_trips == 1
+    assert [row["id"] for row in rows[:3]] == ["mod-0", "mod-1", "mod-2"]
+
+
+@pytest.mark.asyncio
+async def test_recommendation_analysis_single_module_round_trip(fake_supabase, monkeypatch):
+    modules = make_modules(7)
+    modules[3]["is_active"] = False
+    fake_supabase.tables["modules"] = modules
+    fake_supabase.tables["progress"] = make_progress(100, 7)
+    service = AIService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    service.event_windows = EventWindows(maxsize=10, ttl_seconds=60, capacity=100)
+
+    analyses = []
+
+    def spy(window, modules):
+        analyses.append(analyze_progress(window, modules))
+        return analyses[-1]
+
+    monkeypatch.setattr(ai_service, "analyze_progress", spy)
+    recommendations = await service._compute_recommendations("child-1", {"id": "child-1", "age": 6, "current_level": 2})
+
+    # the event window, one catalog load and one batched lookup for the
+    # inactive module
+    assert fake_supabase.round_trips == 3
+    assert recommendations.personalization_level == "high"
+    assert sum(p["attempts"] for p in analyses[0]["module_performance"].values()) == 100
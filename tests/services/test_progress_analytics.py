@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+import time
+
+import pytest
+
+from app.services import progress_analytics
+from app.services.module_catalog import ModuleCatalog
+from app.services.progress_service import ProgressService
+
+
+MODULES = {
+    "mod-r1": {"id": "mod-r1", "type": "reading", "title": "Huruf A-E", "difficulty_level": 1},
+    "mod-r2": {"id": "mod-r2", "type": "reading", "title": "Huruf F-J", "difficulty_level": 3},
+    "mod-c1": {"id": "mod-c1", "module_type": "counting", "title": "Angka 1-10", "difficulty_level": 2},
+    "mod-x1": {"id": "mod-x1", "type": "cognitive", "title": "Pola", "difficulty_level": 4}
+}
+
+# 2024-03-04 is a Monday
+MONDAY = datetime(2024, 3, 4, 9, 0)
+
+
+def event(module_id, is_correct, day_offset=0, seconds=60):
+    return {
+        "module_id": module_id,
+        "is_correct": is_correct,
+        "time_taken_seconds": seconds,
+        "created_at": (MONDAY + timedelta(days=day_offset)).isoformat()
+    }
+
+
+def make_rows():
+    return (
+        [event("mod-r1", True, 0) for _ in range(9)] + [event("mod-r1", False, 0)]
+        + [event("mod-r2", i < 2, 2) for i in range(6)]
+        + [event("mod-c1", i % 2 == 0, 6, seconds=30) for i in range(4)]
+        + [event("mod-gone", True, 1)]
+    )
+
+
+def test_weekly_activity_sums_minutes_per_weekday():
+    events = progress_analytics.build_event_batch(make_rows(), MODULES)
+
+    activity = progress_analytics.weekly_activity(events)
+
+    assert list(activity) == progress_analytics.WEEKDAYS
+    assert activity["Monday"] == 10
+    assert activity["Tuesday"] == 1
+    assert activity["Wednesday"] == 6
+    assert activity["Sunday"] == 2
+    assert activity["Friday"] == 0
+
+
+def test_subject_progress_per_module_type():
+    events = progress_analytics.build_event_batch(make_rows(), MODULES)
+
+    subjects = {
+        s.subject: s
+        for s in progress_analytics.subject_progress(events, {"reading": 4, "counting": 1})
+    }
+
+    assert set(subjects) == {"reading", "counting", "other"}
+    assert subjects["reading"].total_questions == 16
+    assert subjects["reading"].accuracy == 68.75
+    assert subjects["reading"].level == 3
+    assert subjects["reading"].progress_percentage == 50.0
+    assert subjects["counting"].time_spent_minutes == 2
+    assert subjects["counting"].progress_percentage == 100.0
+    assert subjects["other"].progress_percentage == 0.0
+
+
+def test_strengths_and_weaknesses_need_enough_attempts():
+    events = progress_analytics.build_event_batch(make_rows(), MODULES)
+
+    strengths, weaknesses = progress_analytics.strengths_weaknesses(events)
+
+    assert [(s.skill_name, s.performance_score) for s in strengths] == [("Huruf A-E", 90.0)]
+    assert [(w.skill_name, w.category) for w in weaknesses] == [("Huruf F-J", "reading")]
+
+
+def test_empty_period():
+    events = progress_analytics.build_event_batch([], MODULES)
+
+    assert sum(progress_analytics.weekly_activity(events).values()) == 0
+    assert progress_analytics.subject_progress(events, {}) == []
+    assert progress_analytics.strengths_weaknesses(events) == ([], [])
+
+
+@pytest.fixture
+def report_service(fake_supabase):
+    fake_supabase.tables["modules"] = list(MODULES.values())
+    fake_supabase.tables["children"] = [{"id": "child-1", "total_points": 0}]
+    now = datetime.utcnow()
+    fake_supabase.tables["progress"] = [
+        {**row, "id": f"prog-{i}", "child_id": "child-1", "created_at": (now - timedelta(minutes=i)).isoformat()}
+        for i, row in enumerate(make_rows() * 100)
+    ]
+    fake_supabase.tables["child_daily_stats"] = [
+        {"child_id": "child-1", "day": now.date().isoformat(), "module_type": "reading",
+         "questions": 1, "correct": 1, "seconds": 60, "points": 10, "module_ids": ["mod-r1"]}
+    ]
+    service = ProgressService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_detailed_report_reads_events_once(report_service, fake_supabase):
+    report = await report_service.get_detailed_report("child-1")
+
+    assert sum(s.total_questions for s in report.subject_progress) == 2100
+    assert sum(report.weekly_activity.values()) > 0
+    # summary (rollup + child), three event pages, catalog, one inactive module lookup
+    assert fake_supabase.round_trips == 7
+
+
+@pytest.mark.asyncio
+async def test_detailed_report_reads_concurrently(report_service, fake_supabase):
+    fake_supabase.latency = 0.05
+
+    started = time.perf_counter()
+    report = await report_service.get_detailed_report("child-1")
+    elapsed = time.perf_counter() - started
+
+    assert report is not None
+    assert fake_supabase.max_in_flight >= 4
+    # first event page, remaining pages, inactive module lookup
+    assert elapsed < 5 * fake_supabase.latency < fake_supabase.round_trips * fake_supabase.latency
+
+
+@pytest.mark.asyncio
+async def test_repeated_report_is_served_from_cache(report_service, fake_supabase):
+    first = await report_service.get_detailed_report("child-1")
+    round_trips = fake_supabase.round_trips
+
+    assert await report_service.get_detailed_report("child-1") is first
+    assert fake_supabase.round_trips == round_trips
+
+
+@pytest.mark.asyncio
+async def test_new_progress_invalidates_cached_report(report_service, fake_supabase):
+    first = await report_service.get_detailed_report("child-1")
+
+    await report_service._apply_progress_totals([
+        {**event("mod-r1", True), "child_id": "child-1", "points_earned": 10}
+    ])
+    round_trips = fake_supabase.round_trips
+    second = await report_service.get_detailed_report("child-1")
+
+    assert second is not first
+    assert fake_supabase.round_trips > round_trips
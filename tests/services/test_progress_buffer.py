@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from app.schemas.progress import ProgressEventCreate
+from app.services.module_catalog import ModuleCatalog
+from app.services.progress_buffer import ProgressWriteBuffer
+from app.services.progress_service import ProgressService
+
+
+@pytest.fixture
+def progress_service(fake_supabase):
+    fake_supabase.tables["modules"] = [{"id": "mod-1", "module_type": "reading"}]
+    fake_supabase.tables["children"] = [{"id": "child-1", "total_points": 0}]
+    service = ProgressService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    return service
+
+
+def make_event(module_id="mod-1"):
+    return ProgressEventCreate(module_id=module_id, is_correct=True, time_taken_seconds=5)
+
+
+@pytest.mark.asyncio
+async def test_buffered_events_flush_in_bulk(progress_service, fake_supabase, tmp_path):
+    buffer = ProgressWriteBuffer(progress_service, max_events=100, flush_interval=60, spool_path=tmp_path / "spool.jsonl")
+    await buffer.start()
+    progress_service.write_buffer = buffer
+
+    responses = [await progress_service.record_progress_event("child-1", make_event()) for _ in range(10)]
+
+    assert "progress" not in fake_supabase.tables
+    assert len(buffer.spool_path.read_text().splitlines()) == 10
+
+    round_trips = fake_supabase.round_trips
+    await buffer.close()
+
+    assert {row["id"] for row in fake_supabase.tables["progress"]} == {r.id for r in responses}
+    assert fake_supabase.tables["children"][0]["total_points"] == 150
+    # one bulk insert, then points, streak and daily stats updates
+    assert fake_supabase.round_trips - round_trips == 4
+    assert buffer.spool_path.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_unknown_module_is_rejected_before_buffering(progress_service, tmp_path):
+    buffer = ProgressWriteBuffer(progress_service, spool_path=tmp_path / "spool.jsonl")
+    await buffer.start()
+    progress_service.write_buffer = buffer
+
+    with pytest.raises(ValueError):
+        await progress_service.record_progress_event("child-1", make_event("mod-missing"))
+
+    assert buffer.stats()["pending"] == 0
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_spool_replay_does_not_duplicate(progress_service, fake_supabase, tmp_path):
+    record = progress_service._build_progress_record("child-1", make_event(), "2024-01-01T00:00:00")
+    record["id"] = "prog-1"
+    fake_supabase.tables["progress"] = [dict(record)]
+    spool_path = tmp_path / "spool.jsonl"
+    spool_path.write_text(json.dumps(record) + "\n" + '{"torn')
+
+    buffer = ProgressWriteBuffer(progress_service, spool_path=spool_path)
+    await buffer.start()
+    await buffer.close()
+
+    assert len(fake_supabase.tables["progress"]) == 1
+    # the row was written before the crash, but its totals were not
+    assert fake_supabase.tables["children"][0]["total_points"] == 15
+    assert spool_path.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_outage_keeps_events_pending(progress_service, fake_supabase, tmp_path, monkeypatch):
+    buffer = ProgressWriteBuffer(progress_service, spool_path=tmp_path / "spool.jsonl")
+    await buffer.start()
+    progress_service.write_buffer = buffer
+    await progress_service.record_progress_event("child-1", make_event())
+
+    async def unavailable(rows, on_conflict=None):
+        raise Exception("connection refused")
+
+    monkeypatch.setattr(progress_service, "_write_progress", unavailable)
+    await buffer.flush()
+
+    assert buffer.stats()["pending"] == 1
+    assert len(buffer.spool_path.read_text().splitlines()) == 1
+
+    monkeypatch.undo()
+    await buffer.close()
+
+    assert len(fake_supabase.tables["progress"]) == 1
+    assert buffer.stats() == {"pending": 0, "flushed": 1, "rejected": 0}
+
+
+@pytest.mark.asyncio
+async def test_failed_points_rpc_is_retried_once_on_the_next_flush(progress_service, fake_supabase, tmp_path):
+    buffer = ProgressWriteBuffer(progress_service, spool_path=tmp_path / "spool.jsonl")
+    await buffer.start()
+    progress_service.write_buffer = buffer
+    await progress_service.record_progress_event("child-1", make_event())
+
+    increment = fake_supabase.functions["increment_child_points"]
+    calls = []
+
+    def fail_once(db, p_deltas):
+        calls.append(p_deltas)
+        if len(calls) == 1:
+            raise Exception("statement timeout")
+        return increment(db, p_deltas)
+
+    fake_supabase.functions["increment_child_points"] = fail_once
+    await buffer.flush()
+
+    assert len(fake_supabase.tables["progress"]) == 1
+    assert fake_supabase.tables["children"][0]["total_points"] == 0
+    assert buffer.stats() == {"pending": 1, "flushed": 0, "rejected": 0}
+    assert len(buffer.spool_path.read_text().splitlines()) == 1
+
+    stats = [dict(s) for s in fake_supabase.tables["child_daily_stats"]]
+    await buffer.close()
+
+    assert len(fake_supabase.tables["progress"]) == 1
+    assert fake_supabase.tables["children"][0]["total_points"] == 15
+    assert len(calls) == 2
+    # the updates that went through the first time are not repeated
+    assert fake_supabase.tables["child_daily_stats"] == stats
+    assert buffer.stats() == {"pending": 0, "flushed": 1, "rejected": 0}
+    assert buffer.spool_path.read_text() == ""
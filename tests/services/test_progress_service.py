@@ -0,0 +1,227 @@
+import asyncio
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.progress import OFFLINE_SESSION_ID_MAX_LENGTH, ProgressBatchCreate, ProgressEventCreate
+from app.services.module_catalog import ModuleCatalog
+from app.services.progress_service import ProgressService
+from app.utils.pagination import decode_cursor, next_cursor
+
+
+@pytest.fixture
+def progress_service(fake_supabase):
+    fake_supabase.tables["modules"] = [
+        {"id": "mod-1", "module_type": "reading", "difficulty_level": 1},
+        {"id": "mod-2", "module_type": "counting", "difficulty_level": 2}
+    ]
+    fake_supabase.tables["children"] = [{"id": "child-1", "total_points": 5}]
+    service = ProgressService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    return service
+
+
+def make_batch(count, module_ids=("mod-1", "mod-2")):
+    return ProgressBatchCreate(
+        offline_session_id="sess-1",
+        events=[
+            ProgressEventCreate(
+                module_id=module_ids[i % len(module_ids)],
+                is_correct=True,
+                time_taken_seconds=5
+            )
+            for i in range(count)
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_batch_uses_bulk_insert(progress_service, fake_supabase):
+    result = await progress_service.sync_batch_progress("child-1", make_batch(100))
+
+    assert result["synced_count"] == 100
+    assert result["failed_count"] == 0
+    assert len(fake_supabase.tables["progress"]) == 100
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + 100 * 15
+    # catalog load + one insert + points update
+    # ledger lookup, catalog load, one insert, points, streak, daily stats, ledger write
+    assert fake_supabase.round_trips == 7
+
+
+@pytest.mark.asyncio
+async def test_sync_batch_reports_failures_per_row(progress_service, fake_supabase):
+    batch = make_batch(4, module_ids=("mod-1", "mod-missing"))
+
+    result = await progress_service.sync_batch_progress("child-1", batch)
+
+    assert result["synced_count"] == 2
+    assert [f["index"] for f in result["failures"]] == [1, 3]
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + 2 * 15
+
+
+@pytest.mark.asyncio
+async def test_sync_batch_falls_back_to_row_inserts(progress_service, fake_supabase, monkeypatch):
+    table = fake_supabase.table
+
+    def flaky_table(name):
+        query = table(name)
+        insert = query.insert
+
+        def reject_bulk(data, **kwargs):
+            if isinstance(data, list):
+                raise Exception("duplicate key value violates unique constraint")
+            return insert(data, **kwargs)
+
+        query.insert = reject_bulk
+        return query
+
+    monkeypatch.setattr(fake_supabase, "table", flaky_table)
+
+    result = await progress_service.sync_batch_progress("child-1", make_batch(3))
+
+    assert result["synced_count"] == 3
+    assert result["failed_count"] == 0
+    assert len(fake_supabase.tables["progress"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_points_increment_is_one_atomic_call(progress_service, fake_supabase):
+    await asyncio.gather(*(
+        progress_service._increment_child_points({"child-1": 10})
+        for _ in range(5)
+    ))
+
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + 50
+    assert fake_supabase.round_trips == 5
+
+
+@pytest.mark.asyncio
+async def test_retried_batch_returns_stored_result(progress_service, fake_supabase):
+    batch = make_batch(4, module_ids=("mod-1", "mod-missing"))
+
+    first = await progress_service.sync_batch_progress("child-1", batch)
+    round_trips = fake_supabase.round_trips
+    retry = await progress_service.sync_batch_progress("child-1", batch)
+
+    assert fake_supabase.round_trips - round_trips == 1
+    assert retry["already_synced"] is True
+    assert retry["synced_count"] == first["synced_count"] == 2
+    assert retry["failures"] == first["failures"]
+    assert len(fake_supabase.tables["progress"]) == 2
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + 2 * 15
+
+
+@pytest.mark.asyncio
+async def test_retry_after_partial_sync_skips_written_events(progress_service, fake_supabase):
+    batch = make_batch(3)
+    for index, event in enumerate(batch.events):
+        event.client_event_id = f"evt-{index}"
+    first_attempt = batch.model_copy(update={"events": batch.events[:2]})
+
+    await progress_service.sync_batch_progress("child-1", first_attempt)
+    # the ledger write was lost, so the client retries the whole batch
+    fake_supabase.tables["progress_sync_batches"] = []
+    result = await progress_service.sync_batch_progress("child-1", batch)
+
+    assert result["synced_count"] == 3
+    assert sorted(r["client_event_id"] for r in fake_supabase.tables["progress"]) == ["evt-0", "evt-1", "evt-2"]
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + 3 * 15
+
+
+async def ndjson_lines(lines):
+    for line in lines:
+        yield line
+
+
+@pytest.mark.asyncio
+async def test_stream_sync_writes_in_fixed_chunks(progress_service, fake_supabase, monkeypatch):
+    monkeypatch.setattr(settings, "OFFLINE_BATCH_SIZE", 10)
+    event = b'{"module_id": "mod-1", "is_correct": true, "time_taken_seconds": 5}'
+    lines = [event] * 25 + [b'{"module_id": "mod-1"}', b"not json"]
+    chunk_sizes = []
+    bulk_insert = progress_service._bulk_insert_progress
+
+    async def spy(records, on_conflict=None):
+        chunk_sizes.append(len(records))
+        return await bulk_insert(records, on_conflict)
+
+    monkeypatch.setattr(progress_service, "_bulk_insert_progress", spy)
+
+    result = await progress_service.sync_progress_stream("child-1", "sess-1", ndjson_lines(lines))
+
+    assert chunk_sizes == [10, 10, 5]
+    assert result["synced_count"] == 25
+    assert [f["index"] for f in result["failures"]] == [25, 26]
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + 25 * 15
+
+    retry = await progress_service.sync_progress_stream("child-1", "sess-1", ndjson_lines(lines))
+
+    assert retry["already_synced"] is True
+    assert len(fake_supabase.tables["progress"]) == 25
+
+
+@pytest.mark.asyncio
+async def test_history_pages_with_cursor(progress_service, fake_supabase):
+    # Pairs of events share a timestamp, so pages must break ties on id
+    fake_supabase.tables["progress"] = [
+        {"id": f"prog-{i:02d}", "child_id": "child-1", "module_id": "mod-1", "is_correct": True,
+         "time_taken_seconds": 5, "attempt_count": 1, "points_earned": 10,
+         "created_at": f"2024-03-04T09:{i // 2:02d}:00"}
+        for i in range(25)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        page = await progress_service.get_progress_history("child-1", limit=10, cursor=cursor)
+        seen += [p.id for p in page]
+        next_page = next_cursor(page, 10)
+        if not next_page:
+            break
+        cursor = decode_cursor(next_page)
+
+    assert seen == [f"prog-{i:02d}" for i in reversed(range(25))]
+
+
+@pytest.mark.asyncio
+async def test_summary_falls_back_without_summary_function(progress_service, fake_supabase, monkeypatch):
+    monkeypatch.setattr("app.services.progress_service.STATS_PAGE_SIZE", 1)
+    del fake_supabase.functions["child_progress_summary"]
+    await progress_service.sync_batch_progress("child-1", make_batch(10))
+
+    summary = await progress_service.get_progress_summary("child-1")
+    progress_service.report_cache.clear()
+    fake_supabase.round_trips = 0
+    again = await progress_service.get_progress_summary("child-1")
+
+    assert summary == again
+    assert summary.total_questions_answered == 10
+    assert summary.total_modules_completed == 2
+    # the missing function is not retried: rollup rows (two types, one
+    # per page, then an empty page) + child
+    assert fake_supabase.round_trips == 4
+
+
+@pytest.mark.asyncio
+async def test_derived_event_ids_fit_the_column_for_the_longest_session_id(progress_service, fake_supabase):
+    batch = make_batch(3)
+    batch.offline_session_id = "s" * OFFLINE_SESSION_ID_MAX_LENGTH
+
+    result = await progress_service.sync_batch_progress("child-1", batch)
+
+    assert result["synced_count"] == 3
+    assert all(len(row["client_event_id"]) <= 100 for row in fake_supabase.tables["progress"])
+    with pytest.raises(ValidationError):
+        ProgressBatchCreate(offline_session_id="s" * (OFFLINE_SESSION_ID_MAX_LENGTH + 1), events=[])
+
+
+@pytest.mark.asyncio
+async def test_retried_single_event_returns_the_stored_row(progress_service, fake_supabase):
+    event = ProgressEventCreate(module_id="mod-1", is_correct=True, time_taken_seconds=5, client_event_id="evt-1")
+
+    first = await progress_service.record_progress_event("child-1", event)
+    retry = await progress_service.record_progress_event("child-1", event)
+
+    assert retry.id == first.id
+    assert len(fake_supabase.tables["progress"]) == 1
+    assert fake_supabase.tables["children"][0]["total_points"] == 5 + first.points_earned
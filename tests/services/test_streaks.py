@@ -0,0 +1,75 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.schemas.progress import ProgressBatchCreate, ProgressEventCreate
+from app.services.module_catalog import ModuleCatalog
+from app.services.progress_service import ProgressService
+from app.services.streaks import advance_streak, current_streak_days, recompute_streak
+
+
+def day(n):
+    return date(2024, 3, 1) + timedelta(days=n)
+
+
+def test_consecutive_days_extend_streak():
+    state = advance_streak({}, [day(0), day(1), day(1), day(2)])
+
+    assert state["current_streak"] == 3
+    assert state["longest_streak"] == 3
+    assert state["last_active_date"] == day(2).isoformat()
+
+
+def test_gap_starts_new_streak_and_keeps_longest():
+    state = advance_streak({}, [day(0), day(1), day(2)])
+    state = advance_streak(state, [day(5)])
+
+    assert state["current_streak"] == 1
+    assert state["longest_streak"] == 3
+    assert state["streak_start_date"] == day(5).isoformat()
+
+
+def test_out_of_order_days_extend_backwards():
+    state = advance_streak({}, [day(5)])
+    state = advance_streak(state, [day(3), day(4), day(2)])
+
+    assert state["current_streak"] == 4
+    assert state["streak_start_date"] == day(2).isoformat()
+    assert state == recompute_streak([day(2), day(3), day(4), day(5)])
+
+
+def test_current_streak_breaks_after_a_missed_day():
+    child = {"current_streak": 4, "last_active_date": day(4).isoformat()}
+
+    assert current_streak_days(child, today=day(5)) == 4
+    assert current_streak_days(child, today=day(6)) == 0
+
+
+@pytest.mark.asyncio
+async def test_offline_sync_advances_streak(fake_supabase):
+    fake_supabase.tables["modules"] = [{"id": "mod-1", "type": "reading"}]
+    fake_supabase.tables["children"] = [{"id": "child-1", "total_points": 0}]
+    service = ProgressService()
+    service.supabase = fake_supabase
+    service.catalog = ModuleCatalog(fake_supabase)
+    today = datetime.utcnow()
+
+    batch = ProgressBatchCreate(
+        offline_session_id="sess-1",
+        events=[
+            ProgressEventCreate(
+                module_id="mod-1",
+                is_correct=True,
+                time_taken_seconds=5,
+                occurred_at=today - timedelta(days=n)
+            )
+            for n in (0, 2, 1, 3)
+        ]
+    )
+    await service.sync_batch_progress("child-1", batch)
+    summary = await service.get_progress_summary("child-1")
+
+    assert fake_supabase.tables["children"][0]["current_streak"] == 4
+    assert summary.current_streak_days == 4
+    assert summary.longest_streak_days == 4
+
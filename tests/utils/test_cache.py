@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_expire():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("short", "x", ttl_seconds=5)
+        cache.set("long", "y")
+    with patch("app.utils.cache.time.monotonic", return_value=110.0):
+        assert cache.get("short") is None
+        assert cache.get("long") == "y"
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("expired", "x", ttl_seconds=-1)
+
+    assert len(cache) == 0
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(maxsize=10)
+    cache.set("a", None)
+
+    assert cache.get("a", "missing") is None
+    assert cache.get("b", "missing") == "missing"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,45 @@
+import gzip
+
+import pytest
+
+from app.utils.ndjson import iter_ndjson_lines
+
+
+async def chunked(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(lines):
+    return [line async for line in lines]
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks():
+    body = b'{"a": 1}\n\n{"a": 2}\n{"a": 3}'
+
+    lines = await collect(iter_ndjson_lines(chunked(body, 3)))
+
+    assert lines == [b'{"a": 1}', b'{"a": 2}', b'{"a": 3}']
+
+
+@pytest.mark.asyncio
+async def test_gzip_body_is_decompressed_incrementally():
+    body = b"\n".join(b'{"n": %d}' % i for i in range(1000))
+
+    lines = await collect(iter_ndjson_lines(chunked(gzip.compress(body), 64), gzipped=True))
+
+    assert len(lines) == 1000
+    assert lines[-1] == b'{"n": 999}'
+
+
+@pytest.mark.asyncio
+async def test_oversized_line_is_rejected():
+    with pytest.raises(ValueError):
+        await collect(iter_ndjson_lines(chunked(b"x" * 100, 10), max_line_bytes=50))
+
+
+@pytest.mark.asyncio
+async def test_corrupt_gzip_is_rejected():
+    with pytest.raises(ValueError):
+        await collect(iter_ndjson_lines(chunked(b"not gzip", 4), gzipped=True))
@@ -0,0 +1,27 @@
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2024-03-04T09:00:00.12+00:00", "7f1c2a4e-0b8d-4e5f-9a3b-2c1d0e9f8a7b")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2024-03-04T09:00:00.12+00:00", "7f1c2a4e-0b8d-4e5f-9a3b-2c1d0e9f8a7b")
+
+
+def test_cursor_with_five_digit_fraction():
+    # PostgREST trims trailing zeros, which fromisoformat rejects on 3.10
+    cursor = encode_cursor("2024-01-01T00:00:00.12345+00:00", "prog-1")
+
+    assert decode_cursor(cursor) == ("2024-01-01T00:00:00.12345+00:00", "prog-1")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor("yesterday", "prog-1"),
+    encode_cursor("2024-03-04T09:00:00", 'prog-1",id.gt."0'),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -9,6 +9,7 @@ export interface ProgressSummary {
     total_questions_answered: number;
     average_accuracy: number;
     current_streak_days: number;
+    longest_streak_days: number;
     total_points: number;
     favorite_module_type?: string;
     most_active_time?: string;
@@ -20,6 +21,7 @@ export interface ProgressEventCreate {
     is_correct: boolean;
     time_taken_seconds: number;
     attempt_count?: number;
+    occurred_at?: string;
 }
 
 export interface ProgressResponse {